@@ -14,8 +14,9 @@ from backend_core.db.base_class import Base
 config = context.config
 
 # Interpret the config file for Python logging.
-# This line sets up loggers basically.
-if config.config_file_name is not None:
+# This line sets up loggers basically. The application runs migrations with
+# logging already configured, and turns this off so its handlers are kept.
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
@@ -63,7 +64,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    # Fail fast instead of queueing live traffic behind a DDL lock; see backend_core.db.migration_ops
+    connection.exec_driver_sql(f"SET lock_timeout = {settings.MIGRATION_LOCK_TIMEOUT_MS}")
+    connection.commit()
+    # Commit each migration on its own, so a retried run resumes where the last one stopped
+    context.configure(connection=connection, target_metadata=target_metadata, transaction_per_migration=True)
 
     with context.begin_transaction():
         context.run_migrations()
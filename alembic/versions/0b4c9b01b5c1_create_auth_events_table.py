@@ -0,0 +1,60 @@
+"""create auth events table
+
+Revision ID: 0b4c9b01b5c1
+Revises: 4f2a9bb744ac
+Create Date: 2026-10-19 09:36:19.191273
+
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0b4c9b01b5c1"
+down_revision: Union[str, None] = "4f2a9bb744ac"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created up front; the application keeps creating future ones
+INITIAL_PARTITIONS = 4
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "auth_events",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("event_type", sa.String(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("ip_address", sa.String(), nullable=True),
+        sa.Column("user_agent", sa.String(), nullable=True),
+        sa.Column("details", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.PrimaryKeyConstraint("id", "occurred_at"),
+        postgresql_partition_by="RANGE (occurred_at)",
+    )
+    op.create_index("ix_auth_events_user_id_occurred_at", "auth_events", ["user_id", "occurred_at"], unique=False)
+
+    month = datetime.now(timezone.utc).date().replace(day=1)
+    for offset in range(INITIAL_PARTITIONS):
+        start, end = _add_months(month, offset), _add_months(month, offset + 1)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS auth_events_{start:%Y_%m} PARTITION OF auth_events "
+            f"FOR VALUES FROM ('{start.isoformat()} 00:00+00') TO ('{end.isoformat()} 00:00+00')"
+        )
+
+
+def downgrade() -> None:
+    # Dropping the parent drops every partition
+    op.drop_index("ix_auth_events_user_id_occurred_at", table_name="auth_events")
+    op.drop_table("auth_events")
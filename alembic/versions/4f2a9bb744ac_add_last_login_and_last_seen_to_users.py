@@ -0,0 +1,30 @@
+"""add last login and last seen to users
+
+Revision ID: 4f2a9bb744ac
+Revises: acc2a672e03a
+Create Date: 2026-10-19 09:34:09.328987
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2a9bb744ac"
+down_revision: Union[str, None] = "acc2a672e03a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable columns without defaults are a catalog-only change
+    op.add_column("users", sa.Column("last_login_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("users", sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "last_seen_at")
+    op.drop_column("users", "last_login_at")
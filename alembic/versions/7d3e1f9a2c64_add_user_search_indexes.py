@@ -0,0 +1,60 @@
+"""add user search indexes
+
+Revision ID: 7d3e1f9a2c64
+Revises: 0b4c9b01b5c1
+Create Date: 2026-10-19 09:52:41.406118
+
+"""
+
+from typing import Sequence, Union
+
+from sqlalchemy import text
+
+from alembic import op
+from backend_core.db.migration_ops import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "7d3e1f9a2c64"
+down_revision: Union[str, None] = "0b4c9b01b5c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The expressions must match backend_core.db.search exactly for the planner to use the indexes
+PREFIX_INDEXES = {
+    "ix_users_email_lower_prefix": 'lower(email) COLLATE "C", id',
+    "ix_users_first_name_lower_prefix": 'lower(first_name) COLLATE "C", id',
+    "ix_users_last_name_lower_prefix": 'lower(last_name) COLLATE "C", id',
+}
+TRIGRAM_INDEXES = {
+    "ix_users_email_lower_trgm": "lower(email)",
+    "ix_users_full_name_lower_trgm": "lower(coalesce(first_name, '') || ' ' || coalesce(last_name, ''))",
+}
+
+
+def _trigram_available() -> bool:
+    """Return whether the server ships pg_trgm; offline SQL assumes it does."""
+    if op.get_context().as_sql:
+        return True
+    return (
+        op.get_bind().execute(text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).first() is not None
+    )
+
+
+def upgrade() -> None:
+    # With the "C" collation LIKE 'prefix%' is indexable whatever the database collation, and the
+    # trailing id lets one index scan return a prefix's matches already in keyset order
+    for name, expression in PREFIX_INDEXES.items():
+        create_index_concurrently(name, "users", expression)
+
+    # Fuzzy matching needs pg_trgm, which is a contrib module some servers do not ship;
+    # without it search falls back to prefix matching only
+    if _trigram_available():
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, expression in TRIGRAM_INDEXES.items():
+            create_index_concurrently(name, "users", f"({expression}) gin_trgm_ops", using="gin")
+
+
+def downgrade() -> None:
+    # The extension may be used by other objects, so it is left installed
+    for name in [*TRIGRAM_INDEXES, *PREFIX_INDEXES]:
+        drop_index_concurrently(name)
@@ -0,0 +1,39 @@
+"""add user stats views
+
+Revision ID: b8e2d4f61a37
+Revises: 7d3e1f9a2c64
+Create Date: 2026-10-19 14:08:12.530917
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8e2d4f61a37"
+down_revision: Union[str, None] = "7d3e1f9a2c64"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # REFRESH MATERIALIZED VIEW CONCURRENTLY needs a unique index on each view
+    op.execute(
+        "CREATE MATERIALIZED VIEW user_stats_totals AS "
+        "SELECT 1 AS id, count(*) AS total, count(*) FILTER (WHERE is_active) AS active, "
+        "count(*) FILTER (WHERE is_superuser) AS superusers, now() AS refreshed_at FROM users"
+    )
+    op.execute("CREATE UNIQUE INDEX ix_user_stats_totals_id ON user_stats_totals (id)")
+
+    # Weekly counts are summed from the daily ones, which stay small
+    op.execute(
+        "CREATE MATERIALIZED VIEW user_signups_daily AS "
+        "SELECT (created_at AT TIME ZONE 'UTC')::date AS day, count(*) AS signups FROM users GROUP BY 1"
+    )
+    op.execute("CREATE UNIQUE INDEX ix_user_signups_daily_day ON user_signups_daily (day)")
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS user_signups_daily")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS user_stats_totals")
@@ -0,0 +1,52 @@
+"""create bulk jobs table
+
+Revision ID: c4a9e7b25d18
+Revises: b8e2d4f61a37
+Create Date: 2026-10-19 15:21:47.802164
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a9e7b25d18"
+down_revision: Union[str, None] = "b8e2d4f61a37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "bulk_jobs",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("action", sa.String(), nullable=False),
+        sa.Column("params", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=True),
+        sa.Column("processed", sa.Integer(), nullable=False),
+        sa.Column("last_key", sa.UUID(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("created_by", sa.UUID(), nullable=True),
+        sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_bulk_jobs_unfinished_created_at",
+        "bulk_jobs",
+        ["created_at"],
+        unique=False,
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bulk_jobs_unfinished_created_at", table_name="bulk_jobs")
+    op.drop_table("bulk_jobs")
@@ -0,0 +1,59 @@
+"""add cache invalidation triggers
+
+Revision ID: d5b1f3a8c927
+Revises: c4a9e7b25d18
+Create Date: 2026-10-19 17:42:05.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5b1f3a8c927"
+down_revision: Union[str, None] = "c4a9e7b25d18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns written by activity tracking, which no cache depends on
+ACTIVITY_COLUMNS = "'last_login_at' - 'last_seen_at'"
+
+
+def upgrade() -> None:
+    # Publishes the old values of the key columns named by the trigger's arguments. NOTIFY is
+    # transactional, so listeners only hear about committed changes.
+    op.execute(
+        """
+        CREATE FUNCTION notify_cache_invalidation() RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE
+            old_row jsonb := to_jsonb(OLD);
+            keys jsonb := '{}';
+        BEGIN
+            FOR i IN 0 .. TG_NARGS - 1 LOOP
+                keys := keys || jsonb_build_object(TG_ARGV[i], old_row -> TG_ARGV[i]);
+            END LOOP;
+            PERFORM pg_notify(
+                'cache_invalidation',
+                jsonb_build_object('topic', TG_TABLE_NAME, 'op', TG_OP, 'keys', keys)::text
+            );
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER users_cache_invalidation_update AFTER UPDATE ON users FOR EACH ROW "
+        f"WHEN ((to_jsonb(OLD) - {ACTIVITY_COLUMNS}) IS DISTINCT FROM (to_jsonb(NEW) - {ACTIVITY_COLUMNS})) "
+        "EXECUTE FUNCTION notify_cache_invalidation('id', 'email')"
+    )
+    op.execute(
+        "CREATE TRIGGER users_cache_invalidation_delete AFTER DELETE ON users FOR EACH ROW "
+        "EXECUTE FUNCTION notify_cache_invalidation('id', 'email')"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS users_cache_invalidation_delete ON users")
+    op.execute("DROP TRIGGER IF EXISTS users_cache_invalidation_update ON users")
+    op.execute("DROP FUNCTION IF EXISTS notify_cache_invalidation()")
@@ -0,0 +1,28 @@
+"""add token version to users
+
+Revision ID: f8d2b6c4a913
+Revises: e7c3a9f1b206
+Create Date: 2026-10-19 21:12:47.530214
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f8d2b6c4a913"
+down_revision: Union[str, None] = "e7c3a9f1b206"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, so existing rows are not rewritten
+    op.add_column("users", sa.Column("token_version", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "token_version")
@@ -1,10 +1,13 @@
 # backend_core/api/v1/api.py
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from backend_core.api.v1.endpoints import auth, users
+from backend_core.api.v1.endpoints import auth, diagnostics, users
+from backend_core.core.deadlines import RequestBudget
 
-api_router = APIRouter()
+# Every endpoint gets the default latency budget unless it declares its own
+api_router = APIRouter(dependencies=[Depends(RequestBudget())])
 
 # Add routers from endpoints
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(diagnostics.router, prefix="/diagnostics", tags=["diagnostics"])
@@ -1,10 +1,14 @@
 # backend_core/api/v1/endpoints/auth.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
+from backend_core.core.forwarded import client_address
+from backend_core.core.login_limits import login_limiter
 from backend_core.core.security import create_access_token, verify_password
 from backend_core.core.settings import settings
+from backend_core.db.activity import activity_tracker
+from backend_core.db.audit import AuthEventType, audit_log
 from backend_core.db.session import get_db
 from backend_core.models.user import User
 from backend_core.schemas.token import Token
@@ -13,17 +17,37 @@ router = APIRouter()
 
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)) -> Token:
+def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)) -> Token:
     """Login endpoint for users."""
-    user = db.query(User).filter(User.email == form_data.username).first()
+    client_ip = client_address(request)
+    retry_after = login_limiter.retry_after(form_data.username, client_ip)
+    if retry_after is not None:
+        audit_log.record(
+            AuthEventType.LOGIN_FAILURE, email=form_data.username, request=request, details={"reason": "throttled"}
+        )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    user = db.query(User).options(undefer(User.hashed_password)).filter(User.email == form_data.username).first()
     if not user or not verify_password(form_data.password, user.hashed_password):
+        login_limiter.record_failure(form_data.username, client_ip)
+        audit_log.record(
+            AuthEventType.LOGIN_FAILURE, user_id=user.id if user else None, email=form_data.username, request=request
+        )
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(email=user.email)
+    login_limiter.record_success(form_data.username)
+    activity_tracker.record_login(user.id)
+    audit_log.record(AuthEventType.LOGIN_SUCCESS, user_id=user.id, email=user.email, request=request)
+    access_token = create_access_token(user.id, version=user.token_version)
+    audit_log.record(AuthEventType.TOKEN_ISSUED, user_id=user.id, email=user.email, request=request)
     return Token(
         access_token=access_token,
         token_type="bearer",
@@ -0,0 +1,86 @@
+"""Diagnostics endpoints, answered by whichever worker serves the request."""
+
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from backend_core.core.deps import get_current_superuser
+from backend_core.core.memory import (
+    GroupBy,
+    Snapshot,
+    allocation_profiler,
+    compare_snapshots,
+    gc_stats,
+    identity_map_sizes,
+    resident_set_size,
+)
+from backend_core.schemas.diagnostics import MemoryReport, SnapshotDiff, SnapshotRead, TracemallocStatus
+
+router = APIRouter(dependencies=[Depends(get_current_superuser)])
+
+
+def _snapshot_read(snapshot: Snapshot) -> SnapshotRead:
+    """Describe a kept snapshot."""
+    return SnapshotRead(id=snapshot.id, taken_at=snapshot.taken_at, traced_bytes=snapshot.traced_bytes)
+
+
+@router.get("/memory", response_model=MemoryReport)
+def read_memory() -> MemoryReport:
+    """Report resident memory, allocation tracing, garbage collection and ORM identity maps."""
+    return MemoryReport.model_validate(
+        {
+            "pid": os.getpid(),
+            "rss_bytes": resident_set_size(),
+            "tracemalloc": allocation_profiler.status(),
+            "snapshots": [_snapshot_read(snapshot) for snapshot in allocation_profiler.snapshots()],
+            "gc": gc_stats(),
+            "identity_maps": identity_map_sizes(),
+        }
+    )
+
+
+@router.post("/memory/tracemalloc/start", response_model=TracemallocStatus)
+def start_tracemalloc(frames: int = Query(1, ge=1, le=64)) -> TracemallocStatus:
+    """Start tracing allocations with ``frames`` frames per traceback."""
+    allocation_profiler.start(frames)
+    return TracemallocStatus.model_validate(allocation_profiler.status())
+
+
+@router.post("/memory/tracemalloc/stop", response_model=TracemallocStatus)
+def stop_tracemalloc() -> TracemallocStatus:
+    """Stop tracing allocations, keeping the snapshots already taken."""
+    allocation_profiler.stop()
+    return TracemallocStatus.model_validate(allocation_profiler.status())
+
+
+@router.post("/memory/snapshots", response_model=SnapshotRead, status_code=status.HTTP_201_CREATED)
+def take_snapshot() -> SnapshotRead:
+    """Take a snapshot of traced allocations for later comparison."""
+    try:
+        snapshot = allocation_profiler.take_snapshot()
+    except RuntimeError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Allocations are not being traced")
+    return _snapshot_read(snapshot)
+
+
+@router.get("/memory/snapshots/{first}/diff/{second}", response_model=SnapshotDiff)
+def diff_snapshots(
+    first: int,
+    second: int,
+    group_by: GroupBy = "lineno",
+    limit: int = Query(20, ge=1, le=200),
+) -> SnapshotDiff:
+    """Compare two snapshots, listing the allocation sites whose memory changed most."""
+    kept = {snapshot.id: snapshot for snapshot in allocation_profiler.snapshots()}
+    if first not in kept or second not in kept:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found")
+    old, new = kept[first], kept[second]
+    allocations = compare_snapshots(old, new, group_by=group_by, limit=limit)
+    return SnapshotDiff.model_validate(
+        {
+            "first": _snapshot_read(old),
+            "second": _snapshot_read(new),
+            "size_diff_bytes": new.traced_bytes - old.traced_bytes,
+            "allocations": [allocation._asdict() for allocation in allocations],
+        }
+    )
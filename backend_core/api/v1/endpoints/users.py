@@ -1,21 +1,54 @@
 """User endpoints."""
 
+import uuid
 from datetime import datetime, timezone
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 
-from backend_core.core.deps import get_current_user
+from backend_core.core.deadlines import RequestBudget
+from backend_core.core.deps import get_current_superuser, get_current_user, user_fields
+from backend_core.core.etag import (
+    CACHE_CONTROL,
+    check_user_not_modified,
+    compute_etag,
+    etag_matches,
+    remember_user_etag,
+    sparse_etag,
+)
+from backend_core.core.responses import ORJSONResponse, render, serialize
 from backend_core.core.security import get_password_hash
+from backend_core.core.settings import settings
+from backend_core.db.audit import AuthEventType, audit_log
+from backend_core.db.bulk import bulk_job_runner, submit_job
+from backend_core.db.search import decode_cursor, encode_cursor, search_users
 from backend_core.db.session import get_db
+from backend_core.db.stats import user_stats
+from backend_core.db.utils import CRUDBase
+from backend_core.models.bulk_job import BulkJob
 from backend_core.models.user import User
-from backend_core.schemas.user import UserCreate, UserRead, UserUpdate
+from backend_core.schemas.bulk_job import BulkJobRead, BulkUserOperation
+from backend_core.schemas.user import (
+    UserBatchRead,
+    UserBatchRequest,
+    UserCreate,
+    UserRead,
+    UserSearchPage,
+    UserStats,
+    UserUpdate,
+)
 
 router = APIRouter()
 
+crud_user = CRUDBase[User, UserCreate, UserUpdate](User)
+
+# The hottest read only does a primary-key or unique-index lookup
+USER_READ_BUDGET_MS = 1_000
+
 
 @router.post("/", response_model=UserRead)
-def create_user(user_in: UserCreate, db: Session = Depends(get_db)) -> User:
+def create_user(user_in: UserCreate, db: Session = Depends(get_db)) -> Response:
     """Create new user."""
     # Check if user exists
     user = db.query(User).filter(User.email == user_in.email).first()
@@ -35,24 +68,116 @@ def create_user(user_in: UserCreate, db: Session = Depends(get_db)) -> User:
     db.add(user)
     db.commit()
     db.refresh(user)
-    return user
+    return render(UserRead, user)
+
+
+@router.post("/batch", response_model=UserBatchRead, dependencies=[Depends(get_current_superuser)])
+def read_users_batch(
+    batch_in: UserBatchRequest,
+    fields: Optional[Tuple[str, ...]] = Depends(user_fields),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Resolve many users by ID with a single query, in request order, reporting the IDs not found."""
+    users = crud_user.read_many(db, batch_in.ids, keys=fields)
+    content = {
+        "users": [serialize(UserRead, user, fields) for user in users if user is not None],
+        "missing": [id for id, user in zip(batch_in.ids, users) if user is None],
+    }
+    return ORJSONResponse(content)
+
+
+@router.get("/search", response_model=UserSearchPage, dependencies=[Depends(get_current_superuser)])
+def search_users_endpoint(
+    q: str = Query(..., min_length=1, max_length=254),
+    limit: int = Query(settings.USER_SEARCH_DEFAULT_LIMIT, ge=1, le=settings.USER_SEARCH_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[Tuple[str, ...]] = Depends(user_fields),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Search users by email or name prefix, and fuzzily where supported, best matches first."""
+    try:
+        after = decode_cursor(cursor) if cursor is not None else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    # One extra row tells whether there is a next page
+    results = search_users(db, q, limit=limit + 1, after=after, keys=fields)
+    page = results[:limit]
+    next_cursor = encode_cursor(page[-1][1]) if len(results) > limit else None
+    items = [serialize(UserRead, user, fields) for user, _ in page]
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+@router.post("/bulk", response_model=BulkJobRead, status_code=status.HTTP_202_ACCEPTED)
+def submit_bulk_operation(
+    operation: BulkUserOperation,
+    current_user: User = Depends(get_current_superuser),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Queue a bulk operation on users, applied in chunks in the background; poll the returned job for progress."""
+    params = operation.model_dump(mode="json", exclude={"action"}, exclude_unset=True)
+    job = submit_job(db, operation.action, params, created_by=current_user.id)
+    bulk_job_runner.wake()
+    location = f"{settings.API_V1_STR}/users/bulk/{job.id}"
+    return render(BulkJobRead, job, status_code=status.HTTP_202_ACCEPTED, headers={"Location": location})
+
+
+@router.get("/bulk/{job_id}", response_model=BulkJobRead, dependencies=[Depends(get_current_superuser)])
+def read_bulk_job(job_id: uuid.UUID, db: Session = Depends(get_db)) -> Response:
+    """Get the status and progress of a bulk operation."""
+    job = db.get(BulkJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Bulk job not found")
+    return render(BulkJobRead, job)
 
 
-@router.get("/me", response_model=UserRead)
-def read_user_me(current_user: User = Depends(get_current_user)) -> User:
-    """Get current user."""
-    return current_user
+@router.get("/stats", response_model=UserStats, dependencies=[Depends(get_current_superuser)])
+def read_user_stats(
+    days: int = Query(30, ge=1, le=settings.USER_STATS_MAX_DAYS),
+    weeks: int = Query(12, ge=1, le=settings.USER_STATS_MAX_WEEKS),
+    db: Session = Depends(get_db),
+) -> Response:
+    """Get user counts and recent signups from the periodically refreshed statistics views."""
+    return ORJSONResponse(user_stats(db, days=days, weeks=weeks))
+
+
+@router.get(
+    "/me",
+    response_model=UserRead,
+    dependencies=[Depends(RequestBudget(USER_READ_BUDGET_MS)), Depends(check_user_not_modified)],
+)
+def read_user_me(
+    request: Request,
+    fields: Optional[Tuple[str, ...]] = Depends(user_fields),
+    current_user: User = Depends(get_current_user),
+) -> Response:
+    """Get current user, or the requested fields of them, honouring If-None-Match."""
+    etag = compute_etag(current_user)
+    remember_user_etag(current_user, etag)
+    # Each fieldset is a different representation, with its own ETag
+    etag = sparse_etag(etag, fields)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return render(UserRead, current_user, fields=fields, headers=headers)
 
 
 @router.put("/me", response_model=UserRead)
 def update_user_me(
+    request: Request,
     user_in: UserUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-) -> User:
-    """Update current user."""
+) -> Response:
+    """Update current user, honouring If-Match."""
+    if_match = request.headers.get("if-match")
+    if if_match is not None and not etag_matches(if_match, compute_etag(current_user), weak=False):
+        raise HTTPException(status_code=status.HTTP_412_PRECONDITION_FAILED, detail="User has been modified")
+
     if user_in.password is not None:
         current_user.hashed_password = get_password_hash(user_in.password)
+        # Tokens issued for the old password stop working
+        current_user.token_version += 1
     if user_in.email is not None:
         current_user.email = user_in.email
     if user_in.first_name is not None:
@@ -63,4 +188,12 @@ def update_user_me(
     current_user.updated_at = datetime.now(timezone.utc)
     db.commit()
     db.refresh(current_user)
-    return current_user
+
+    if user_in.password is not None:
+        audit_log.record(
+            AuthEventType.PASSWORD_CHANGED, user_id=current_user.id, email=current_user.email, request=request
+        )
+
+    etag = compute_etag(current_user)
+    remember_user_etag(current_user, etag)
+    return render(UserRead, current_user, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
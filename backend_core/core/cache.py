@@ -0,0 +1,56 @@
+# backend_core/core/cache.py
+"""In-process caching utilities."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+
+class TTLCache(Generic[KeyType, ValueType]):
+    """Thread-safe LRU cache whose entries expire after a fixed time to live."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        """Initialize an empty cache holding at most ``maxsize`` entries for ``ttl`` seconds."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[KeyType, Tuple[float, ValueType]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: KeyType) -> Optional[ValueType]:
+        """Return the cached value, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: KeyType, value: ValueType) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: KeyType) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, including any not yet purged after expiry."""
+        return len(self._data)
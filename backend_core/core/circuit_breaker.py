@@ -0,0 +1,297 @@
+# backend_core/core/circuit_breaker.py
+"""Circuit breaker that fails database work fast while Postgres is unreachable or too slow."""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Callable, Deque, Optional, Tuple
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import Engine, event
+
+from backend_core.core.metrics import registry
+from backend_core.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+circuit_state = registry.gauge("db_circuit_state", "State of the database circuit: 0 closed, 1 half-open, 2 open.")
+circuit_transitions = registry.counter(
+    "db_circuit_transitions_total", "Database circuit state changes, by the state entered.", ["state"]
+)
+circuit_rejections = registry.counter(
+    "db_circuit_rejected_total", "Database work refused without trying because the circuit was open."
+)
+
+
+class CircuitState(IntEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class DatabaseUnavailable(Exception):
+    """Raised instead of waiting on the database while the circuit is open."""
+
+    def __init__(self, retry_after: float):
+        """Record how long until the next recovery probe."""
+        super().__init__(f"Database unavailable; retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Track the outcomes of database calls and stop making them once too many fail or are slow.
+
+    Calls are remembered for ``window`` seconds. Once at least ``min_calls``
+    were made, the circuit opens when the share that failed reaches
+    ``failure_rate`` or the share slower than ``slow_call_seconds`` reaches
+    ``slow_rate``. While open, every call is refused at once. After
+    ``open_seconds`` the circuit is half-open: a single background probe is
+    let through, and closes the circuit if it succeeds in time or opens it
+    again for twice as long, up to ``max_open_seconds``, if not.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: float = settings.DB_CIRCUIT_WINDOW_SECONDS,
+        min_calls: int = settings.DB_CIRCUIT_MIN_CALLS,
+        failure_rate: float = settings.DB_CIRCUIT_FAILURE_RATE,
+        slow_call_seconds: float = settings.DB_CIRCUIT_SLOW_CALL_SECONDS,
+        slow_rate: float = settings.DB_CIRCUIT_SLOW_RATE,
+        open_seconds: float = settings.DB_CIRCUIT_OPEN_SECONDS,
+        max_open_seconds: float = settings.DB_CIRCUIT_MAX_OPEN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a closed circuit."""
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate = slow_rate
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # (time, failed, slow) of each call in the window
+        self._calls: Deque[Tuple[float, bool, bool]] = deque()
+        self._state = CircuitState.CLOSED
+        self._open_for = open_seconds
+        self._probe_at = 0.0
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state."""
+        return self._state
+
+    def _enter(self, state: CircuitState) -> None:
+        """Move to ``state``. Called with the lock held."""
+        if state == self._state:
+            return
+        self._state = state
+        circuit_state.set(state.value)
+        circuit_transitions.inc(state=state.name.lower())
+        log = logger.info if state == CircuitState.CLOSED else logger.warning
+        log("Database circuit %s", state.name.lower().replace("_", "-"))
+
+    def check(self) -> None:
+        """Raise ``DatabaseUnavailable`` unless the circuit is closed."""
+        if self._state == CircuitState.CLOSED:
+            return
+        circuit_rejections.inc()
+        raise DatabaseUnavailable(max(self._probe_at - self._clock(), 0.0))
+
+    def record(self, *, failed: bool, seconds: float = 0.0) -> None:
+        """Record the outcome of a call, opening the circuit if the thresholds are crossed."""
+        now = self._clock()
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                return
+            self._calls.append((now, failed, seconds >= self.slow_call_seconds))
+            while self._calls and self._calls[0][0] <= now - self.window:
+                self._calls.popleft()
+            count = len(self._calls)
+            if count < self.min_calls:
+                return
+            failures = sum(1 for _, failed_call, _ in self._calls if failed_call)
+            slow = sum(1 for _, _, slow_call in self._calls if slow_call)
+            if failures / count >= self.failure_rate or slow / count >= self.slow_rate:
+                self._open(now)
+
+    def record_success(self, seconds: float = 0.0) -> None:
+        """Record a call that succeeded after ``seconds``."""
+        self.record(failed=False, seconds=seconds)
+
+    def record_failure(self) -> None:
+        """Record a call that failed."""
+        self.record(failed=True)
+
+    def _open(self, now: float) -> None:
+        """Open the circuit until the next probe. Called with the lock held."""
+        self._calls.clear()
+        self._probe_at = now + self._open_for
+        self._enter(CircuitState.OPEN)
+
+    def trip(self) -> None:
+        """Open the circuit now."""
+        with self._lock:
+            self._open(self._clock())
+
+    def reset(self) -> None:
+        """Close the circuit and forget every call."""
+        with self._lock:
+            self._calls.clear()
+            self._open_for = self.open_seconds
+            self._enter(CircuitState.CLOSED)
+
+    def probe(self, attempt: Callable[[], Any]) -> bool:
+        """
+        Try ``attempt`` once if the circuit is open and due for a probe, returning whether it closed the circuit.
+
+        The attempt must bypass the breaker, since the circuit stays half-open
+        and refuses other calls while it runs.
+        """
+        with self._lock:
+            if self._state != CircuitState.OPEN or self._clock() < self._probe_at:
+                return False
+            self._enter(CircuitState.HALF_OPEN)
+        start = self._clock()
+        try:
+            attempt()
+            healthy = self._clock() - start < self.slow_call_seconds
+        except Exception as exc:
+            logger.warning("Database probe failed: %s", exc)
+            healthy = False
+        with self._lock:
+            if healthy:
+                self._open_for = self.open_seconds
+                self._enter(CircuitState.CLOSED)
+            else:
+                self._open_for = min(self._open_for * 2, self.max_open_seconds)
+                self._open(self._clock())
+        return healthy
+
+
+def guard_engine(engine: Engine, breaker: CircuitBreaker) -> None:
+    """
+    Put an engine's connections behind ``breaker``.
+
+    New connections are refused while the circuit is open, and otherwise
+    timed, with connection errors and slow connects counted against the
+    database. Statements are timed too, so a reachable but overloaded
+    database opens the circuit through its slow statements, and a statement
+    that finds its connection dead counts as a failure. Pool checkouts are
+    not counted: with a warm pool they would outnumber every real call.
+    """
+
+    @event.listens_for(engine, "do_connect")
+    def connect(dialect: Any, connection_record: Any, cargs: Any, cparams: Any) -> Any:
+        breaker.check()
+        start = time.perf_counter()
+        try:
+            connection = dialect.connect(*cargs, **cparams)
+        except dialect.loaded_dbapi.Error:
+            breaker.record_failure()
+            raise
+        breaker.record_success(time.perf_counter() - start)
+        return connection
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        if context is not None:
+            context._breaker_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        started = getattr(context, "_breaker_started", None)
+        if started is not None:
+            breaker.record_success(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context: Any) -> None:
+        if context.is_disconnect and not context.is_pre_ping and context.connection is not None:
+            breaker.record_failure()
+            return
+        # Other errors still mean the database answered, possibly only after a statement timeout
+        started = getattr(context.execution_context, "_breaker_started", None)
+        if started is not None:
+            breaker.record_success(time.perf_counter() - started)
+
+
+def ping(engine: Engine) -> None:
+    """Open a connection of the engine's database outside its pool and events, and run a trivial query."""
+    cargs, cparams = engine.dialect.create_connect_args(engine.url)
+    connection: Any = engine.dialect.connect(*cargs, **cparams)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        connection.close()
+
+
+class CircuitProbe:
+    """Probe the database from a background thread while the circuit is open, to close it on recovery."""
+
+    name = "db-circuit-probe"
+
+    def __init__(
+        self,
+        breaker: CircuitBreaker,
+        attempt: Callable[[], Any],
+        *,
+        interval: float = settings.DB_CIRCUIT_PROBE_INTERVAL_SECONDS,
+    ):
+        """Initialize a stopped probe."""
+        self.breaker = breaker
+        self.attempt = attempt
+        self.interval = interval
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        """Probe when due until stopped."""
+        while not self._stopping.wait(self.interval):
+            try:
+                self.breaker.probe(self.attempt)
+            except Exception:
+                logger.exception("%s failed; will retry", self.name)
+
+    def start(self) -> None:
+        """Start the background probe if it is not running."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background probe."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+
+
+def unavailable_response(exc: DatabaseUnavailable) -> JSONResponse:
+    """Build the 503 answered while the circuit is open."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database unavailable"},
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+async def database_unavailable_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Map ``DatabaseUnavailable`` to 503 with ``Retry-After``."""
+    if not isinstance(exc, DatabaseUnavailable):
+        raise exc
+    return unavailable_response(exc)
+
+
+db_breaker = CircuitBreaker()
@@ -0,0 +1,103 @@
+# backend_core/core/deadlines.py
+"""Per-request latency budgets enforced through Postgres timeouts."""
+
+import time
+from typing import Optional
+
+from fastapi import Depends, Request, status
+from fastapi.responses import JSONResponse
+from psycopg2 import errorcodes
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, SessionTransaction
+
+from backend_core.core.metrics import registry
+from backend_core.core.settings import settings
+from backend_core.db.session import get_db
+
+# Session.info key holding the request's absolute deadline on the monotonic clock
+DEADLINE_KEY = "deadline"
+
+statements_cancelled = registry.counter(
+    "db_statements_cancelled_total", "Statements cancelled by a Postgres timeout.", ["reason"]
+)
+deadlines_exceeded = registry.counter(
+    "request_deadlines_exceeded_total", "Requests whose latency budget ran out before a transaction could start."
+)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's latency budget is spent before its next transaction starts."""
+
+
+def apply_deadline(connection: Connection, deadline: float) -> None:
+    """Bound the current transaction's statements and lock waits by the time left until ``deadline``."""
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if remaining_ms <= 0:
+        deadlines_exceeded.inc()
+        raise DeadlineExceeded()
+    # set_config(..., true) is SET LOCAL, so the timeouts end with the transaction
+    # and never leak into the next user of the pooled connection
+    connection.execute(
+        text("SELECT set_config('statement_timeout', :ms, true), set_config('lock_timeout', :ms, true)"),
+        {"ms": str(remaining_ms)},
+    )
+
+
+def set_deadline(db: Session, deadline: float) -> None:
+    """Attach a deadline to a session; every transaction it begins gets the remaining budget."""
+    db.info[DEADLINE_KEY] = deadline
+    if db.in_transaction():
+        apply_deadline(db.connection(), deadline)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_session_deadline(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+    """Apply the session's deadline, if any, to each transaction it begins."""
+    deadline = session.info.get(DEADLINE_KEY)
+    if deadline is not None:
+        apply_deadline(connection, deadline)
+
+
+class RequestBudget:
+    """
+    Dependency giving a request a latency budget on its database session.
+
+    The API router installs the default from ``settings.REQUEST_BUDGET_MS``.
+    Endpoints override it by declaring their own ``RequestBudget(milliseconds)``
+    dependency, which runs after the router's and replaces its deadline. The
+    budget is measured from the first budget dependency of the request.
+    """
+
+    def __init__(self, milliseconds: Optional[int] = None):
+        """Initialize with a budget in milliseconds, or the settings default."""
+        self.milliseconds = milliseconds
+
+    def __call__(self, request: Request, db: Session = Depends(get_db)) -> None:
+        """Set the request's deadline on its session."""
+        started_at = getattr(request.state, "budget_started_at", None)
+        if started_at is None:
+            started_at = request.state.budget_started_at = time.monotonic()
+        milliseconds = self.milliseconds if self.milliseconds is not None else settings.REQUEST_BUDGET_MS
+        set_deadline(db, started_at + milliseconds / 1000)
+
+
+async def deadline_exceeded_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Report a spent budget as a gateway timeout."""
+    return JSONResponse(status_code=status.HTTP_504_GATEWAY_TIMEOUT, content={"detail": "Request deadline exceeded"})
+
+
+async def database_timeout_handler(request: Request, exc: Exception) -> JSONResponse:
+    """Map statements cancelled by statement_timeout to 504 and by lock_timeout to 503."""
+    pgcode = getattr(getattr(exc, "orig", None), "pgcode", None)
+    if pgcode == errorcodes.QUERY_CANCELED:
+        statements_cancelled.inc(reason="statement_timeout")
+        return JSONResponse(status_code=status.HTTP_504_GATEWAY_TIMEOUT, content={"detail": "Database query timed out"})
+    if pgcode == errorcodes.LOCK_NOT_AVAILABLE:
+        statements_cancelled.inc(reason="lock_timeout")
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Database is busy"},
+            headers={"Retry-After": "1"},
+        )
+    raise exc
@@ -1,45 +1,150 @@
-from typing import Annotated, Optional
+import uuid
+from typing import Annotated, NamedTuple, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
 
+from backend_core.core.logs import bind_user
+from backend_core.core.responses import FieldSelection
 from backend_core.core.settings import settings
+from backend_core.core.singleflight import SingleFlight
+from backend_core.core.tracing import span, traced
+from backend_core.db.activity import activity_tracker
 from backend_core.db.session import get_db
+from backend_core.db.utils import attach, detached_copy
 from backend_core.models.user import User
+from backend_core.schemas.user import UserRead
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
+# Coalesces concurrent lookups of the same user, e.g. a burst of requests
+# carrying one popular token right after a deploy or cache expiry
+user_lookups: SingleFlight[Optional[User]] = SingleFlight()
 
-def decode_token(token: str) -> Optional[str]:
-    """Decode a JWT and extract the email (subject)."""
+# The sparse fieldset of a user read, from its ``fields`` query parameter
+user_fields = FieldSelection(UserRead)
+
+
+class TokenClaims(NamedTuple):
+    """The claims of an access token that identify its user."""
+
+    # The user's ID, or their email in tokens issued before subjects became IDs
+    subject: str
+    # The user's token version when the token was issued, if the token carries one
+    version: Optional[int] = None
+
+    @property
+    def user_id(self) -> Optional[uuid.UUID]:
+        """The user ID in the subject, or ``None`` if the subject is an email."""
+        try:
+            return uuid.UUID(self.subject)
+        except ValueError:
+            return None
+
+
+@traced("decode_token")
+def decode_claims(token: str) -> Optional[TokenClaims]:
+    """Decode a JWT and extract its subject and version claims."""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email = payload.get("sub")
-        if isinstance(email, str):  # Ensure type is str
-            return email
-        return None
     except JWTError:
         return None
+    subject, version = payload.get("sub"), payload.get("ver")
+    if not isinstance(subject, str) or not (version is None or isinstance(version, int)):
+        return None
+    return TokenClaims(subject, version)
+
+
+def decode_token(token: str) -> Optional[str]:
+    """Decode a JWT and extract its subject."""
+    claims = decode_claims(token)
+    return claims.subject if claims is not None else None
+
+
+def _load_user(user_id: uuid.UUID, db: Session) -> Optional[User]:
+    """Get a user by primary key and return a detached copy that any session can attach."""
+    user = db.get(User, user_id)
+    return detached_copy(user) if user is not None else None
+
+
+@traced("get_user")
+def get_user(user_id: uuid.UUID, db: Session) -> Optional[User]:
+    """Retrieve a user by ID from the session's identity map or the database, sharing concurrent lookups."""
+    if identity_key(User, user_id) in db.identity_map:
+        return db.get(User, user_id)
+    return attach(db, user_lookups.do(("id", user_id), lambda: _load_user(user_id, db)))
+
 
+async def aget_user(user_id: uuid.UUID, db: Session) -> Optional[User]:
+    """Retrieve a user by ID without blocking the event loop, sharing concurrent lookups."""
+    with span("get_user"):
+        if identity_key(User, user_id) in db.identity_map:
+            return db.get(User, user_id)
+        return attach(db, await user_lookups.do_async(("id", user_id), lambda: _load_user(user_id, db)))
 
+
+def _load_user_by_email(email: str, db: Session) -> Optional[User]:
+    """Query a user by email and return a detached copy that any session can attach."""
+    user = db.query(User).filter(User.email == email).first()
+    return detached_copy(user) if user is not None else None
+
+
+def _held_user_by_email(email: str, db: Session) -> Optional[User]:
+    """Find a user with the given email among those in the session's identity map, without emitting SQL."""
+    for obj in db.identity_map.values():
+        if isinstance(obj, User) and inspect(obj).dict.get("email") == email:
+            return obj
+    return None
+
+
+def _attach_user(db: Session, user: Optional[User]) -> Optional[User]:
+    """Attach a shared copy of a user, unless the session already holds that user, whose state must win."""
+    if user is not None and identity_key(User, user.id) in db.identity_map:
+        return db.get(User, user.id)
+    return attach(db, user)
+
+
+@traced("get_user_by_email")
 def get_user_by_email(email: str, db: Session) -> Optional[User]:
-    """Retrieve a user by email from the database."""
-    return db.query(User).filter(User.email == email).first()
+    """Retrieve a user by email from the session's identity map or the database, sharing concurrent lookups."""
+    user = _held_user_by_email(email, db)
+    if user is not None:
+        return user
+    return _attach_user(db, user_lookups.do(("email", email), lambda: _load_user_by_email(email, db)))
+
+
+async def aget_user_by_email(email: str, db: Session) -> Optional[User]:
+    """Retrieve a user by email without blocking the event loop, sharing concurrent lookups."""
+    with span("get_user_by_email"):
+        user = _held_user_by_email(email, db)
+        if user is not None:
+            return user
+        return _attach_user(db, await user_lookups.do_async(("email", email), lambda: _load_user_by_email(email, db)))
 
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Session = Depends(get_db)) -> User:
-    """Get current user from token."""
-    email = decode_token(token)
-    if not email:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    """
+    Get current user from token.
 
-    user = get_user_by_email(email, db)
+    The token's subject is the user's ID, resolved by primary key. Tokens
+    whose subject is an email are resolved through the email index while
+    ``ACCEPT_EMAIL_SUBJECT_TOKENS`` is set. A token carrying a version is
+    refused once the user's token version has moved on.
+    """
+    claims = decode_claims(token)
+    user = None
+    if claims is not None:
+        user_id = claims.user_id
+        if user_id is not None:
+            user = await aget_user(user_id, db)
+        elif settings.ACCEPT_EMAIL_SUBJECT_TOKENS:
+            user = await aget_user_by_email(claims.subject, db)
+        if user is not None and claims.version is not None and claims.version != user.token_version:
+            user = None
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,4 +152,13 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)], db: Se
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    activity_tracker.record_seen(user.id)
+    bind_user(user.id)
     return user
+
+
+def get_current_superuser(current_user: User = Depends(get_current_user)) -> User:
+    """Get current user, requiring superuser privileges."""
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough privileges")
+    return current_user
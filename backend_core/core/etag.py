@@ -0,0 +1,106 @@
+# backend_core/core/etag.py
+"""Entity tags and conditional request handling."""
+
+import hashlib
+from typing import Any, Dict, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+
+from backend_core.core.cache import TTLCache
+from backend_core.core.deps import decode_claims, oauth2_scheme, user_fields
+from backend_core.core.settings import settings
+from backend_core.db.invalidation import invalidation_listener
+from backend_core.models.user import User
+
+# Clients may store user representations but must revalidate them on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+class UserETag(NamedTuple):
+    """A user's current ETag and the token version it was computed under."""
+
+    etag: str
+    token_version: int
+
+
+# Current ETag of each user's representation, keyed by user ID, the token subject, so that
+# conditional GETs can be answered before the user is loaded from the database.
+user_etags: TTLCache[str, UserETag] = TTLCache(
+    maxsize=settings.USER_ETAG_CACHE_MAX_SIZE, ttl=settings.USER_ETAG_CACHE_TTL_SECONDS
+)
+
+
+def _evict_user_etag(keys: Dict[str, Any]) -> None:
+    """Forget the ETag of a user changed by any worker."""
+    user_etags.pop(keys["id"])
+
+
+invalidation_listener.subscribe("users", _evict_user_etag, user_etags.clear)
+
+
+def remember_user_etag(user: User, etag: str) -> None:
+    """Cache a user's current ETag for conditional GETs made with tokens of their current version."""
+    user_etags.set(str(user.id), UserETag(etag, user.token_version))
+
+
+def compute_etag(obj: Any) -> str:
+    """Derive a strong ETag from a row's primary key and last modification time."""
+    version = f"{obj.id}:{obj.updated_at.isoformat()}".encode()
+    return f'"{hashlib.blake2b(version, digest_size=16).hexdigest()}"'
+
+
+def sparse_etag(etag: str, fields: Optional[Sequence[str]]) -> str:
+    """Derive the ETag of a representation limited to ``fields`` from that of the full one."""
+    if fields is None:
+        return etag
+    version = f"{etag}:{','.join(fields)}".encode()
+    return f'"{hashlib.blake2b(version, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(header: Optional[str], etag: str, *, weak: bool = True) -> bool:
+    """
+    Check whether a conditional header matches an ETag.
+
+    If-None-Match uses the weak comparison, If-Match the strong one, under which
+    weak validators never match.
+    """
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def check_user_not_modified(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    fields: Optional[Tuple[str, ...]] = Depends(user_fields),
+) -> None:
+    """
+    Answer a conditional GET for the current user, or the requested fields of them, from the ETag cache.
+
+    Only tokens of the user's current version are answered here; any other token, including one
+    without a version, falls through to full authentication, which rejects it if revoked.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return
+    claims = decode_claims(token)
+    if claims is None or claims.version is None:
+        return
+    cached = user_etags.get(claims.subject)
+    if cached is None or cached.token_version != claims.version:
+        return
+    etag = sparse_etag(cached.etag, fields)
+    if etag_matches(if_none_match, etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
@@ -0,0 +1,53 @@
+# backend_core/core/forwarded.py
+"""
+Client addresses of requests that arrive through reverse proxies.
+
+Behind a proxy every request comes from the proxy's address. The real client
+is taken from ``X-Forwarded-For`` only when the peer is listed in
+``settings.TRUSTED_PROXIES``: the header is read from the right, skipping
+trusted hops, and the first address not trusted is the client's. Entries
+further left were supplied by the client and could be forged.
+"""
+
+import ipaddress
+from typing import List, Optional, Sequence, Union
+
+from starlette.requests import Request
+
+from backend_core.core.settings import settings
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+def parse_networks(proxies: Sequence[str]) -> List[Network]:
+    """Parse addresses and CIDR ranges of trusted proxies."""
+    return [ipaddress.ip_network(proxy.strip(), strict=False) for proxy in proxies]
+
+
+trusted_proxies = parse_networks(settings.TRUSTED_PROXIES)
+
+
+def _is_trusted(address: str, networks: Sequence[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def client_address(request: Request, networks: Optional[Sequence[Network]] = None) -> Optional[str]:
+    """Return the address of the client behind any trusted proxies, or None if it is unknown."""
+    if networks is None:
+        networks = trusted_proxies
+    if request.client is None:
+        return None
+    if not _is_trusted(request.client.host, networks):
+        return request.client.host
+    hops = [hop.strip() for value in request.headers.getlist("x-forwarded-for") for hop in value.split(",")]
+    for hop in reversed(hops):
+        if not hop:
+            break
+        if not _is_trusted(hop, networks):
+            return hop
+    # Only our own proxies are known, and their address is not the client's
+    return None
@@ -0,0 +1,213 @@
+# backend_core/core/idempotency.py
+"""``Idempotency-Key`` handling for POST requests."""
+
+import asyncio
+import hashlib
+import time
+import uuid
+from typing import Any, Callable, List, Optional, TypeVar
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend_core.core.circuit_breaker import DatabaseUnavailable, unavailable_response
+from backend_core.core.deps import decode_token
+from backend_core.core.metrics import registry
+from backend_core.core.settings import settings
+from backend_core.db.idempotency import KeyState, StoredResponse, begin, complete, release
+from backend_core.db.session import SessionLocal
+
+ResultType = TypeVar("ResultType")
+
+HEADER = b"idempotency-key"
+REPLAYED_HEADER = "idempotent-replayed"
+MAX_KEY_LENGTH = 255
+
+# Larger responses are not stored, and a retry runs the request again
+MAX_STORED_BODY_BYTES = 1024 * 1024
+
+# Issued credentials must never be written to the database
+EXCLUDED_PATHS = frozenset({f"{settings.API_V1_STR}/auth/login"})
+
+# Headers that describe one delivery rather than the response itself
+_NOT_STORED = frozenset({"set-cookie", "date", "server"})
+
+idempotent_requests = registry.counter(
+    "http_idempotent_requests_total", "POST requests carrying an Idempotency-Key, by outcome.", ["outcome"]
+)
+
+
+def _error(status_code: int, detail: str, headers: Optional[dict] = None) -> JSONResponse:
+    """Build a JSON error response like FastAPI's ``HTTPException`` handler."""
+    return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
+
+
+class IdempotencyMiddleware:
+    """
+    Run each POST carrying an ``Idempotency-Key`` header at most once, and replay its response.
+
+    Keys are scoped by method, path and the subject of the bearer token, so
+    callers never see each other's responses. The first request claims the
+    key in the database; its response is stored for ``IDEMPOTENCY_KEY_TTL_SECONDS``
+    if the status is below 500, and the key is released otherwise so that a
+    retry runs again. A duplicate that arrives while the first request is
+    still running waits up to ``wait_timeout`` seconds for its response and
+    then answers 409. Reusing a key for a different body answers 422.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        wait_timeout: float = settings.IDEMPOTENCY_WAIT_SECONDS,
+        session_factory: Callable[[], Any] = SessionLocal,
+    ):
+        """Wrap ``app``."""
+        self.app = app
+        self.wait_timeout = wait_timeout
+        self.session_factory = session_factory
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve a request, replaying or storing its response when it carries an idempotency key."""
+        key = self._key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH or not key.isprintable():
+            response = _error(status.HTTP_400_BAD_REQUEST, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")
+            await response(scope, receive, send)
+            return
+
+        body = await self._read_body(receive)
+        key_scope = self._scope(scope)
+        fingerprint = self._fingerprint(scope, body)
+        deadline = time.monotonic() + self.wait_timeout
+        delay = 0.02
+        while True:
+            try:
+                state, claimed, stored = await run_in_threadpool(self._call, begin, key_scope, key, fingerprint)
+            except DatabaseUnavailable as exc:
+                # Middlewares are outside the application's exception handlers
+                await unavailable_response(exc)(scope, receive, send)
+                return
+            if state != KeyState.IN_PROGRESS or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, 0.5)
+
+        idempotent_requests.inc(outcome=state.value)
+        if state == KeyState.COMPLETED and stored is not None:
+            await self._replay(stored, send)
+        elif state == KeyState.MISMATCH:
+            response = _error(
+                status.HTTP_422_UNPROCESSABLE_ENTITY, "Idempotency-Key was already used for a different request"
+            )
+            await response(scope, receive, send)
+        elif state == KeyState.IN_PROGRESS or claimed is None:
+            response = _error(
+                status.HTTP_409_CONFLICT,
+                "A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+        else:
+            await self._run(scope, receive, send, body, claimed)
+
+    @staticmethod
+    def _key(scope: Scope) -> Optional[str]:
+        """Return the idempotency key of a POST request, if it has one and the route supports it."""
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] in EXCLUDED_PATHS:
+            return None
+        for name, value in scope["headers"]:
+            if name == HEADER:
+                key: str = value.decode("latin-1").strip()
+                return key
+        return None
+
+    @staticmethod
+    def _scope(scope: Scope) -> str:
+        """Return the namespace of a key: the method, path and caller of the request."""
+        subject = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer":
+                    subject = decode_token(token)
+        return f"{scope['method']} {scope['path']} {subject or '-'}"
+
+    @staticmethod
+    def _fingerprint(scope: Scope, body: bytes) -> str:
+        """Digest the parts of a request that must match for a key to be reused."""
+        digest = hashlib.sha256(scope.get("query_string", b""))
+        for name, value in scope["headers"]:
+            if name == b"content-type":
+                digest.update(value)
+        digest.update(b"\0" + body)
+        return digest.hexdigest()
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        """Read the whole request body."""
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    def _call(self, operation: Callable[..., ResultType], *args: Any) -> ResultType:
+        """Run a storage operation in a session of its own."""
+        with self.session_factory() as db:
+            return operation(db, *args)
+
+    async def _run(self, scope: Scope, receive: Receive, send: Send, body: bytes, claimed: uuid.UUID) -> None:
+        """Run the request, passing its response through and storing it."""
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        sent_body = False
+
+        async def receive_body() -> Message:
+            nonlocal sent_body
+            if not sent_body:
+                sent_body = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            # The body is consumed, so the server only has a disconnect left to report
+            return await receive()
+
+        async def capture(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, capture)
+        except BaseException:
+            await run_in_threadpool(self._call, release, claimed)
+            raise
+
+        response_body = b"".join(chunks)
+        if start is None or start["status"] >= 500 or len(response_body) > MAX_STORED_BODY_BYTES:
+            await run_in_threadpool(self._call, release, claimed)
+            return
+        headers = [
+            (name.decode("latin-1"), value.decode("latin-1"))
+            for name, value in start.get("headers", [])
+            if name.decode("latin-1").lower() not in _NOT_STORED
+        ]
+        await run_in_threadpool(self._call, complete, claimed, StoredResponse(start["status"], headers, response_body))
+
+    @staticmethod
+    async def _replay(stored: StoredResponse, send: Send) -> None:
+        """Send a stored response again, marked as a replay."""
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in stored.headers]
+        headers.append((REPLAYED_HEADER.encode(), b"true"))
+        await send({"type": "http.response.start", "status": stored.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": stored.body})
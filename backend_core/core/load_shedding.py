@@ -0,0 +1,173 @@
+# backend_core/core/load_shedding.py
+"""Concurrency limiting with a bounded priority queue that sheds load when overloaded."""
+
+import asyncio
+import heapq
+import itertools
+from enum import IntEnum
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from backend_core.core.metrics import registry
+from backend_core.core.settings import settings
+from backend_core.db.session import pool_saturation
+
+requests_shed = registry.counter(
+    "http_requests_shed_total", "Requests rejected with 503 because the service was overloaded.", ["reason", "priority"]
+)
+
+
+class Priority(IntEnum):
+    """Admission priority of a request; lower values are admitted first."""
+
+    CRITICAL = 0
+    HIGH = 1
+    NORMAL = 2
+    LOW = 3
+
+
+def classify(scope: Scope) -> Priority:
+    """
+    Assign a priority from the request line and headers alone.
+
+    Health, readiness and metrics probes are critical and bypass the limiter, so
+    orchestrators can still see an overloaded instance. Authenticated reads
+    come next, and signups, which hash a password and insert a row, come last.
+    """
+    path, method = scope["path"], scope["method"]
+    if path in ("/health", "/ready", "/metrics"):
+        return Priority.CRITICAL
+    if method == "POST" and path.rstrip("/") == f"{settings.API_V1_STR}/users":
+        return Priority.LOW
+    authenticated = any(name == b"authorization" for name, _ in scope["headers"])
+    if authenticated and method in ("GET", "HEAD"):
+        return Priority.HIGH
+    return Priority.NORMAL
+
+
+class LoadSheddingMiddleware:
+    """
+    Limit the requests in flight and queue the rest by priority.
+
+    A request is admitted straight away while fewer than ``max_in_flight``
+    requests are running; otherwise it waits in a queue of at most
+    ``max_queued`` requests, ordered by priority and then arrival. Load is shed
+    with 503 and ``Retry-After`` when:
+
+    * the queue is full, in which case a newcomer displaces the lowest-priority
+      waiter if it outranks it, and is rejected otherwise;
+    * a request waited longer than ``queue_timeout`` seconds;
+    * the database pool is at least ``saturation_threshold`` checked out, for
+      any request below high priority that would have to queue, since waiting
+      would only move the wait to a pool checkout.
+
+    Critical requests are never queued, counted or shed.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        max_in_flight: int = settings.MAX_IN_FLIGHT_REQUESTS,
+        max_queued: int = settings.MAX_QUEUED_REQUESTS,
+        queue_timeout: float = settings.QUEUE_TIMEOUT_SECONDS,
+        saturation_threshold: float = settings.POOL_SATURATION_THRESHOLD,
+        retry_after: int = settings.LOAD_SHED_RETRY_AFTER_SECONDS,
+        saturation: Callable[[], float] = pool_saturation,
+        classifier: Callable[[Scope], Priority] = classify,
+    ):
+        """Initialize the middleware with no requests in flight."""
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.saturation_threshold = saturation_threshold
+        self.retry_after = retry_after
+        self.saturation = saturation
+        self.classifier = classifier
+        self.in_flight = 0
+        # Waiters as (priority, arrival, future); the future resolves to True when
+        # admitted and to False when displaced by a higher-priority request
+        self._queue: List[Tuple[Priority, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        """Return the number of waiting requests."""
+        return len(self._queue)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Admit, queue or shed an HTTP request."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        priority = self.classifier(scope)
+        if priority == Priority.CRITICAL:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await self._acquire(priority)
+        if reason is not None:
+            requests_shed.inc(reason=reason, priority=priority.name.lower())
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Service overloaded"},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: Priority) -> Optional[str]:
+        """Take an in-flight slot, waiting if needed; return why the request was shed, if it was."""
+        if self.in_flight < self.max_in_flight and not self._queue:
+            self.in_flight += 1
+            return None
+        if priority > Priority.HIGH and self.saturation() >= self.saturation_threshold:
+            return "pool_saturated"
+        if len(self._queue) >= self.max_queued:
+            lowest = max(self._queue)
+            if lowest[0] <= priority:
+                return "queue_full"
+            self._queue.remove(lowest)
+            heapq.heapify(self._queue)
+            lowest[2].set_result(False)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._arrivals), future)
+        heapq.heappush(self._queue, entry)
+        try:
+            admitted = await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            # The slot may have been handed over just as the wait timed out
+            if future.done():
+                admitted = future.result()
+            else:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                return "queue_timeout"
+        except asyncio.CancelledError:
+            # The client went away; give back a slot handed over meanwhile
+            if future.done():
+                if future.result():
+                    self._release()
+            else:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+            raise
+        return None if admitted else "displaced"
+
+    def _release(self) -> None:
+        """Hand the finished request's slot to the first waiter, or free it."""
+        if self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            # The slot passes on directly, so in_flight is unchanged
+            future.set_result(True)
+        else:
+            self.in_flight -= 1
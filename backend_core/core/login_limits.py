@@ -0,0 +1,79 @@
+# backend_core/core/login_limits.py
+"""Throttling of failed logins per account and per client address."""
+
+import math
+import time
+from pathlib import Path
+from typing import Optional
+
+from backend_core.core.metrics import registry
+from backend_core.core.settings import settings
+from backend_core.core.shared_memory import WindowCounters
+
+logins_throttled = registry.counter(
+    "login_throttled_total", "Login attempts refused because of too many recent failures.", ["scope"]
+)
+
+
+class LoginLimiter:
+    """
+    Refuse logins for an email or a client address after too many recent failures.
+
+    Failures are counted in windows of ``window`` seconds from the first one,
+    in ``WindowCounters`` that the workers of a host share, so the limits
+    hold however requests are spread across workers. A successful login
+    clears the account's count but not the address's. Requests whose client
+    address is unknown are only limited per account, so that they do not all
+    share one address's count.
+    """
+
+    def __init__(
+        self,
+        counters: WindowCounters,
+        *,
+        max_per_email: int = settings.LOGIN_MAX_FAILURES_PER_EMAIL,
+        max_per_ip: int = settings.LOGIN_MAX_FAILURES_PER_IP,
+        window: float = settings.LOGIN_FAILURE_WINDOW_SECONDS,
+    ):
+        """Initialize the limiter over ``counters``."""
+        self.counters = counters
+        self.max_per_email = max_per_email
+        self.max_per_ip = max_per_ip
+        self.window = window
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return f"login:email:{email.strip().lower()}"
+
+    @staticmethod
+    def _ip_key(ip: str) -> str:
+        return f"login:ip:{ip}"
+
+    def retry_after(self, email: str, ip: Optional[str]) -> Optional[int]:
+        """Return the seconds until a login may be attempted again, or None if it may be now."""
+        now = time.time()
+        blocked_until = 0.0
+        scopes = [("email", self._email_key(email), self.max_per_email)]
+        if ip is not None:
+            scopes.append(("ip", self._ip_key(ip), self.max_per_ip))
+        for scope, key, limit in scopes:
+            count, expires_at = self.counters.get(key)
+            if count >= limit:
+                logins_throttled.inc(scope=scope)
+                blocked_until = max(blocked_until, expires_at)
+        return max(1, math.ceil(blocked_until - now)) if blocked_until else None
+
+    def record_failure(self, email: str, ip: Optional[str]) -> None:
+        """Count a failed login against the email and the client address, if it is known."""
+        self.counters.hit(self._email_key(email), self.window)
+        if ip is not None:
+            self.counters.hit(self._ip_key(ip), self.window)
+
+    def record_success(self, email: str) -> None:
+        """Clear the failures counted against an email."""
+        self.counters.reset(self._email_key(email))
+
+
+login_limiter = LoginLimiter(
+    WindowCounters(Path(settings.SHARED_MEMORY_DIR) / "login_limits.db" if settings.SHARED_MEMORY_DIR else None)
+)
@@ -0,0 +1,242 @@
+# backend_core/core/logs.py
+"""
+Structured logging that never blocks the code that logs.
+
+Records are tagged with the request they belong to and put on a bounded
+queue; a background thread formats them as JSON lines and writes them out.
+When the queue is full, records are dropped and counted rather than waited
+for. Debug records are sampled per request, so a sampled request keeps all
+of its debug records.
+"""
+
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, Optional
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend_core.core.metrics import registry
+from backend_core.core.settings import settings
+from backend_core.core.tracing import current_span
+
+REQUEST_ID_HEADER = b"x-request-id"
+MAX_REQUEST_ID_LENGTH = 128
+
+records_dropped = registry.counter(
+    "log_records_dropped_total", "Log records discarded instead of written, by reason.", ["reason"]
+)
+
+access_logger = logging.getLogger("backend_core.access")
+
+# Attributes every record has; anything else was passed in ``extra`` and is written as a field
+_RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+
+class RequestContext:
+    """What the current request is known to be about; filled in as the request is served."""
+
+    __slots__ = ("request_id", "user_id", "scope", "sample_debug")
+
+    def __init__(self, request_id: str, scope: Scope, sample_debug: bool):
+        """Start the context of a request."""
+        self.request_id = request_id
+        self.user_id: Optional[str] = None
+        self.scope = scope
+        self.sample_debug = sample_debug
+
+    @property
+    def route(self) -> Optional[str]:
+        """The path template of the matched route, once the router has matched one."""
+        route: Optional[str] = getattr(self.scope.get("route"), "path", None)
+        return route
+
+
+request_context: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def bind_user(user_id: Any) -> None:
+    """Tag the rest of the current request's records with the ID of its user."""
+    context = request_context.get()
+    if context is not None:
+        context.user_id = str(user_id)
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render the record, its request context and its extra fields."""
+        document: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name, value in record.__dict__.items():
+            if name not in _RECORD_ATTRIBUTES and value is not None:
+                document[name] = value
+        if record.exc_info:
+            document["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            document["exception"] = record.exc_text
+        return orjson.dumps(document, default=str).decode()
+
+
+class QueueingHandler(logging.handlers.QueueHandler):
+    """
+    Tag records with their request and put them on a bounded queue without waiting.
+
+    Only the message is interpolated on the calling thread, so that arguments
+    changed after the call do not change the record; serialization happens
+    on the writer thread.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[Optional[logging.LogRecord]]", *, debug_sample_rate: float):
+        """Initialize a handler feeding ``log_queue``."""
+        super().__init__(log_queue)
+        self.debug_sample_rate = debug_sample_rate
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Queue a record, unless it is a debug record outside the sample or the queue is full."""
+        context = request_context.get()
+        if record.levelno <= logging.DEBUG:
+            sampled = context.sample_debug if context is not None else random.random() < self.debug_sample_rate
+            if not sampled:
+                records_dropped.inc(reason="sampled")
+                return
+        if context is not None:
+            record.request_id = context.request_id
+            record.user_id = context.user_id
+            record.route = context.route
+        traced_span = current_span()
+        if traced_span is not None:
+            record.trace_id = traced_span.trace.trace_id
+            record.span_id = traced_span.span_id
+        record.msg = record.getMessage()
+        record.args = None
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            records_dropped.inc(reason="queue_full")
+
+
+class LogWriter:
+    """Route the root logger through a ``QueueingHandler`` to a background thread writing JSON lines."""
+
+    name = "log-writer"
+
+    def __init__(
+        self,
+        *,
+        level: str = settings.LOG_LEVEL,
+        queue_size: int = settings.LOG_QUEUE_SIZE,
+        debug_sample_rate: float = settings.LOG_DEBUG_SAMPLE_RATE,
+        stream: Optional[IO[str]] = None,
+    ):
+        """Initialize a stopped writer."""
+        self.level = level
+        self.queue: "queue.Queue[Optional[logging.LogRecord]]" = queue.Queue(queue_size)
+        self.handler = QueueingHandler(self.queue, debug_sample_rate=debug_sample_rate)
+        self.output = logging.StreamHandler(stream or sys.stdout)
+        self.output.setFormatter(JsonFormatter())
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        """Write queued records until the ``None`` sentinel."""
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            self.output.handle(record)
+
+    def start(self) -> None:
+        """Install the handler on the root logger and start writing, if not already."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        root = logging.getLogger()
+        root.setLevel(self.level)
+        root.addHandler(self.handler)
+
+    def stop(self) -> None:
+        """Remove the handler, then write out every queued record."""
+        if self._thread is not None:
+            logging.getLogger().removeHandler(self.handler)
+            # Blocks while the queue is full, unlike records, so the writer always sees it
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+class RequestContextMiddleware:
+    """
+    Give each HTTP request a context for its log records, and log it when done.
+
+    The request ID is taken from an ``X-Request-ID`` header or generated, and
+    returned in the same header. The access record is logged at INFO on the
+    ``backend_core.access`` logger with the method, path, status and duration.
+    """
+
+    def __init__(self, app: ASGIApp, *, debug_sample_rate: float = settings.LOG_DEBUG_SAMPLE_RATE):
+        """Wrap ``app``."""
+        self.app = app
+        self.debug_sample_rate = debug_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve a request within its logging context."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._request_id(scope)
+        context = RequestContext(request_id, scope, random.random() < self.debug_sample_rate)
+        token = request_context.set(context)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (REQUEST_ID_HEADER, request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            access_logger.info(
+                "%s %s %d",
+                scope["method"],
+                scope["path"],
+                status_code,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                },
+            )
+            request_context.reset(token)
+
+    @staticmethod
+    def _request_id(scope: Scope) -> str:
+        """Return the caller's request ID if it is usable, or a new one."""
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                request_id: str = value.decode("latin-1").strip()
+                if 0 < len(request_id) <= MAX_REQUEST_ID_LENGTH and request_id.isprintable():
+                    return request_id
+        return uuid.uuid4().hex
+
+
+log_writer = LogWriter()
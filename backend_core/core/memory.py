@@ -0,0 +1,247 @@
+# backend_core/core/memory.py
+"""
+Memory diagnostics for finding leaks in a running worker.
+
+``allocation_profiler`` drives ``tracemalloc``, keeping a few snapshots to
+compare by allocation site. ``gc_stats`` and ``identity_map_sizes`` report
+the garbage collector and the ORM objects held by live sessions, and
+``memory_sampler`` exports the resident set size and identity-map size of
+each worker as metrics. Everything here describes the current process only.
+"""
+
+import gc
+import logging
+import os
+import threading
+import tracemalloc
+import weakref
+from collections import Counter as Tally
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Literal, NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend_core.core.metrics import registry
+from backend_core.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+GroupBy = Literal["lineno", "filename", "traceback"]
+
+# Allocations made by tracemalloc itself and by imports are noise in a diff
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+resident_memory = registry.gauge("worker_resident_memory_bytes", "Resident set size of each worker.", ["pid"])
+identity_map_objects = registry.gauge(
+    "worker_identity_map_objects", "ORM objects held by the live sessions of each worker.", ["pid"]
+)
+
+
+def resident_set_size() -> Optional[int]:
+    """Return the resident set size of this process in bytes, or ``None`` where ``/proc`` is unavailable."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class Snapshot(NamedTuple):
+    """A ``tracemalloc`` snapshot kept for comparison."""
+
+    id: int
+    taken_at: datetime
+    traced_bytes: int
+    snapshot: tracemalloc.Snapshot
+
+
+class AllocationDiff(NamedTuple):
+    """How the memory allocated at one site changed between two snapshots."""
+
+    sites: List[str]
+    size_bytes: int
+    size_diff_bytes: int
+    blocks: int
+    blocks_diff: int
+
+
+class AllocationProfiler:
+    """
+    Start and stop ``tracemalloc``, and keep the last ``max_snapshots`` snapshots for comparison.
+
+    Tracing slows allocation down and holds a traceback per live block, so it
+    is meant to run only while a leak is being investigated.
+    """
+
+    def __init__(self, *, max_snapshots: int = settings.TRACEMALLOC_MAX_SNAPSHOTS):
+        """Initialize a profiler that holds no snapshots."""
+        self.max_snapshots = max_snapshots
+        self._lock = threading.Lock()
+        self._snapshots: Dict[int, Snapshot] = {}
+        self._next_id = 1
+
+    def status(self) -> Dict[str, Any]:
+        """Report whether allocations are traced, with how many frames, and how much memory they hold."""
+        tracing = tracemalloc.is_tracing()
+        traced, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+            "traced_bytes": traced,
+            "peak_bytes": peak,
+            "overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+        }
+
+    def start(self, frames: int = 1) -> None:
+        """Start tracing with ``frames`` frames per traceback, restarting if tracing with a different depth."""
+        with self._lock:
+            if tracemalloc.is_tracing():
+                if tracemalloc.get_traceback_limit() == frames:
+                    return
+                tracemalloc.stop()
+            tracemalloc.start(frames)
+        logger.info("Started tracing allocations with %d frames", frames)
+
+    def stop(self) -> None:
+        """Stop tracing and free its traces; snapshots already taken are kept."""
+        with self._lock:
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+                logger.info("Stopped tracing allocations")
+
+    def take_snapshot(self) -> Snapshot:
+        """Take and keep a snapshot, dropping the oldest kept one if there are too many; raises if not tracing."""
+        taken = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        with self._lock:
+            snapshot = Snapshot(
+                id=self._next_id,
+                taken_at=datetime.now(timezone.utc),
+                traced_bytes=sum(trace.size for trace in taken.traces),
+                snapshot=taken,
+            )
+            self._next_id += 1
+            self._snapshots[snapshot.id] = snapshot
+            while len(self._snapshots) > self.max_snapshots:
+                del self._snapshots[min(self._snapshots)]
+        return snapshot
+
+    def snapshots(self) -> List[Snapshot]:
+        """Return the kept snapshots, oldest first."""
+        with self._lock:
+            return [self._snapshots[snapshot_id] for snapshot_id in sorted(self._snapshots)]
+
+
+def compare_snapshots(
+    first: Snapshot, second: Snapshot, *, group_by: GroupBy = "lineno", limit: int = 20
+) -> List[AllocationDiff]:
+    """Return the ``limit`` allocation sites whose memory grew or shrank most from ``first`` to ``second``."""
+    diffs = []
+    for stat in second.snapshot.compare_to(first.snapshot, group_by)[:limit]:
+        sites = [
+            frame.filename if group_by == "filename" else f"{frame.filename}:{frame.lineno}" for frame in stat.traceback
+        ]
+        diffs.append(AllocationDiff(sites, stat.size, stat.size_diff, stat.count, stat.count_diff))
+    return diffs
+
+
+def gc_stats() -> Dict[str, Any]:
+    """Report the collections, thresholds and pending allocations of each garbage collector generation."""
+    counts = gc.get_count()
+    thresholds = gc.get_threshold()
+    generations = [
+        {"generation": index, "pending": counts[index], "threshold": thresholds[index], **stats}
+        for index, stats in enumerate(gc.get_stats())
+    ]
+    return {
+        "enabled": gc.isenabled(),
+        "generations": generations,
+        "frozen": gc.get_freeze_count(),
+        "garbage": len(gc.garbage),
+    }
+
+
+# Every session that began a transaction; sessions that never did hold no objects
+_sessions: "weakref.WeakSet[Session]" = weakref.WeakSet()
+_sessions_lock = threading.Lock()
+
+
+@event.listens_for(Session, "after_begin")
+def _track_session(session: Session, transaction: Any, connection: Any) -> None:
+    """Remember a session so its identity map can be measured."""
+    with _sessions_lock:
+        _sessions.add(session)
+
+
+def identity_map_sizes() -> Dict[str, Any]:
+    """Count the live sessions of this process and the ORM objects in their identity maps, by class."""
+    with _sessions_lock:
+        sessions = list(_sessions)
+    by_class: Tally[str] = Tally()
+    largest = 0
+    for session in sessions:
+        # Copying the keys is atomic, so the session may keep being used by its own thread
+        keys = list(session.identity_map.keys())
+        by_class.update(key[0].__name__ for key in keys)
+        largest = max(largest, len(keys))
+    return {
+        "sessions": len(sessions),
+        "objects": sum(by_class.values()),
+        "largest": largest,
+        "by_class": dict(by_class.most_common()),
+    }
+
+
+class MemorySampler:
+    """Export the resident set size and identity-map size of this worker every ``interval`` seconds."""
+
+    name = "memory-sampler"
+
+    def __init__(self, *, interval: float = settings.MEMORY_SAMPLE_INTERVAL_SECONDS):
+        """Initialize a stopped sampler."""
+        self.interval = interval
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        """Export the current values now."""
+        pid = str(os.getpid())
+        rss = resident_set_size()
+        if rss is not None:
+            resident_memory.set(rss, pid=pid)
+        identity_map_objects.set(identity_map_sizes()["objects"], pid=pid)
+
+    def _run(self) -> None:
+        """Sample periodically until stopped."""
+        while True:
+            try:
+                self.sample()
+            except Exception:
+                logger.exception("%s sample failed; will retry", self.name)
+            if self._stopping.wait(self.interval):
+                return
+
+    def start(self) -> None:
+        """Start the background sampler if it is not running."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background sampler."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+
+
+allocation_profiler = AllocationProfiler()
+memory_sampler = MemorySampler()
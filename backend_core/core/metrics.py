@@ -0,0 +1,214 @@
+# backend_core/core/metrics.py
+"""
+Application metrics in the Prometheus text exposition format.
+
+Values live in a store: this process's memory by default, or memory-mapped
+files shared by every worker on the host when ``settings.SHARED_MEMORY_DIR``
+is set, in which case any worker renders the totals of all of them.
+"""
+
+import math
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+from backend_core.core.settings import settings
+from backend_core.core.shared_memory import LocalValues, SharedValues
+
+Store = Union[LocalValues, SharedValues]
+# (metric type, metric name, sample suffix, label values)
+Key = Tuple[str, str, str, Tuple[str, ...]]
+Collected = Dict[Tuple[Any, ...], List[float]]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Return the ``{name="value",...}`` part of a sample line, or nothing without labels."""
+    labels = ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+    return f"{{{labels}}}" if labels else ""
+
+
+class Counter:
+    """Monotonically increasing counter, optionally split by label values."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), store: Optional[Store] = None):
+        """Initialize a counter with no recorded values."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._store = store if store is not None else LocalValues()
+        # Combines the values of one sample across processes
+        self._aggregate: Callable[[List[float]], float] = math.fsum
+
+    def _labels(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        """Return the label values in declaration order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _key(self, labelvalues: Tuple[str, ...], suffix: str = "") -> Key:
+        """Return the store key of one sample."""
+        return (self.type, self.name, suffix, labelvalues)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the counter for the given label values."""
+        self._store.inc(self._key(self._labels(labels)), amount)
+
+    def value(self, **labels: str) -> float:
+        """Return the current value for the given label values, across processes."""
+        values = self._store.collect().get(self._key(self._labels(labels)))
+        return self._aggregate(values) if values else 0.0
+
+    def samples(self, collected: Collected) -> List[str]:
+        """Return the sample lines of this metric from collected values."""
+        lines = []
+        for key in sorted(key for key in collected if key[1] == self.name and key[0] == self.type):
+            value = self._aggregate(collected[key])
+            lines.append(f"{self.name}{key[2]}{_format_labels(self.labelnames, key[3])} {value}")
+        return lines
+
+    def render(self, collected: Collected) -> List[str]:
+        """Return the exposition lines of this metric."""
+        header = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        return header + self.samples(collected)
+
+
+class Gauge(Counter):
+    """
+    Value that can go up and down, optionally split by label values.
+
+    Across processes the gauge reports the largest value by default, or the
+    sum with ``aggregate=sum``. Values of exited processes are dropped.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        store: Optional[Store] = None,
+        aggregate: Callable[[List[float]], float] = max,
+    ):
+        """Initialize a gauge with no recorded values."""
+        super().__init__(name, documentation, labelnames, store)
+        self._aggregate = aggregate
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the gauge for the given label values."""
+        self._store.set(self._key(self._labels(labels)), value)
+
+
+class Histogram(Counter):
+    """Distribution of observed values in cumulative buckets, optionally split by label values."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        store: Optional[Store] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """Initialize a histogram with no observations."""
+        super().__init__(name, documentation, labelnames, store)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Histograms are only observed."""
+        raise TypeError("use observe() on a histogram")
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation for the given label values."""
+        labelvalues = self._labels(labels)
+        bound = next(bound for bound in self.buckets if value <= bound)
+        # Each observation lands in one bucket; rendering accumulates them
+        self._store.inc(self._key(labelvalues + (self._format_bound(bound),), "_bucket"), 1.0)
+        self._store.inc(self._key(labelvalues, "_sum"), value)
+        self._store.inc(self._key(labelvalues, "_count"), 1.0)
+
+    @staticmethod
+    def _format_bound(bound: float) -> str:
+        """Format a bucket bound as Prometheus expects."""
+        return "+Inf" if bound == math.inf else repr(float(bound))
+
+    def value(self, **labels: str) -> float:
+        """Return the number of observations for the given label values, across processes."""
+        values = self._store.collect().get(self._key(self._labels(labels), "_count"))
+        return self._aggregate(values) if values else 0.0
+
+    def samples(self, collected: Collected) -> List[str]:
+        """Return cumulative bucket, sum and count lines for every label combination observed."""
+        mine = {key: self._aggregate(values) for key, values in collected.items() if key[:2] == (self.type, self.name)}
+        lines = []
+        for labelvalues in sorted({key[3] for key in mine if key[2] == "_count"}):
+            cumulative = 0.0
+            names = self.labelnames + ("le",)
+            for bound in self.buckets:
+                label = self._format_bound(bound)
+                cumulative += mine.get(self._key(labelvalues + (label,), "_bucket"), 0.0)
+                lines.append(f"{self.name}_bucket{_format_labels(names, labelvalues + (label,))} {cumulative}")
+            for suffix in ("_sum", "_count"):
+                value = mine.get(self._key(labelvalues, suffix), 0.0)
+                lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, labelvalues)} {value}")
+        return lines
+
+
+MetricType = TypeVar("MetricType", bound=Counter)
+
+
+class MetricsRegistry:
+    """Collection of the application's metrics, all kept in one store."""
+
+    def __init__(self, store: Optional[Store] = None) -> None:
+        """Initialize an empty registry."""
+        self.store = store if store is not None else LocalValues()
+        self._metrics: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(
+        self, kind: Type[MetricType], name: str, documentation: str, labelnames: Sequence[str], **kwargs: Any
+    ) -> MetricType:
+        """Return the metric with the given name, creating it on first use."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = kind(name, documentation, labelnames, store=self.store, **kwargs)
+            if type(metric) is not kind:
+                raise ValueError(f"{name} is already registered as a {metric.type}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Return the counter with the given name, creating it on first use."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        aggregate: Callable[[List[float]], float] = max,
+    ) -> Gauge:
+        """Return the gauge with the given name, creating it on first use."""
+        return self._get_or_create(Gauge, name, documentation, labelnames, aggregate=aggregate)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """Return the histogram with the given name, creating it on first use."""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        collected = self.store.collect()
+        return "".join(line + "\n" for metric in metrics for line in metric.render(collected))
+
+
+registry = MetricsRegistry(SharedValues(settings.SHARED_MEMORY_DIR) if settings.SHARED_MEMORY_DIR else None)
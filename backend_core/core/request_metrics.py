@@ -0,0 +1,53 @@
+# backend_core/core/request_metrics.py
+"""Request count and latency metrics."""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend_core.core.metrics import registry
+
+requests_total = registry.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.", ["method", "route", "status"]
+)
+request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time to serve HTTP requests by method and route template.", ["method", "route"]
+)
+
+
+class RequestMetricsMiddleware:
+    """
+    Count requests and time them by route.
+
+    Routes are labelled by their path template, such as ``/api/v1/users/bulk/{job_id}``,
+    so that label values stay bounded; requests that matched no route,
+    including those shed before routing, are labelled ``unmatched``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Wrap ``app``."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve an HTTP request and record its status and duration."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router adds the matched route to the scope it was given
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            request_duration.observe(time.perf_counter() - start, method=method, route=route)
+            requests_total.inc(method=method, route=route, status=str(status_code))
@@ -0,0 +1,90 @@
+# backend_core/core/responses.py
+"""Response rendering utilities."""
+
+from typing import Any, Iterable, Mapping, Optional, Sequence, Tuple, Type
+
+import orjson
+from fastapi import HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from backend_core.core.tracing import traced
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson, which handles UUID and datetime natively."""
+
+    @traced("response.encode")
+    def render(self, content: Any) -> bytes:
+        """Encode content, rendering UTC datetimes with a trailing Z like pydantic does."""
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+class FieldSelection:
+    """
+    Dependency reading a sparse fieldset from the ``fields`` query parameter.
+
+    The parameter is a comma-separated list of fields of ``schema``. It
+    resolves to the selected names in schema order, or to ``None`` when it is
+    absent or selects every field; unknown names are rejected with 400.
+    """
+
+    def __init__(self, schema: Type[BaseModel]):
+        """Initialize for the fields of a read schema."""
+        self.names = tuple(schema.model_fields)
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(
+            None, min_length=1, description="Comma-separated fields to return; all fields if omitted"
+        ),
+    ) -> Optional[Tuple[str, ...]]:
+        """Parse the selected fields."""
+        if fields is None:
+            return None
+        selected = {name.strip() for name in fields.split(",")} - {""}
+        unknown = selected.difference(self.names)
+        if unknown or not selected:
+            detail = f"Unknown fields: {', '.join(sorted(unknown))}" if unknown else "No fields selected"
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+        if len(selected) == len(self.names):
+            return None
+        return tuple(name for name in self.names if name in selected)
+
+
+def serialize(schema: Type[BaseModel], obj: Any, fields: Optional[Sequence[str]] = None) -> dict[str, Any]:
+    """
+    Build the output of a read schema straight from a trusted ORM object, limited to ``fields`` if given.
+
+    Rows loaded from the database already satisfy the schema, so the fields are
+    copied once instead of being validated and dumped by FastAPI.
+    """
+    return {name: getattr(obj, name) for name in (schema.model_fields if fields is None else fields)}
+
+
+@traced("response.render")
+def render(
+    schema: Type[BaseModel],
+    obj: Any,
+    *,
+    fields: Optional[Sequence[str]] = None,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> ORJSONResponse:
+    """Render a single ORM object as a response for the given read schema, limited to ``fields`` if given."""
+    return ORJSONResponse(serialize(schema, obj, fields), status_code=status_code, headers=headers)
+
+
+@traced("response.render")
+def render_many(
+    schema: Type[BaseModel],
+    objs: Iterable[Any],
+    *,
+    fields: Optional[Sequence[str]] = None,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> ORJSONResponse:
+    """Render a list of ORM objects as a response for the given read schema, limited to ``fields`` if given."""
+    names = tuple(schema.model_fields if fields is None else fields)
+    content = [{name: getattr(obj, name) for name in names} for obj in objs]
+    return ORJSONResponse(content, status_code=status_code, headers=headers)
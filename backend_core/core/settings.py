@@ -1,7 +1,7 @@
 """Application settings management."""
 
 from functools import lru_cache
-from typing import List, Union
+from typing import List, Literal, Optional, Union
 
 from pydantic import AnyHttpUrl, Field, PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -19,6 +19,140 @@ class Settings(BaseSettings):
     SECRET_KEY: str = Field(..., alias="SECRET_KEY")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
+    # Access tokens name their user by ID; tokens naming them by email, as issued before, are accepted
+    # while this is set, which need only last ACCESS_TOKEN_EXPIRE_MINUTES after the switch
+    ACCEPT_EMAIL_SUBJECT_TOKENS: bool = True
+
+    # Version of generated UUID primary keys: 7 is time-ordered and keeps btree inserts local, 4 is fully random
+    UUID_VERSION: Literal[4, 7] = 7
+
+    # Default latency budget of API requests, enforced as Postgres statement and lock timeouts
+    REQUEST_BUDGET_MS: int = 5_000
+
+    # HTTP caching
+    USER_ETAG_CACHE_TTL_SECONDS: int = 60
+    USER_ETAG_CACHE_MAX_SIZE: int = 10_000
+
+    # Largest number of users resolved by one batch request
+    USER_BATCH_MAX_SIZE: int = 500
+
+    # User search page sizes
+    USER_SEARCH_DEFAULT_LIMIT: int = 20
+    USER_SEARCH_MAX_LIMIT: int = 100
+
+    # User statistics, served from materialized views refreshed in the background
+    USER_STATS_REFRESH_INTERVAL_SECONDS: float = 300.0
+    USER_STATS_MAX_DAYS: int = 366
+    USER_STATS_MAX_WEEKS: int = 104
+
+    # Bulk user operations, applied in chunks by a background job runner. Each chunk is one short
+    # transaction whose statements and lock waits are bounded by the chunk timeout.
+    BULK_JOB_MAX_IDS: int = 10_000
+    BULK_JOB_CHUNK_SIZE: int = 500
+    BULK_JOB_CHUNK_TIMEOUT_MS: int = 2_000
+    BULK_JOB_CHUNK_PAUSE_SECONDS: float = 0.05
+    BULK_JOB_MAX_RETRIES: int = 5
+    BULK_JOB_LEASE_SECONDS: float = 60.0
+    BULK_JOB_POLL_INTERVAL_SECONDS: float = 5.0
+
+    # Idempotency-Key support for POST requests: how long responses are kept for replay, how long a
+    # duplicate waits for the first request to finish, and how long a worker may own an unfinished key
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 86_400
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+    IDEMPOTENCY_LEASE_SECONDS: float = 60.0
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = 3_600.0
+
+    # User activity tracking
+    ACTIVITY_FLUSH_INTERVAL_SECONDS: float = 5.0
+    ACTIVITY_BUFFER_MAX_SIZE: int = 10_000
+
+    # Audit log: a full buffer wakes the flusher, and recording waits for it at most the full wait
+    # before buffering the event anyway, up to the hard limit past which events are dropped
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 2.0
+    AUDIT_BUFFER_MAX_SIZE: int = 5_000
+    AUDIT_BUFFER_HARD_LIMIT: int = 100_000
+    AUDIT_FULL_WAIT_SECONDS: float = 0.1
+    AUDIT_PARTITIONS_AHEAD: int = 3
+    AUDIT_RETENTION_MONTHS: int = 13
+
+    # Database connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_CONNECT_TIMEOUT_SECONDS: int = 5
+
+    # Startup warm-up: when it fails, for instance while the database is down, the worker starts
+    # anyway, not ready, and retries it in the background with exponential backoff up to the maximum delay
+    WARMUP_MAX_RETRY_DELAY_SECONDS: float = 30.0
+
+    # Database circuit breaker: opens when the share of failed or slow connections within the window
+    # reaches its rate, once enough were made; then refuses work at once and probes in the background,
+    # first after the open time and after twice as long each time a probe fails, up to the maximum
+    DB_CIRCUIT_WINDOW_SECONDS: float = 30.0
+    DB_CIRCUIT_MIN_CALLS: int = 5
+    DB_CIRCUIT_FAILURE_RATE: float = 0.5
+    DB_CIRCUIT_SLOW_CALL_SECONDS: float = 2.0
+    DB_CIRCUIT_SLOW_RATE: float = 0.5
+    DB_CIRCUIT_OPEN_SECONDS: float = 5.0
+    DB_CIRCUIT_MAX_OPEN_SECONDS: float = 60.0
+    DB_CIRCUIT_PROBE_INTERVAL_SECONDS: float = 1.0
+
+    # Cache invalidation bus: a LISTEN connection per worker, checked with a query when idle for the
+    # keepalive interval and reconnected with exponential backoff up to the maximum delay
+    CACHE_INVALIDATION_KEEPALIVE_SECONDS: float = 30.0
+    CACHE_INVALIDATION_MAX_RECONNECT_DELAY_SECONDS: float = 30.0
+
+    # Migrations: how long DDL may wait for a lock before giving up and retrying
+    MIGRATION_LOCK_TIMEOUT_MS: int = 2_000
+    MIGRATION_LOCK_RETRIES: int = 5
+    MIGRATION_LOCK_RETRY_BACKOFF_SECONDS: float = 0.5
+    MIGRATION_BACKFILL_BATCH_SIZE: int = 1_000
+
+    # Directory, ideally on a tmpfs such as /dev/shm, for the memory-mapped files through which the
+    # workers on a host share metrics and login limits; unset keeps both per process
+    SHARED_MEMORY_DIR: Optional[str] = None
+
+    # Login throttling: failed attempts allowed per email and per client IP within the window
+    LOGIN_MAX_FAILURES_PER_EMAIL: int = 5
+    LOGIN_MAX_FAILURES_PER_IP: int = 50
+    LOGIN_FAILURE_WINDOW_SECONDS: int = 300
+
+    # Addresses or CIDR ranges of the reverse proxies whose X-Forwarded-For names the client; behind
+    # a proxy not listed here every client has the proxy's address and shares its per-IP limits
+    TRUSTED_PROXIES: List[str] = []
+
+    @field_validator("TRUSTED_PROXIES", mode="before")
+    def assemble_trusted_proxies(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
+        """Validate trusted proxies."""
+        if isinstance(v, str) and not v.startswith("["):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        elif isinstance(v, (list, str)):
+            return v
+        raise ValueError(v)
+
+    # Logging: JSON lines written by a background thread from a bounded queue, which drops records
+    # rather than block when full; debug records are kept for this fraction of requests only
+    LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_DEBUG_SAMPLE_RATE: float = 0.01
+
+    # Tracing: requests are sampled at the rate, or when the caller's traceparent says its trace is,
+    # and written as OTLP/JSON lines to the export path ("-" for stdout); unset traces nothing
+    TRACE_SAMPLE_RATE: float = 0.01
+    TRACE_EXPORT_PATH: Optional[str] = None
+    TRACE_QUEUE_SIZE: int = 1_000
+
+    # Memory diagnostics: how often each worker exports its resident set size, and how many
+    # tracemalloc snapshots the diagnostics endpoint keeps for comparison
+    MEMORY_SAMPLE_INTERVAL_SECONDS: float = 15.0
+    TRACEMALLOC_MAX_SNAPSHOTS: int = 4
+
+    # Load shedding
+    MAX_IN_FLIGHT_REQUESTS: int = 15
+    MAX_QUEUED_REQUESTS: int = 100
+    QUEUE_TIMEOUT_SECONDS: float = 2.0
+    POOL_SATURATION_THRESHOLD: float = 0.9
+    LOAD_SHED_RETRY_AFTER_SECONDS: int = 1
 
     # CORS
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
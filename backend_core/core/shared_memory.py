@@ -0,0 +1,365 @@
+# backend_core/core/shared_memory.py
+"""
+Memory-mapped stores shared by the worker processes on a host.
+
+``SharedValues`` gives every process its own append-only file of named float
+values, so writers never contend across processes, and readers sum over all
+files. ``WindowCounters`` is a single fixed-size hash table of expiring
+counters that every process updates under a short ``flock``. Files live in
+``settings.SHARED_MEMORY_DIR``, which should be a tmpfs such as ``/dev/shm``.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Value files start with the number of bytes in use, followed by entries of a
+# 4-byte key length, the UTF-8 key padded to 8 bytes, and an 8-byte double
+_HEADER = struct.Struct("<Q")
+_KEY_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+_INITIAL_SIZE = 64 * 1024
+
+VALUES_PREFIX = "values_"
+ARCHIVE_FILE = f"{VALUES_PREFIX}archive.db"
+LOCK_FILE = ".lock"
+
+
+def _entry_size(key: bytes) -> int:
+    """Return the size of an entry for ``key``, keeping its value 8-byte aligned."""
+    return (_KEY_LENGTH.size + len(key) + 7) // 8 * 8 + _VALUE.size
+
+
+def read_value_file(data: bytes) -> Dict[str, float]:
+    """Parse the entries of a value file."""
+    values: Dict[str, float] = {}
+    if len(data) < _HEADER.size:
+        return values
+    (used,) = _HEADER.unpack_from(data, 0)
+    offset = _HEADER.size
+    while offset < min(used, len(data)):
+        (length,) = _KEY_LENGTH.unpack_from(data, offset)
+        key = data[offset + _KEY_LENGTH.size : offset + _KEY_LENGTH.size + length]
+        size = _entry_size(key)
+        (values[key.decode()],) = _VALUE.unpack_from(data, offset + size - _VALUE.size)
+        offset += size
+    return values
+
+
+class ValueFile:
+    """
+    Append-only memory-mapped map of string keys to floats, written by one process.
+
+    Values are updated in place with single aligned 8-byte writes, and a new
+    entry only becomes visible once the header is bumped past it, so readers
+    in other processes never need a lock.
+    """
+
+    def __init__(self, path: Path):
+        """Open or create the file at ``path``."""
+        self.path = path
+        self._file = open(path, "a+b")
+        if os.fstat(self._file.fileno()).st_size < _INITIAL_SIZE:
+            self._file.truncate(_INITIAL_SIZE)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self._offsets: Dict[str, int] = {}
+        (self._used,) = _HEADER.unpack_from(self._map, 0)
+        if self._used == 0:
+            self._used = _HEADER.size
+            _HEADER.pack_into(self._map, 0, self._used)
+        offset = _HEADER.size
+        for key in read_value_file(self._map[: self._used]):
+            encoded = key.encode()
+            self._offsets[key] = offset + _entry_size(encoded) - _VALUE.size
+            offset += _entry_size(encoded)
+
+    def fileno(self) -> int:
+        """Return the file descriptor, for locking."""
+        return self._file.fileno()
+
+    def _offset(self, key: str) -> int:
+        """Return the offset of the value of ``key``, appending a zero entry if it is new."""
+        offset = self._offsets.get(key)
+        if offset is not None:
+            return offset
+        encoded = key.encode()
+        size = _entry_size(encoded)
+        if self._used + size > len(self._map):
+            grown = max(len(self._map) * 2, self._used + size)
+            self._map.close()
+            self._file.truncate(grown)
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        _KEY_LENGTH.pack_into(self._map, self._used, len(encoded))
+        self._map[self._used + _KEY_LENGTH.size : self._used + _KEY_LENGTH.size + len(encoded)] = encoded
+        offset = self._used + size - _VALUE.size
+        _VALUE.pack_into(self._map, offset, 0.0)
+        self._used += size
+        _HEADER.pack_into(self._map, 0, self._used)
+        self._offsets[key] = offset
+        return offset
+
+    def get(self, key: str) -> float:
+        """Return the value of ``key``, or 0."""
+        offset = self._offsets.get(key)
+        return _VALUE.unpack_from(self._map, offset)[0] if offset is not None else 0.0
+
+    def set(self, key: str, value: float) -> None:
+        """Set the value of ``key``."""
+        offset = self._offset(key)
+        _VALUE.pack_into(self._map, offset, value)
+
+    def inc(self, key: str, amount: float) -> None:
+        """Add ``amount`` to the value of ``key``."""
+        offset = self._offset(key)
+        _VALUE.pack_into(self._map, offset, _VALUE.unpack_from(self._map, offset)[0] + amount)
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self._map.close()
+        self._file.close()
+
+
+class SharedValues:
+    """
+    Metric values of every worker on the host, one ``ValueFile`` per process.
+
+    Each process holds an exclusive ``flock`` on its own file for as long as it
+    lives, which the kernel releases when the process dies. ``collect``
+    notices such files, folds their cumulative values into an archive file so
+    that counters never go backwards, and deletes them. Keys are JSON lists
+    whose first element is the metric type; values of other types, such as
+    gauges, die with their process.
+    """
+
+    def __init__(self, directory: str, cumulative_types: Tuple[str, ...] = ("counter", "histogram")):
+        """Use ``directory``, creating it if needed."""
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.cumulative_types = cumulative_types
+        self._lock = threading.Lock()
+        self._own: Optional[ValueFile] = None
+        self._pid = 0
+
+    @contextmanager
+    def _directory_lock(self, operation: int) -> Iterator[None]:
+        """Hold the directory lock: shared to create or read files, exclusive to delete them."""
+        with open(self.directory / LOCK_FILE, "a+b") as lock:
+            fcntl.flock(lock.fileno(), operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _own_file(self) -> ValueFile:
+        """Return this process's file, creating it after start-up or a fork. Called with the lock held."""
+        pid = os.getpid()
+        if self._own is None or self._pid != pid:
+            # Creating and locking happen under the directory lock, so cleanup never sees the file unlocked
+            with self._directory_lock(fcntl.LOCK_SH):
+                own = ValueFile(self.directory / f"{VALUES_PREFIX}{pid}.db")
+                fcntl.flock(own.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self._own, self._pid = own, pid
+        return self._own
+
+    def inc(self, key: Tuple[Any, ...], amount: float) -> None:
+        """Add ``amount`` to this process's value of ``key``."""
+        with self._lock:
+            self._own_file().inc(json.dumps(key), amount)
+
+    def set(self, key: Tuple[Any, ...], value: float) -> None:
+        """Set this process's value of ``key``."""
+        with self._lock:
+            self._own_file().set(json.dumps(key), value)
+
+    def _is_dead(self, path: Path) -> bool:
+        """Return whether the process owning a value file has exited."""
+        with open(path, "rb") as file:
+            try:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return False
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            return True
+
+    def cleanup(self) -> List[Path]:
+        """Fold the files of exited processes into the archive and delete them, returning their paths."""
+        with self._lock:
+            own = self._own_file().path
+        removed = []
+        with self._directory_lock(fcntl.LOCK_EX):
+            for path in self.directory.glob(f"{VALUES_PREFIX}*.db"):
+                if path.name == ARCHIVE_FILE or path == own or not self._is_dead(path):
+                    continue
+                archive = ValueFile(self.directory / ARCHIVE_FILE)
+                try:
+                    for key, value in read_value_file(path.read_bytes()).items():
+                        if json.loads(key)[0] in self.cumulative_types:
+                            archive.inc(key, value)
+                finally:
+                    archive.close()
+                path.unlink()
+                removed.append(path)
+        if removed:
+            logger.info("Archived metrics of %d exited workers", len(removed))
+        return removed
+
+    def collect(self) -> Dict[Tuple[Any, ...], List[float]]:
+        """Return every key's values across live processes and the archive, after cleaning up."""
+        self.cleanup()
+        collected: Dict[Tuple[Any, ...], List[float]] = {}
+        with self._directory_lock(fcntl.LOCK_SH):
+            for path in self.directory.glob(f"{VALUES_PREFIX}*.db"):
+                for key, value in read_value_file(path.read_bytes()).items():
+                    collected.setdefault(_decode_key(key), []).append(value)
+        return collected
+
+
+def _decode_key(key: str) -> Tuple[Any, ...]:
+    """Turn a JSON key back into the nested tuple it was made from."""
+    return tuple(tuple(part) if isinstance(part, list) else part for part in json.loads(key))
+
+
+class LocalValues:
+    """Metric values of this process only, with the same interface as ``SharedValues``."""
+
+    def __init__(self) -> None:
+        """Initialize with no values."""
+        self._values: Dict[Tuple[Any, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, key: Tuple[Any, ...], amount: float) -> None:
+        """Add ``amount`` to the value of ``key``."""
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, key: Tuple[Any, ...], value: float) -> None:
+        """Set the value of ``key``."""
+        with self._lock:
+            self._values[key] = value
+
+    def collect(self) -> Dict[Tuple[Any, ...], List[float]]:
+        """Return every key's value."""
+        with self._lock:
+            return {key: [value] for key, value in self._values.items()}
+
+
+# Window counter slots hold a 16-byte key digest, the expiry time and the count
+_SLOT = struct.Struct("<16sdq")
+_EMPTY_DIGEST = bytes(16)
+
+
+class WindowCounters:
+    """
+    Fixed-size hash table of counters that expire a fixed time after their first hit.
+
+    Backed by a shared file when ``path`` is given, so that every process
+    counts together, and by anonymous memory otherwise. Updates hold a
+    threading lock and, for files, an ``flock`` for a few microseconds. Keys are
+    stored as digests, and a key is looked up in at most ``probes`` slots;
+    when they are all live, the one expiring first is evicted.
+    """
+
+    def __init__(self, path: Optional[Path] = None, *, slots: int = 65_536, probes: int = 16):
+        """Open or create the table."""
+        self.slots = slots
+        self.probes = probes
+        self._lock = threading.Lock()
+        size = slots * _SLOT.size
+        self._file = None
+        if path is None:
+            self._map = mmap.mmap(-1, size)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "a+b")
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                if os.fstat(self._file.fileno()).st_size < size:
+                    self._file.truncate(size)
+            finally:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._map = mmap.mmap(self._file.fileno(), size)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the table lock across threads and, for files, across processes."""
+        with self._lock:
+            if self._file is None:
+                yield
+                return
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _slots(self, digest: bytes) -> List[int]:
+        """Return the offsets of the slots ``digest`` may occupy."""
+        start = int.from_bytes(digest[:8], "little") % self.slots
+        return [(start + i) % self.slots * _SLOT.size for i in range(self.probes)]
+
+    def _find(self, digest: bytes, now: float) -> Tuple[Optional[int], int]:
+        """Return the offset holding ``digest``, if live, and the offset to use otherwise."""
+        free = None
+        evict, evict_expiry = 0, float("inf")
+        for offset in self._slots(digest):
+            slot_digest, expires_at, _ = _SLOT.unpack_from(self._map, offset)
+            live = slot_digest != _EMPTY_DIGEST and expires_at > now
+            if live and slot_digest == digest:
+                return offset, offset
+            if not live and free is None:
+                free = offset
+            if live and expires_at < evict_expiry:
+                evict, evict_expiry = offset, expires_at
+        return None, free if free is not None else evict
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        """Return the 16-byte digest of a key, which is never all zeros in practice."""
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+    def hit(self, key: str, window: float, amount: int = 1) -> Tuple[int, float]:
+        """Add ``amount`` to a key's counter, starting a ``window``-second one if needed; return (count, expiry)."""
+        digest, now = self._digest(key), time.time()
+        with self._locked():
+            found, offset = self._find(digest, now)
+            if found is None:
+                count, expires_at = amount, now + window
+            else:
+                _, expires_at, count = _SLOT.unpack_from(self._map, found)
+                count += amount
+            _SLOT.pack_into(self._map, offset, digest, expires_at, count)
+        return count, expires_at
+
+    def get(self, key: str) -> Tuple[int, float]:
+        """Return a key's live count and expiry time, or (0, 0)."""
+        digest, now = self._digest(key), time.time()
+        with self._locked():
+            found, _ = self._find(digest, now)
+            if found is None:
+                return 0, 0.0
+            _, expires_at, count = _SLOT.unpack_from(self._map, found)
+        return count, expires_at
+
+    def reset(self, key: str) -> None:
+        """Forget a key's counter."""
+        digest, now = self._digest(key), time.time()
+        with self._locked():
+            found, _ = self._find(digest, now)
+            if found is not None:
+                _SLOT.pack_into(self._map, found, _EMPTY_DIGEST, 0.0, 0)
+
+    def clear(self) -> None:
+        """Forget every counter."""
+        with self._locked():
+            self._map[:] = bytes(len(self._map))
@@ -0,0 +1,68 @@
+# backend_core/core/singleflight.py
+"""Coalescing of concurrent identical calls."""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Generic, Hashable, Tuple, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+ResultType = TypeVar("ResultType")
+
+
+class SingleFlight(Generic[ResultType]):
+    """
+    Run at most one call per key at a time and share its outcome.
+
+    The first caller for a key executes the function; callers arriving while it
+    is in flight wait for it and receive the same result or exception. Nothing is
+    remembered once the call completes, so this is not a cache. Threadpool callers
+    use ``do`` and event-loop callers ``do_async``; both join the same flights.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no calls in flight."""
+        self._calls: Dict[Hashable, Future[ResultType]] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: Hashable) -> Tuple[Future[ResultType], bool]:
+        """Return the flight for a key and whether the caller has to run it."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _run(self, key: Hashable, future: Future[ResultType], fn: Callable[[], ResultType]) -> None:
+        """Execute a flight and publish its outcome to every waiter."""
+        try:
+            result = fn()
+        except BaseException as exc:
+            with self._lock:
+                del self._calls[key]
+            future.set_exception(exc)
+        else:
+            with self._lock:
+                del self._calls[key]
+            future.set_result(result)
+
+    def do(self, key: Hashable, fn: Callable[[], ResultType]) -> ResultType:
+        """Call ``fn`` unless a call for ``key`` is in flight, blocking until the result is ready."""
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future, fn)
+        return future.result()
+
+    async def do_async(self, key: Hashable, fn: Callable[[], ResultType]) -> ResultType:
+        """Like ``do``, but run ``fn`` in the threadpool and wait without blocking the event loop."""
+        future, leader = self._join(key)
+        if leader:
+            await run_in_threadpool(self._run, key, future, fn)
+        return await asyncio.wrap_future(future)
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._calls)
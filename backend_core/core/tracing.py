@@ -0,0 +1,345 @@
+# backend_core/core/tracing.py
+"""
+Minimal request tracing.
+
+A sampled request gets a trace whose spans time the work done for it:
+token decoding, user lookups, password hashing, database sessions and
+statements, and response rendering. The current span travels in a context
+variable, so spans opened in the threadpool nest under the request's. A
+finished trace is handed to ``span_exporter``, which writes it from a
+background thread as one line of OTLP/JSON, the OpenTelemetry protocol's
+JSON encoding, to ``TRACE_EXPORT_PATH`` or to stdout if that is ``-``.
+
+An inbound W3C ``traceparent`` header is honoured: the request joins the
+caller's trace, and is traced whenever the caller's was sampled. Other
+requests are sampled at ``TRACE_SAMPLE_RATE``. Without an export path
+nothing is traced, and spans cost a context variable lookup.
+"""
+
+import functools
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, ParamSpec, Tuple, TypeVar
+
+import orjson
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend_core.core.metrics import registry
+from backend_core.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+ResultType = TypeVar("ResultType")
+
+TRACEPARENT_HEADER = b"traceparent"
+_TRACEPARENT = re.compile(r"([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+# Longest statement text recorded on a database span
+MAX_STATEMENT_LENGTH = 1_000
+
+traces_dropped = registry.counter("traces_dropped_total", "Sampled traces discarded because the export queue was full.")
+
+
+class Trace:
+    """The spans of one sampled request."""
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: str):
+        """Start an empty trace."""
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str], attributes: Dict[str, Any], kind: int = 1):
+        """Start a span now."""
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        # OTLP span kinds: 1 internal, 2 server, 3 client
+        self.kind = kind
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.end_ns = 0
+        self.start_ns = time.time_ns()
+
+    def set(self, key: str, value: Any) -> None:
+        """Set an attribute."""
+        self.attributes[key] = value
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """Finish the span, marking it failed if ``error`` is given."""
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        self.trace.spans.append(self)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Return the innermost open span of the current context, if it is traced."""
+    return _current_span.get()
+
+
+def start_span(name: str, **attributes: Any) -> Optional[Span]:
+    """
+    Start a child of the current span without making it current, or return ``None`` if not traced.
+
+    For operations that start and end in different contexts; the caller must end the span.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time the enclosed block as a child of the current span, if the current context is traced."""
+    child = start_span(name, **attributes)
+    if child is None:
+        yield None
+        return
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.end(exc)
+        raise
+    else:
+        child.end()
+    finally:
+        _current_span.reset(token)
+
+
+def traced(name: str) -> Callable[[Callable[P, ResultType]], Callable[P, ResultType]]:
+    """Decorate a function to run in a span named ``name``."""
+
+    def decorate(function: Callable[P, ResultType]) -> Callable[P, ResultType]:
+        @functools.wraps(function)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> ResultType:
+            if _current_span.get() is None:
+                return function(*args, **kwargs)
+            with span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def parse_traceparent(value: str) -> Optional[Tuple[str, str, bool]]:
+    """Return the trace ID, parent span ID and sampled flag of a ``traceparent`` header, if it is valid."""
+    match = _TRACEPARENT.fullmatch(value.strip())
+    if match is None:
+        return None
+    version, trace_id, parent_id, flags = match.groups()
+    if version == "ff" or trace_id == _INVALID_TRACE_ID or parent_id == _INVALID_SPAN_ID:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    """Encode an attribute as an OTLP key-value pair."""
+    if isinstance(value, bool):
+        encoded: Dict[str, Any] = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def to_otlp(trace: Trace) -> Dict[str, Any]:
+    """Encode a trace as an OTLP/JSON ``ExportTraceServiceRequest``."""
+    spans = []
+    for finished in trace.spans:
+        encoded: Dict[str, Any] = {
+            "traceId": trace.trace_id,
+            "spanId": finished.span_id,
+            "name": finished.name,
+            "kind": finished.kind,
+            "startTimeUnixNano": str(finished.start_ns),
+            "endTimeUnixNano": str(finished.end_ns),
+            "attributes": [_attribute(key, value) for key, value in finished.attributes.items()],
+            # OTLP status codes: 1 ok, 2 error
+            "status": {"code": 2, "message": finished.error} if finished.error else {"code": 1},
+        }
+        if finished.parent_id:
+            encoded["parentSpanId"] = finished.parent_id
+        spans.append(encoded)
+    resource = {"attributes": [_attribute("service.name", settings.PROJECT_NAME)]}
+    scope = {"name": __name__, "version": settings.VERSION}
+    return {"resourceSpans": [{"resource": resource, "scopeSpans": [{"scope": scope, "spans": spans}]}]}
+
+
+class SpanExporter:
+    """Write finished traces as OTLP/JSON lines from a background thread, dropping them when the queue is full."""
+
+    name = "span-exporter"
+
+    def __init__(
+        self,
+        *,
+        path: Optional[str] = settings.TRACE_EXPORT_PATH,
+        queue_size: int = settings.TRACE_QUEUE_SIZE,
+        stream: Optional[IO[str]] = None,
+    ):
+        """Initialize a stopped exporter writing to ``stream``, or else to ``path``, where ``-`` is stdout."""
+        self.path = path
+        self.stream = stream
+        self.queue: "queue.Queue[Optional[Trace]]" = queue.Queue(queue_size)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether traces have somewhere to go."""
+        return self.stream is not None or bool(self.path)
+
+    def export(self, trace: Trace) -> None:
+        """Queue a finished trace for writing."""
+        try:
+            self.queue.put_nowait(trace)
+        except queue.Full:
+            traces_dropped.inc()
+
+    def _open(self) -> IO[str]:
+        """Open the output."""
+        if self.stream is not None:
+            return self.stream
+        if self.path == "-":
+            return sys.stdout
+        return open(str(self.path), "a", encoding="utf-8")
+
+    def _run(self) -> None:
+        """Write queued traces until the ``None`` sentinel."""
+        output = self._open()
+        try:
+            while True:
+                trace = self.queue.get()
+                if trace is None:
+                    return
+                try:
+                    output.write(orjson.dumps(to_otlp(trace)).decode() + "\n")
+                    output.flush()
+                except Exception:
+                    logger.exception("%s failed to write a trace", self.name)
+        finally:
+            if output is not self.stream and output is not sys.stdout:
+                output.close()
+
+    def start(self) -> None:
+        """Start the background writer if traces are exported and it is not running."""
+        if self._thread is not None or not self.enabled:
+            return
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write out every queued trace and stop the background writer."""
+        if self._thread is not None:
+            self.queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+
+class TracingMiddleware:
+    """Trace sampled HTTP requests in a server span, joining the caller's trace given in ``traceparent``."""
+
+    def __init__(self, app: ASGIApp, *, sample_rate: float = settings.TRACE_SAMPLE_RATE, exporter: SpanExporter):
+        """Wrap ``app``."""
+        self.app = app
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Serve a request, in a span if it is sampled."""
+        if scope["type"] != "http" or not self.exporter.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        for name, value in scope["headers"]:
+            if name == TRACEPARENT_HEADER:
+                parent = parse_traceparent(value.decode("latin-1"))
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id, sampled = os.urandom(16).hex(), None, random.random() < self.sample_rate
+        if not sampled:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(trace_id)
+        root = Span(trace, f"{scope['method']} {scope['path']}", parent_id, {}, kind=2)
+        root.set("http.request.method", scope["method"])
+        root.set("url.path", scope["path"])
+        token = _current_span.set(root)
+
+        async def send_with_status(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.set("http.response.status_code", message["status"])
+            await send(message)
+
+        error: Optional[BaseException] = None
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            _current_span.reset(token)
+            route = getattr(scope.get("route"), "path", None)
+            if route is not None:
+                # Name server spans by route template, as OpenTelemetry does, to keep names bounded
+                root.name = f"{scope['method']} {route}"
+                root.set("http.route", route)
+            root.end(error)
+            self.exporter.export(trace)
+
+
+def trace_engine(engine: Engine) -> None:
+    """Time each statement an engine executes in a traced context as a span."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        if context is not None:
+            context._trace_span = start_span("db.query", **{"db.statement": statement[:MAX_STATEMENT_LENGTH]})
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        statement_span = getattr(context, "_trace_span", None)
+        if statement_span is not None:
+            statement_span.set("db.rows", cursor.rowcount)
+            statement_span.end()
+
+    @event.listens_for(engine, "handle_error")
+    def failed(exception_context: Any) -> None:
+        statement_span = getattr(exception_context.execution_context, "_trace_span", None)
+        if statement_span is not None:
+            statement_span.end(exception_context.original_exception)
+
+
+span_exporter = SpanExporter()
@@ -0,0 +1,152 @@
+# backend_core/core/warmup.py
+"""Startup warm-up of the pool and the hot paths of a worker."""
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+import orjson
+from sqlalchemy.orm import Session
+
+from backend_core.core.deps import get_user, get_user_by_email
+from backend_core.core.metrics import registry
+from backend_core.core.responses import render, serialize
+from backend_core.core.security import get_password_hash, verify_password
+from backend_core.core.settings import settings
+from backend_core.db.session import SessionLocal, engine
+from backend_core.db.utils import CRUDBase, record_type
+from backend_core.models.user import User
+from backend_core.schemas.token import Token
+from backend_core.schemas.user import UserBatchRead, UserCreate, UserRead, UserSearchPage, UserUpdate
+
+logger = logging.getLogger(__name__)
+
+warmup_seconds = registry.gauge("app_warmup_seconds", "Time taken by the startup warm-up of this worker.")
+
+# A user ID and email that no row should have, so the hot statements run without side effects
+_NO_USER_ID = uuid.UUID(int=0)
+_NO_USER_EMAIL = "warm-up@example.com"
+
+
+def open_pool_connections(count: int = settings.DB_POOL_SIZE) -> None:
+    """Open ``count`` pool connections at once, so none of them is established by a request."""
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+
+
+def compile_hot_statements(db: Session) -> None:
+    """Run the statements of the authentication and user read paths once, filling the compiled cache."""
+    crud_user = CRUDBase[User, UserCreate, UserUpdate](User)
+    get_user(_NO_USER_ID, db)
+    get_user_by_email(_NO_USER_EMAIL, db)
+    crud_user.get_many(db, [_NO_USER_ID])
+    crud_user.read_many(db, [_NO_USER_ID])
+
+
+def prime_password_hashing() -> None:
+    """Hash and verify a throwaway password, which loads and self-tests the bcrypt backend."""
+    verify_password("warm-up", get_password_hash("warm-up"))
+
+
+def build_serializers() -> None:
+    """Serialize a throwaway user through each response path once."""
+    now = datetime.now(timezone.utc)
+    user = record_type(User)(
+        id=_NO_USER_ID,
+        email=_NO_USER_EMAIL,
+        first_name=None,
+        last_name=None,
+        is_active=True,
+        is_superuser=False,
+        token_version=0,
+        last_login_at=None,
+        last_seen_at=None,
+        created_at=now,
+        updated_at=now,
+    )
+    render(UserRead, user)
+    read = UserRead.model_validate(user)
+    UserBatchRead(users=[read], missing=[]).model_dump_json()
+    UserSearchPage(items=[read]).model_dump_json()
+    Token(access_token="", token_type="bearer", expires_in=0).model_dump_json()
+    orjson.dumps(serialize(UserRead, user))
+
+
+class WarmUp:
+    """Readiness of this worker, reached once the warm-up has run."""
+
+    name = "warm-up"
+
+    def __init__(self, *, max_retry_delay: float = settings.WARMUP_MAX_RETRY_DELAY_SECONDS) -> None:
+        """Initialize as not ready."""
+        self.max_retry_delay = max_retry_delay
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the warm-up has finished."""
+        return self._ready.is_set()
+
+    def run(self) -> float:
+        """Warm up the worker once and mark it ready, returning the time the warm-up took in seconds."""
+        with self._lock:
+            if self.seconds is not None:
+                return self.seconds
+            start = time.perf_counter()
+            open_pool_connections()
+            with SessionLocal() as db:
+                compile_hot_statements(db)
+            prime_password_hashing()
+            build_serializers()
+            self.seconds = time.perf_counter() - start
+            warmup_seconds.set(self.seconds)
+            logger.info("Warm-up finished in %.3fs", self.seconds)
+            self._ready.set()
+            return self.seconds
+
+    def attempt(self) -> bool:
+        """Run the warm-up, logging instead of raising if it fails, and return whether the worker is ready."""
+        try:
+            self.run()
+        except Exception:
+            logger.exception("Warm-up failed; the worker is not ready")
+        return self.ready
+
+    def _run(self) -> None:
+        """Retry the warm-up with backoff until it succeeds or the retries are stopped."""
+        delay = 0.0
+        while not self.ready:
+            delay = min(max(delay * 2, 0.5), self.max_retry_delay)
+            if self._stopping.wait(delay):
+                return
+            self.attempt()
+
+    def start(self) -> None:
+        """Retry the warm-up in the background if it has not succeeded and retries are not running."""
+        if self._thread is not None or self.ready:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop retrying the warm-up."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+
+
+warm_up = WarmUp()
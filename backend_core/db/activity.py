@@ -0,0 +1,130 @@
+# backend_core/db/activity.py
+"""Write-behind tracking of user login and activity timestamps."""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import DateTime, cast, column, func, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Session
+
+from backend_core.core.settings import settings
+from backend_core.db.session import SessionLocal
+from backend_core.db.write_behind import WriteBehindBuffer
+from backend_core.models.user import User
+
+# Latest (last_login_at, last_seen_at) per user; None means "no new value"
+Activity = Tuple[Optional[datetime], Optional[datetime]]
+
+
+def _latest(current: Optional[datetime], new: Optional[datetime]) -> Optional[datetime]:
+    """Return the later of two optional timestamps."""
+    if current is None:
+        return new
+    if new is None:
+        return current
+    return max(current, new)
+
+
+def apply_activity(db: Session, activity: Dict[uuid.UUID, Activity]) -> None:
+    """
+    Apply buffered activity for many users with a single ``UPDATE ... FROM (VALUES ...)``.
+
+    Timestamps only move forward, and ``updated_at`` is left untouched because
+    activity is not a change to the user's representation. Rows are locked in
+    ``id`` order first, as the join may visit them in any order, so that
+    concurrent flushes from several workers queue instead of deadlocking.
+    """
+    user_ids = sorted(activity)
+    db.execute(select(User.id).where(User.id.in_(user_ids)).order_by(User.id).with_for_update())
+    timestamp = DateTime(timezone=True)
+    rows = values(
+        column("id", UUID(as_uuid=True)),
+        column("last_login_at", timestamp),
+        column("last_seen_at", timestamp),
+        name="activity",
+    ).data([(user_id, *activity[user_id]) for user_id in user_ids])
+    statement = (
+        update(User)
+        .where(User.id == cast(rows.c.id, UUID(as_uuid=True)))
+        .values(
+            # Casts keep all-NULL VALUES columns, which Postgres types as text, comparable
+            last_login_at=func.greatest(User.last_login_at, cast(rows.c.last_login_at, timestamp)),
+            last_seen_at=func.greatest(User.last_seen_at, cast(rows.c.last_seen_at, timestamp)),
+            # Assigning the column to itself suppresses its onupdate=now()
+            updated_at=User.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(statement)
+
+
+class ActivityTracker(WriteBehindBuffer[Dict[uuid.UUID, Activity]]):
+    """
+    Buffer last-login and last-seen updates, coalesced per user.
+
+    Recording is a dictionary update, so it is cheap enough for every request.
+    Once ``max_size`` distinct users are pending, activity for further users is
+    dropped until the next flush and counted in ``dropped``.
+    """
+
+    name = "activity-tracker"
+
+    def __init__(
+        self,
+        *,
+        flush_interval: float = settings.ACTIVITY_FLUSH_INTERVAL_SECONDS,
+        max_size: int = settings.ACTIVITY_BUFFER_MAX_SIZE,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        """Initialize an empty tracker."""
+        super().__init__(flush_interval=flush_interval, max_size=max_size, session_factory=session_factory)
+        self._pending: Dict[uuid.UUID, Activity] = {}
+        self.dropped = 0
+
+    def _record(self, user_id: uuid.UUID, login: Optional[datetime], seen: datetime) -> None:
+        """Merge a new observation into the pending entry for a user."""
+        with self._lock:
+            current = self._pending.get(user_id)
+            if current is None:
+                if len(self._pending) >= self.max_size:
+                    self.dropped += 1
+                    return
+                self._pending[user_id] = (login, seen)
+            else:
+                self._pending[user_id] = (_latest(current[0], login), _latest(current[1], seen))
+        self._added()
+
+    def record_login(self, user_id: uuid.UUID, when: Optional[datetime] = None) -> None:
+        """Record a successful login, which also counts as activity."""
+        when = when or datetime.now(timezone.utc)
+        self._record(user_id, when, when)
+
+    def record_seen(self, user_id: uuid.UUID, when: Optional[datetime] = None) -> None:
+        """Record an authenticated request."""
+        self._record(user_id, None, when or datetime.now(timezone.utc))
+
+    def _drain(self) -> Optional[Dict[uuid.UUID, Activity]]:
+        """Take all pending activity."""
+        if not self._pending:
+            return None
+        batch, self._pending = self._pending, {}
+        return batch
+
+    def _restore(self, batch: Dict[uuid.UUID, Activity]) -> None:
+        """Merge a failed batch back, keeping newer values recorded meanwhile."""
+        for user_id, (login, seen) in batch.items():
+            current = self._pending.get(user_id, (None, None))
+            self._pending[user_id] = (_latest(current[0], login), _latest(current[1], seen))
+
+    def _write(self, db: Session, batch: Dict[uuid.UUID, Activity]) -> None:
+        """Write the batch with one bulk update."""
+        apply_activity(db, batch)
+
+    def __len__(self) -> int:
+        """Return the number of users with pending activity."""
+        return len(self._pending)
+
+
+activity_tracker = ActivityTracker()
@@ -0,0 +1,258 @@
+# backend_core/db/audit.py
+"""Batched audit logging of authentication events."""
+
+import logging
+import re
+import threading
+import time
+import uuid
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from fastapi import Request
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from backend_core.core.forwarded import client_address
+from backend_core.core.ids import new_id
+from backend_core.core.metrics import registry
+from backend_core.core.settings import settings
+from backend_core.db.session import SessionLocal
+from backend_core.db.write_behind import WriteBehindBuffer
+from backend_core.models.audit import auth_events
+
+logger = logging.getLogger(__name__)
+
+# Partition maintenance and retention piggyback on flushes at most this often
+MAINTENANCE_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Retention gives up rather than queue inserts behind its lock on the parent table
+RETENTION_LOCK_TIMEOUT = "2s"
+
+# Only partitions named by ``partition_name`` are considered for retention
+PARTITION_NAME = re.compile(rf"^{re.escape(auth_events.name)}_(\d{{4}})_(\d{{2}})$")
+
+events_overflowed = registry.counter(
+    "audit_events_overflowed_total", "Audit events buffered past the maximum size because the flusher fell behind."
+)
+events_dropped = registry.counter(
+    "audit_events_dropped_total", "Audit events dropped because the buffer reached its hard limit."
+)
+
+
+class AuthEventType(str, Enum):
+    """Kinds of authentication events kept for compliance."""
+
+    LOGIN_SUCCESS = "login_success"
+    LOGIN_FAILURE = "login_failure"
+    TOKEN_ISSUED = "token_issued"
+    PASSWORD_CHANGED = "password_changed"
+
+
+def add_months(month: date, months: int) -> date:
+    """Return the first day of the month ``months`` after the month containing ``month``."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Return the name of the partition holding events of the given month."""
+    return f"{auth_events.name}_{month:%Y_%m}"
+
+
+def ensure_partitions(db: Session, first_month: date, count: int) -> None:
+    """Create the monthly partitions starting at ``first_month`` that do not exist yet."""
+    for offset in range(count):
+        start, end = add_months(first_month, offset), add_months(first_month, offset + 1)
+        db.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {partition_name(start)} PARTITION OF {auth_events.name} "
+                f"FOR VALUES FROM ('{start.isoformat()} 00:00+00') TO ('{end.isoformat()} 00:00+00')"
+            )
+        )
+
+
+def list_partitions(db: Session) -> List[str]:
+    """Return the names of the existing partitions, oldest first."""
+    rows = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent ORDER BY child.relname"
+        ),
+        {"parent": auth_events.name},
+    )
+    return [row[0] for row in rows]
+
+
+def drop_partitions_before(db: Session, cutoff: date) -> List[str]:
+    """
+    Drop every partition whose month ends on or before ``cutoff``.
+
+    Retention is a metadata operation: whole months are dropped instead of
+    deleting rows. Partitions not named by ``partition_name`` are left alone.
+    """
+    dropped = []
+    for name in list_partitions(db):
+        match = PARTITION_NAME.match(name)
+        if match is None or not 1 <= int(match[2]) <= 12:
+            continue
+        if add_months(date(int(match[1]), int(match[2]), 1), 1) <= cutoff:
+            db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped.append(name)
+    return dropped
+
+
+class AuditLog(WriteBehindBuffer[List[Dict[str, Any]]]):
+    """
+    Queue authentication events in memory and insert them in batches.
+
+    Recording never writes to the database: when ``max_size`` events are
+    pending, the recording thread wakes the flusher and waits up to
+    ``full_wait`` seconds for it to take them, then buffers its event anyway,
+    counted as an overflow. Only once ``hard_limit`` events are pending, as
+    when the database is down, are newer events dropped and counted. Batches
+    are written with a multi-row INSERT, and missing monthly partitions are
+    created on demand. Expired partitions are dropped in a separate
+    transaction, so retention failures never hold back inserts.
+    """
+
+    name = "audit-log"
+
+    def __init__(
+        self,
+        *,
+        flush_interval: float = settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+        max_size: int = settings.AUDIT_BUFFER_MAX_SIZE,
+        full_wait: float = settings.AUDIT_FULL_WAIT_SECONDS,
+        hard_limit: int = settings.AUDIT_BUFFER_HARD_LIMIT,
+        partitions_ahead: int = settings.AUDIT_PARTITIONS_AHEAD,
+        retention_months: int = settings.AUDIT_RETENTION_MONTHS,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        """Initialize an empty audit log."""
+        super().__init__(flush_interval=flush_interval, max_size=max_size, session_factory=session_factory)
+        self.full_wait = full_wait
+        self.hard_limit = max(hard_limit, max_size)
+        self.partitions_ahead = partitions_ahead
+        self.retention_months = retention_months
+        self._pending: List[Dict[str, Any]] = []
+        # Notified whenever the flusher takes the pending events
+        self._drained = threading.Condition(self._lock)
+        self._known_partitions: Set[date] = set()
+        self._last_maintenance = 0.0
+        self._last_retention = 0.0
+
+    def record(
+        self,
+        event_type: AuthEventType,
+        *,
+        user_id: Optional[uuid.UUID] = None,
+        email: Optional[str] = None,
+        request: Optional[Request] = None,
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Queue an event stamped with the current time, with client details taken from ``request``."""
+        event = {
+            "id": new_id(),
+            "occurred_at": datetime.now(timezone.utc),
+            "event_type": event_type.value,
+            "user_id": user_id,
+            "email": email,
+            "ip_address": client_address(request) if request is not None else None,
+            "user_agent": request.headers.get("user-agent") if request is not None else None,
+            "details": details,
+        }
+        with self._lock:
+            if len(self._pending) >= self.hard_limit:
+                events_dropped.inc()
+                return
+            if len(self._pending) >= self.max_size:
+                self._wakeup.set()
+                if not self._drained.wait_for(lambda: len(self._pending) < self.max_size, timeout=self.full_wait):
+                    events_overflowed.inc()
+            self._pending.append(event)
+        self._added()
+
+    def maintain(self, db: Session) -> None:
+        """Create the current and upcoming partitions."""
+        this_month = datetime.now(timezone.utc).date().replace(day=1)
+        ensure_partitions(db, this_month, self.partitions_ahead + 1)
+        self._known_partitions.update(add_months(this_month, i) for i in range(self.partitions_ahead + 1))
+        self._last_maintenance = time.monotonic()
+
+    def expire(self) -> None:
+        """Drop the partitions past retention in a transaction of their own, logging any failure."""
+        self._last_retention = time.monotonic()
+        this_month = datetime.now(timezone.utc).date().replace(day=1)
+        db = self._session_factory()
+        try:
+            db.execute(text(f"SET LOCAL lock_timeout = '{RETENTION_LOCK_TIMEOUT}'"))
+            dropped = drop_partitions_before(db, add_months(this_month, -self.retention_months))
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Audit partition retention failed")
+            return
+        finally:
+            db.close()
+        if dropped:
+            logger.info("Dropped expired audit partitions: %s", ", ".join(dropped))
+
+    def flush(self) -> int:
+        """Write all pending events now, then apply retention if it is due."""
+        size = super().flush()
+        with self._flush_lock:
+            if time.monotonic() - self._last_retention > MAINTENANCE_INTERVAL_SECONDS:
+                self.expire()
+        return size
+
+    def start(self) -> None:
+        """Run partition maintenance, then start the background flusher."""
+        db = self._session_factory()
+        try:
+            self.maintain(db)
+            db.commit()
+        except Exception:
+            logger.exception("Audit partition maintenance failed")
+        finally:
+            db.close()
+        super().start()
+
+    def _drain(self) -> Optional[List[Dict[str, Any]]]:
+        """Take all pending events."""
+        if not self._pending:
+            return None
+        batch, self._pending = self._pending, []
+        self._drained.notify_all()
+        return batch
+
+    def _restore(self, batch: List[Dict[str, Any]]) -> None:
+        """Put a failed batch back in front of events recorded meanwhile, keeping at most the hard limit."""
+        self._pending = batch + self._pending
+        if len(self._pending) > self.hard_limit:
+            events_dropped.inc(len(self._pending) - self.hard_limit)
+            del self._pending[self.hard_limit :]
+        # Partition changes made in the failed transaction were rolled back too
+        self._known_partitions.clear()
+        self._last_maintenance = 0.0
+
+    def _write(self, db: Session, batch: List[Dict[str, Any]]) -> None:
+        """Insert a batch, creating any partition it needs first."""
+        if time.monotonic() - self._last_maintenance > MAINTENANCE_INTERVAL_SECONDS:
+            self.maintain(db)
+        months = {event["occurred_at"].date().replace(day=1) for event in batch} - self._known_partitions
+        for month in months:
+            ensure_partitions(db, month, 1)
+        # An executemany of a Core insert is sent as multi-row INSERT ... VALUES statements
+        db.execute(insert(auth_events), batch)
+        self._known_partitions.update(months)
+
+    def __len__(self) -> int:
+        """Return the number of pending events."""
+        return len(self._pending)
+
+
+audit_log = AuditLog()
@@ -2,4 +2,7 @@
 # Import all models here for Alembic
 from backend_core.db.base_class import Base  # noqa
 from backend_core.db.session import engine  # noqa
+from backend_core.models.audit import auth_events  # noqa
+from backend_core.models.bulk_job import BulkJob  # noqa
+from backend_core.models.idempotency_key import IdempotencyKey  # noqa
 from backend_core.models.user import User  # noqa
@@ -1,21 +1,25 @@
 # backend_core/db/base_class.py
 """Base model class."""
 
+import uuid
 from datetime import datetime
 from datetime import timezone as tz
 from typing import Any
 
 from sqlalchemy import DateTime, MetaData, inspect
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql import func
 
+from backend_core.core.ids import new_id
+
 
 class Base(DeclarativeBase):
     """Base class for all database models."""
 
     metadata = MetaData()
 
-    id: Any
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=new_id)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
@@ -0,0 +1,276 @@
+# backend_core/db/bulk.py
+"""Bulk user operations applied as set-based UPDATEs in chunks by a background job runner."""
+
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from psycopg2 import errorcodes
+from sqlalchemy import and_, any_, bindparam, func, or_, select, text, true, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from backend_core.core.etag import user_etags
+from backend_core.core.settings import settings
+from backend_core.db.session import SessionLocal
+from backend_core.models.bulk_job import BulkAction, BulkJob, BulkJobStatus
+from backend_core.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Columns an update job may set
+UPDATABLE_FIELDS = ("first_name", "last_name", "is_active", "is_superuser")
+
+# Errors after which a chunk is retried rather than failing the job
+_RETRYABLE = (errorcodes.LOCK_NOT_AVAILABLE, errorcodes.QUERY_CANCELED, errorcodes.DEADLOCK_DETECTED)
+
+
+def user_condition(params: Dict[str, Any]) -> ColumnElement[bool]:
+    """Build the WHERE clause selecting the users of a job from its ``ids`` or ``filter``."""
+    if "ids" in params:
+        ids = [uuid.UUID(id) for id in params["ids"]]
+        return User.id == any_(bindparam("ids", ids, type_=ARRAY(UUID(as_uuid=True))))
+
+    # Nulls are refused on submission; jobs queued before that treat them as absent
+    criteria = {name: value for name, value in params["filter"].items() if value is not None}
+    conditions: List[ColumnElement[bool]] = []
+    if "is_active" in criteria:
+        conditions.append(User.is_active.is_(criteria["is_active"]))
+    if "is_superuser" in criteria:
+        conditions.append(User.is_superuser.is_(criteria["is_superuser"]))
+    if "created_before" in criteria:
+        conditions.append(User.created_at < datetime.fromisoformat(criteria["created_before"]))
+    if "created_after" in criteria:
+        conditions.append(User.created_at >= datetime.fromisoformat(criteria["created_after"]))
+    if "last_seen_before" in criteria:
+        cutoff = datetime.fromisoformat(criteria["last_seen_before"])
+        conditions.append(or_(User.last_seen_at < cutoff, User.last_seen_at.is_(None)))
+    return and_(true(), *conditions)
+
+
+def job_values(job: BulkJob) -> Dict[str, Any]:
+    """Return the column values a job sets on each user."""
+    if job.action == BulkAction.ACTIVATE:
+        return {"is_active": True}
+    if job.action == BulkAction.DEACTIVATE:
+        return {"is_active": False}
+    values = job.params["values"].items()
+    return {field: value for field, value in values if field in UPDATABLE_FIELDS and value is not None}
+
+
+def submit_job(db: Session, action: BulkAction, params: Dict[str, Any], created_by: Optional[uuid.UUID]) -> BulkJob:
+    """Queue a job for the runner and commit it."""
+    job = BulkJob(
+        action=action.value,
+        params=params,
+        status=BulkJobStatus.PENDING.value,
+        processed=0,
+        created_by=created_by,
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def claim_job(db: Session, *, lease_seconds: float = settings.BULK_JOB_LEASE_SECONDS) -> Optional[BulkJob]:
+    """
+    Take ownership of the oldest unfinished job that no runner holds, and commit.
+
+    Running jobs whose lease has expired belonged to a runner that crashed or
+    stopped, and are resumed from their last completed chunk.
+    """
+    job = db.scalars(
+        select(BulkJob)
+        .where(
+            BulkJob.status.in_([BulkJobStatus.PENDING.value, BulkJobStatus.RUNNING.value]),
+            or_(BulkJob.lease_expires_at.is_(None), BulkJob.lease_expires_at < func.now()),
+        )
+        .order_by(BulkJob.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).first()
+    if job is None:
+        db.commit()
+        return None
+    if job.status == BulkJobStatus.RUNNING.value:
+        logger.info("Resuming bulk job %s after %d users", job.id, job.processed)
+    job.status = BulkJobStatus.RUNNING.value
+    job.lease_expires_at = datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+    if job.total is None:
+        job.total = db.scalar(select(func.count()).select_from(User).where(user_condition(job.params)))
+    db.commit()
+    return job
+
+
+def run_chunk(
+    db: Session,
+    job: BulkJob,
+    *,
+    chunk_size: int = settings.BULK_JOB_CHUNK_SIZE,
+    lease_seconds: float = settings.BULK_JOB_LEASE_SECONDS,
+) -> int:
+    """
+    Apply a job to its next ``chunk_size`` users in one short transaction, and commit.
+
+    The chunk's rows are locked in primary key order, updated with a single
+    statement, and the job's progress is saved in the same transaction, so a
+    chunk is applied exactly once. Returns the number of users updated. Once
+    no users are left the job is marked as succeeded.
+    """
+    timeout = str(settings.BULK_JOB_CHUNK_TIMEOUT_MS)
+    db.execute(
+        text("SELECT set_config('statement_timeout', :ms, true), set_config('lock_timeout', :ms, true)"),
+        {"ms": timeout},
+    )
+    batch = select(User.id).where(user_condition(job.params))
+    if job.last_key is not None:
+        batch = batch.where(User.id > job.last_key)
+    ids = list(db.scalars(batch.order_by(User.id).limit(chunk_size).with_for_update()))
+
+    now = datetime.now(timezone.utc)
+    changed: List[uuid.UUID] = []
+    if ids:
+        statement = (
+            update(User)
+            .where(User.id == any_(bindparam("chunk_ids", ids, type_=ARRAY(UUID(as_uuid=True)))))
+            .values(**job_values(job), updated_at=now)
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        )
+        changed = list(db.scalars(statement))
+        job.last_key = ids[-1]
+        job.processed += len(changed)
+        job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+    else:
+        job.status = BulkJobStatus.SUCCEEDED.value
+        job.finished_at = now
+        job.lease_expires_at = None
+    job.updated_at = now
+    db.commit()
+
+    # Representations changed, so cached ETags must not answer conditional requests any more
+    for user_id in changed:
+        user_etags.pop(str(user_id))
+    return len(changed)
+
+
+def fail_job(db: Session, job: BulkJob, error: str) -> None:
+    """Mark a job as failed, and commit."""
+    db.rollback()
+    job.status = BulkJobStatus.FAILED.value
+    job.error = error[:1000]
+    job.finished_at = job.updated_at = datetime.now(timezone.utc)
+    job.lease_expires_at = None
+    db.commit()
+
+
+class BulkJobRunner:
+    """
+    Run bulk jobs from a background thread, one chunk at a time.
+
+    Jobs live in the database, so any worker's runner can pick up a job, and
+    one that a crashed worker was running is resumed once its lease expires.
+    The runner checks for work every ``poll_interval`` seconds, or as soon as
+    ``wake`` is called after a job is submitted.
+    """
+
+    name = "bulk-job-runner"
+
+    def __init__(
+        self,
+        *,
+        poll_interval: float = settings.BULK_JOB_POLL_INTERVAL_SECONDS,
+        chunk_pause: float = settings.BULK_JOB_CHUNK_PAUSE_SECONDS,
+        max_retries: int = settings.BULK_JOB_MAX_RETRIES,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        """Initialize a stopped runner."""
+        self.poll_interval = poll_interval
+        self.chunk_pause = chunk_pause
+        self.max_retries = max_retries
+        self._session_factory = session_factory
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_job(self, db: Session, job: BulkJob) -> None:
+        """Apply a claimed job chunk by chunk until it finishes, fails, or the runner stops."""
+        retries = 0
+        while not self._stopping.is_set():
+            try:
+                run_chunk(db, job)
+                if job.status != BulkJobStatus.RUNNING.value:
+                    logger.info("Bulk job %s updated %d users", job.id, job.processed)
+                    return
+                retries = 0
+            except OperationalError as exc:
+                db.rollback()
+                retries += 1
+                if getattr(exc.orig, "pgcode", None) not in _RETRYABLE or retries > self.max_retries:
+                    fail_job(db, job, str(exc.orig))
+                    return
+                logger.warning("Bulk job %s chunk timed out (attempt %d), retrying", job.id, retries)
+                time.sleep(self.chunk_pause * 2**retries)
+                continue
+            except Exception as exc:
+                fail_job(db, job, str(exc))
+                logger.exception("Bulk job %s failed", job.id)
+                return
+            if self.chunk_pause:
+                time.sleep(self.chunk_pause)
+
+        # Stopping: hand the job back so another runner resumes it without waiting for the lease
+        job.lease_expires_at = None
+        db.commit()
+
+    def process_next(self) -> bool:
+        """Claim and run the next job, returning whether there was one."""
+        db = self._session_factory()
+        try:
+            job = claim_job(db)
+            if job is None:
+                return False
+            self.run_job(db, job)
+            return True
+        finally:
+            db.close()
+
+    def wake(self) -> None:
+        """Check for jobs now instead of at the next poll."""
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        """Run jobs until stopped."""
+        while not self._stopping.is_set():
+            try:
+                if self.process_next():
+                    continue
+            except Exception:
+                logger.exception("%s failed; will retry", self.name)
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        """Start the background runner if it is not running."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background runner after its current chunk."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+
+
+bulk_job_runner = BulkJobRunner()
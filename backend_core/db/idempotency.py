@@ -0,0 +1,191 @@
+# backend_core/db/idempotency.py
+"""Storage of responses to requests carrying an ``Idempotency-Key``."""
+
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from backend_core.core.ids import new_id
+from backend_core.core.settings import settings
+from backend_core.db.session import SessionLocal
+from backend_core.models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+
+class KeyState(str, Enum):
+    """Outcome of presenting an idempotency key."""
+
+    # The caller now owns the key and must run the request, then complete or release it
+    STARTED = "started"
+    # Another request with the key is still running
+    IN_PROGRESS = "in_progress"
+    # The response to the first request is stored
+    COMPLETED = "completed"
+    # The key was first used for a different request
+    MISMATCH = "mismatch"
+
+
+class StoredResponse(NamedTuple):
+    """A response kept for replay."""
+
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+
+
+def begin(
+    db: Session,
+    scope: str,
+    key: str,
+    fingerprint: str,
+    *,
+    ttl: float = settings.IDEMPOTENCY_KEY_TTL_SECONDS,
+    lease: float = settings.IDEMPOTENCY_LEASE_SECONDS,
+) -> Tuple[KeyState, Optional[uuid.UUID], Optional[StoredResponse]]:
+    """
+    Claim a key for a request, or report why it cannot be claimed, and commit.
+
+    A single ``INSERT ... ON CONFLICT`` decides between concurrent requests.
+    It also takes over a key whose stored response has expired, or whose
+    owner stopped working on the same request without finishing it. Returns
+    the state, the ID of the claimed row, and the stored response if there is one.
+    """
+    now = datetime.now(timezone.utc)
+    values = {
+        "fingerprint": fingerprint,
+        "status_code": None,
+        "headers": None,
+        "body": None,
+        "locked_until": now + timedelta(seconds=lease),
+        "expires_at": now + timedelta(seconds=ttl),
+        "created_at": now,
+        "updated_at": now,
+    }
+    insertion = insert(IdempotencyKey).values(id=new_id(), scope=scope, key=key, **values)
+    statement = insertion.on_conflict_do_update(
+        constraint="uq_idempotency_keys_scope_key",
+        set_={**values, "id": insertion.excluded.id},
+        where=or_(
+            IdempotencyKey.expires_at < now,
+            and_(
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.locked_until < now,
+                IdempotencyKey.fingerprint == fingerprint,
+            ),
+        ),
+    ).returning(IdempotencyKey.id)
+    claimed = db.scalar(statement)
+    if claimed is not None:
+        db.commit()
+        return KeyState.STARTED, claimed, None
+
+    row = db.execute(
+        select(
+            IdempotencyKey.fingerprint, IdempotencyKey.status_code, IdempotencyKey.headers, IdempotencyKey.body
+        ).where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+    ).one_or_none()
+    db.commit()
+    if row is None:
+        # Purged between the two statements; the caller tries again
+        return KeyState.IN_PROGRESS, None, None
+    if row.fingerprint != fingerprint:
+        return KeyState.MISMATCH, None, None
+    if row.status_code is None:
+        return KeyState.IN_PROGRESS, None, None
+    headers = [(name, value) for name, value in row.headers or []]
+    return KeyState.COMPLETED, None, StoredResponse(row.status_code, headers, row.body or b"")
+
+
+def complete(db: Session, claimed: uuid.UUID, response: StoredResponse) -> None:
+    """Store the response to a claimed key, and commit."""
+    db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.id == claimed)
+        .values(
+            status_code=response.status_code,
+            headers=[list(header) for header in response.headers],
+            body=response.body,
+            locked_until=None,
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+    db.commit()
+
+
+def release(db: Session, claimed: uuid.UUID) -> None:
+    """Forget a claimed key whose request failed, so that a retry runs it again, and commit."""
+    db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == claimed))
+    db.commit()
+
+
+def purge_expired(db: Session) -> int:
+    """Delete keys whose responses are no longer kept, returning how many; the caller commits."""
+    result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.now(timezone.utc)))
+    return result.rowcount  # type: ignore[attr-defined,no-any-return]
+
+
+class IdempotencyKeyPurger:
+    """Delete expired idempotency keys every ``interval`` seconds from a background thread."""
+
+    name = "idempotency-key-purger"
+
+    def __init__(
+        self,
+        *,
+        interval: float = settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        """Initialize a stopped purger."""
+        self.interval = interval
+        self._session_factory = session_factory
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def purge(self) -> int:
+        """Delete expired keys now, returning how many were deleted."""
+        db = self._session_factory()
+        try:
+            purged = purge_expired(db)
+            db.commit()
+            return purged
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        """Purge periodically until stopped."""
+        while not self._stopping.wait(self.interval):
+            try:
+                purged = self.purge()
+                if purged:
+                    logger.info("Purged %d expired idempotency keys", purged)
+            except Exception:
+                logger.exception("%s purge failed; will retry", self.name)
+
+    def start(self) -> None:
+        """Start the background purger if it is not running."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background purger."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+
+
+idempotency_key_purger = IdempotencyKeyPurger()
@@ -0,0 +1,186 @@
+# backend_core/db/invalidation.py
+"""Cross-worker cache invalidation over Postgres LISTEN/NOTIFY."""
+
+import json
+import logging
+import os
+import select
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Engine
+
+from backend_core.core.metrics import registry
+from backend_core.core.settings import settings
+from backend_core.db.session import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+# Channel the notify_cache_invalidation() trigger function publishes on
+CHANNEL = "cache_invalidation"
+
+Evict = Callable[[Dict[str, Any]], None]
+Flush = Callable[[], None]
+
+invalidations_received = registry.counter(
+    "cache_invalidations_total", "Cache invalidation messages received, by topic.", ["topic"]
+)
+invalidation_reconnects = registry.counter(
+    "cache_invalidation_reconnects_total", "Times the invalidation listener reconnected and flushed every cache."
+)
+
+
+class InvalidationListener:
+    """
+    Evict cached data when another worker, or any other writer, changes the rows it came from.
+
+    Triggers publish the old key columns of every changed row on ``CHANNEL``
+    when the writing transaction commits. Each worker keeps one connection
+    outside the pool listening on the channel, from a background thread,
+    and passes each message's keys to the eviction callbacks subscribed to
+    its topic, the table name. Messages sent while the connection was down
+    are lost, so every cache is flushed whenever it (re)connects.
+    """
+
+    name = "cache-invalidation-listener"
+
+    def __init__(
+        self,
+        *,
+        engine: Engine = default_engine,
+        keepalive: float = settings.CACHE_INVALIDATION_KEEPALIVE_SECONDS,
+        max_reconnect_delay: float = settings.CACHE_INVALIDATION_MAX_RECONNECT_DELAY_SECONDS,
+    ):
+        """Initialize a stopped listener with no subscribers."""
+        self.engine = engine
+        self.keepalive = keepalive
+        self.max_reconnect_delay = max_reconnect_delay
+        self._subscribers: List[Tuple[str, Evict, Flush]] = []
+        self._lock = threading.Lock()
+        self._connection: Any = None
+        self._connected = threading.Event()
+        self._stopping = threading.Event()
+        # Written to by ``stop`` to wake the listener from its wait on the connection
+        self._wakeup: Optional[Tuple[int, int]] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, topic: str, evict: Evict, flush: Flush) -> None:
+        """Call ``evict`` with the keys of each change to ``topic``, and ``flush`` when changes may have been missed."""
+        with self._lock:
+            self._subscribers.append((topic, evict, flush))
+
+    @property
+    def connected(self) -> bool:
+        """Whether the listener is currently listening."""
+        return self._connected.is_set()
+
+    def wait_connected(self, timeout: float) -> bool:
+        """Wait until the listener is listening, returning whether it is."""
+        return self._connected.wait(timeout)
+
+    def dispatch(self, payload: str) -> None:
+        """Pass the keys of one message to the callbacks subscribed to its topic."""
+        try:
+            message = json.loads(payload)
+            topic, keys = message["topic"], message["keys"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed cache invalidation message %r", payload)
+            return
+        invalidations_received.inc(topic=topic)
+        with self._lock:
+            evictions = [evict for subscribed, evict, _ in self._subscribers if subscribed == topic]
+        for evict in evictions:
+            try:
+                evict(keys)
+            except Exception:
+                logger.exception("Cache eviction for %s failed", topic)
+
+    def flush_all(self) -> None:
+        """Empty every subscribed cache."""
+        with self._lock:
+            flushes = [flush for _, _, flush in self._subscribers]
+        for flush in flushes:
+            try:
+                flush()
+            except Exception:
+                logger.exception("Cache flush failed")
+
+    def _connect(self) -> Any:
+        """Open a connection outside the pool, listen on the channel, and flush every cache."""
+        dialect = self.engine.dialect
+        args, kwargs = dialect.create_connect_args(self.engine.url)
+        connection: Any = dialect.connect(*args, **kwargs)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        # Only now is nothing missed any more, so caches filled before this point may be stale
+        self.flush_all()
+        return connection
+
+    def _listen(self, connection: Any, wakeup: int) -> None:
+        """Dispatch notifications until stopped or the connection fails."""
+        while not self._stopping.is_set():
+            readable, _, _ = select.select([connection, wakeup], [], [], self.keepalive)
+            if wakeup in readable:
+                return
+            if not readable:
+                # A connection dropped without a FIN would otherwise go unnoticed
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            connection.poll()
+            while connection.notifies:
+                self.dispatch(connection.notifies.pop(0).payload)
+
+    def _close(self) -> None:
+        """Close the listening connection, if any."""
+        self._connected.clear()
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _run(self, wakeup: int) -> None:
+        """Listen, reconnecting with backoff, until stopped."""
+        delay = 0.0
+        while not self._stopping.is_set():
+            try:
+                self._connection = self._connect()
+                if delay:
+                    invalidation_reconnects.inc()
+                    logger.info("%s reconnected; flushed every cache", self.name)
+                self._connected.set()
+                delay = 0.0
+                self._listen(self._connection, wakeup)
+            except Exception:
+                if self._stopping.is_set():
+                    break
+                delay = min(max(delay * 2, 0.5), self.max_reconnect_delay)
+                logger.exception("%s lost its connection; reconnecting in %.1fs", self.name, delay)
+            finally:
+                self._close()
+            self._stopping.wait(delay)
+
+    def start(self) -> None:
+        """Start the background listener if it is not running."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._wakeup = os.pipe()
+        self._thread = threading.Thread(target=self._run, args=(self._wakeup[0],), name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background listener and close its connection."""
+        if self._thread is not None and self._wakeup is not None:
+            self._stopping.set()
+            os.write(self._wakeup[1], b"\0")
+            self._thread.join()
+            self._thread = None
+            for fd in self._wakeup:
+                os.close(fd)
+            self._wakeup = None
+
+
+invalidation_listener = InvalidationListener()
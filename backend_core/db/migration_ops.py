@@ -0,0 +1,200 @@
+# backend_core/db/migration_ops.py
+"""
+Operations for Alembic migrations that must not block live traffic.
+
+Migrations run with ``settings.MIGRATION_LOCK_TIMEOUT_MS`` as their
+``lock_timeout`` (see ``alembic/env.py``), so a statement stuck behind a
+long-running transaction fails fast instead of queueing every query on the
+table behind it. The helpers here retry such statements with backoff, build
+indexes and validate constraints outside the migration transaction, and
+backfill in small committed batches. In offline (``--sql``) mode each helper
+emits its statements once, without retries or batching.
+"""
+
+import logging
+import time
+from typing import Any, Callable, Optional, TypeVar
+
+from psycopg2 import errorcodes
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from alembic import op
+from backend_core.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ResultType = TypeVar("ResultType")
+
+
+def is_lock_timeout(exc: BaseException) -> bool:
+    """Return whether a database error is a ``lock_timeout`` expiring."""
+    return bool(getattr(getattr(exc, "orig", None), "pgcode", None) == errorcodes.LOCK_NOT_AVAILABLE)
+
+
+def _offline() -> bool:
+    """Return whether the migration is being rendered as SQL instead of run."""
+    return op.get_context().as_sql
+
+
+def retry_on_lock_timeout(
+    fn: Callable[[], ResultType],
+    *,
+    attempts: int = settings.MIGRATION_LOCK_RETRIES,
+    backoff: float = settings.MIGRATION_LOCK_RETRY_BACKOFF_SECONDS,
+) -> ResultType:
+    """Call ``fn``, retrying with exponential backoff while it fails on ``lock_timeout``."""
+    attempt = 1
+    while True:
+        try:
+            return fn()
+        except OperationalError as exc:
+            if not is_lock_timeout(exc) or attempt >= attempts:
+                raise
+            delay = backoff * 2 ** (attempt - 1)
+            logger.warning("Lock not acquired (attempt %d of %d), retrying in %.1fs", attempt, attempts, delay)
+            time.sleep(delay)
+            attempt += 1
+
+
+def execute_with_retry(statement: str, **kwargs: Any) -> None:
+    """
+    Run a statement that needs a strong lock briefly, such as most ``ALTER TABLE`` forms.
+
+    Each attempt runs in a savepoint, so a lock timeout only rolls back that
+    attempt and not the rest of the migration.
+    """
+    if _offline():
+        op.execute(statement)
+        return
+    bind = op.get_bind()
+
+    def attempt() -> None:
+        with bind.begin_nested():
+            bind.exec_driver_sql(statement)
+
+    retry_on_lock_timeout(attempt, **kwargs)
+
+
+def _index_is_invalid(name: str) -> bool:
+    """Return whether an index exists but was left invalid by a failed concurrent build."""
+    row = op.get_bind().execute(
+        text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    )
+    return bool(row.scalar())
+
+
+def create_index_concurrently(
+    name: str,
+    table: str,
+    columns: str,
+    *,
+    unique: bool = False,
+    using: Optional[str] = None,
+    where: Optional[str] = None,
+) -> None:
+    """
+    Build an index with ``CREATE INDEX CONCURRENTLY``, which does not block writes.
+
+    Concurrent builds cannot run inside a transaction, so this commits the
+    migration transaction so far and builds the index in autocommit mode. An
+    invalid index left behind by an earlier failed build is dropped and
+    rebuilt. ``columns`` is the SQL between the parentheses.
+    """
+    statement = (
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table}"
+        f"{f' USING {using}' if using else ''} ({columns}){f' WHERE {where}' if where else ''}"
+    )
+    with op.get_context().autocommit_block():
+        # Waiting for older transactions to finish blocks no one, so let the build wait as long as needed
+        op.execute("SET lock_timeout = 0")
+        if not _offline() and _index_is_invalid(name):
+            logger.warning("Dropping invalid index %s left by a failed concurrent build", name)
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        op.execute(statement)
+        op.execute(f"SET lock_timeout = {settings.MIGRATION_LOCK_TIMEOUT_MS}")
+
+
+def drop_index_concurrently(name: str) -> None:
+    """Drop an index with ``DROP INDEX CONCURRENTLY``, outside the migration transaction."""
+    with op.get_context().autocommit_block():
+        op.execute("SET lock_timeout = 0")
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        op.execute(f"SET lock_timeout = {settings.MIGRATION_LOCK_TIMEOUT_MS}")
+
+
+def add_constraint_not_valid(table: str, name: str, definition: str) -> None:
+    """
+    Add a CHECK or FOREIGN KEY constraint without scanning existing rows.
+
+    ``NOT VALID`` constraints are enforced for new writes only, so adding one
+    holds its lock for an instant. Follow up with ``validate_constraint``.
+    """
+    execute_with_retry(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition} NOT VALID")
+
+
+def validate_constraint(table: str, name: str) -> None:
+    """
+    Check existing rows against a ``NOT VALID`` constraint.
+
+    Validation takes a SHARE UPDATE EXCLUSIVE lock, which allows reads and
+    writes, and runs in its own transaction so the migration's stronger locks
+    are not held during the scan.
+    """
+    with op.get_context().autocommit_block():
+        if _offline():
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+        else:
+            retry_on_lock_timeout(
+                lambda: op.get_bind().exec_driver_sql(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+            )
+
+
+def backfill(
+    table: str,
+    assignments: str,
+    where: str = "true",
+    *,
+    key: str = "id",
+    batch_size: int = settings.MIGRATION_BACKFILL_BATCH_SIZE,
+    pause: float = 0.0,
+) -> int:
+    """
+    Run ``UPDATE table SET assignments WHERE where`` in batches of ``batch_size`` rows, each committed on its own.
+
+    Batches walk ``key`` in order, so every row is visited once and row locks
+    are only held for one batch at a time. ``pause`` seconds between batches
+    give replicas and autovacuum room to keep up. Returns the number of
+    updated rows.
+    """
+    if _offline():
+        op.execute(f"UPDATE {table} SET {assignments} WHERE {where}")
+        return 0
+
+    # The batch's key is renamed so that unqualified columns in ``assignments`` and ``where`` refer to the table
+    batch = (
+        f"WITH batch AS (SELECT {key} AS batch_key FROM {table} {{after}} ORDER BY {key} LIMIT :limit), "
+        f"updated AS (UPDATE {table} SET {assignments} FROM batch "
+        f"WHERE {table}.{key} = batch.batch_key AND ({where}) RETURNING 1) "
+        "SELECT (SELECT batch_key FROM batch ORDER BY batch_key DESC LIMIT 1), (SELECT count(*) FROM updated)"
+    )
+    first_batch = text(batch.format(after=""))
+    next_batch = text(batch.format(after=f"WHERE {key} > :after"))
+
+    total = 0
+    last_key = None
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            if last_key is None:
+                statement, params = first_batch, {"limit": batch_size}
+            else:
+                statement, params = next_batch, {"limit": batch_size, "after": last_key}
+            last_key, updated = retry_on_lock_timeout(lambda: bind.execute(statement, params).one())  # noqa: B023
+            if last_key is None:
+                break
+            total += updated
+            if pause:
+                time.sleep(pause)
+    logger.info("Backfilled %d rows of %s", total, table)
+    return total
@@ -1,20 +1,85 @@
 """Database migration utilities."""
 
+import io
+import re
 from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import create_engine
 
 from alembic import command
 from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
 from backend_core.core.settings import settings
+from backend_core.db.migration_ops import retry_on_lock_timeout
+
+# Lock mode of statements that take no lock on an existing table
+NO_TABLE_LOCK = "NONE"
+
+# Lock each kind of statement takes on its table, most specific patterns first.
+# See https://www.postgresql.org/docs/current/explicit-locking.html
+LOCK_RULES: List[Tuple[re.Pattern[str], str]] = [
+    (re.compile(r"^(create|drop) (unique )?index concurrently"), "SHARE UPDATE EXCLUSIVE"),
+    (re.compile(r"^alter table .* validate constraint"), "SHARE UPDATE EXCLUSIVE"),
+    # Attaching a partition locks the parent, and a foreign key the referenced table, unlike a standalone table
+    (re.compile(r"^create table .* partition of "), "ACCESS EXCLUSIVE"),
+    (re.compile(r"^create table .* references "), "SHARE ROW EXCLUSIVE"),
+    (re.compile(r"^create (unique )?index"), "SHARE"),
+    (re.compile(r"^alter table .* add constraint .* foreign key"), "SHARE ROW EXCLUSIVE"),
+    (re.compile(r"^create (or replace )?(constraint )?trigger"), "SHARE ROW EXCLUSIVE"),
+    (re.compile(r"^refresh materialized view concurrently"), "EXCLUSIVE"),
+    (
+        re.compile(r"^(alter|drop) table|^truncate|^drop index|^drop trigger|^cluster|^vacuum full|^refresh"),
+        "ACCESS EXCLUSIVE",
+    ),
+    (re.compile(r"^(update|delete|insert|merge)"), "ROW EXCLUSIVE"),
+    # Creating an object only locks that object, which nobody else can see yet
+    (
+        re.compile(r"^create (table|extension|type|sequence|(or replace )?function|(materialized )?view)|^set "),
+        NO_TABLE_LOCK,
+    ),
+]
+BLOCKS_READS = {"ACCESS EXCLUSIVE"}
+BLOCKS_WRITES = BLOCKS_READS | {"EXCLUSIVE", "SHARE ROW EXCLUSIVE", "SHARE"}
+
+# Tried in order; all but the last find the locked table of statements that name other objects before it
+TABLE_PATTERNS = [
+    re.compile(r"\bpartition of\s+([\w.\"]+)"),
+    re.compile(r"^create table .*?\breferences\s+([\w.\"]+)"),
+    re.compile(r"^(?:create (?:or replace )?(?:constraint )?|drop )trigger .*?\bon\s+(?:only\s+)?([\w.\"]+)"),
+    re.compile(r"^refresh materialized view (?:concurrently\s+)?([\w.\"]+)"),
+    re.compile(r"(?:\bon|\btable(?: if (?:not )?exists)?|\bupdate|\binto|\bfrom|\btruncate)\s+(?:only\s+)?([\w.\"]+)"),
+]
+
+
+class StatementLock(NamedTuple):
+    """Lock a pending migration statement will take."""
 
+    revision: str
+    statement: str
+    table: Optional[str]
+    lock_mode: Optional[str]
 
-def get_alembic_config() -> Config:
-    """Get Alembic configuration."""
+    @property
+    def blocks_reads(self) -> bool:
+        """Whether queries on the table wait for this statement."""
+        return self.lock_mode in BLOCKS_READS
+
+    @property
+    def blocks_writes(self) -> bool:
+        """Whether writes to the table wait for this statement."""
+        return self.lock_mode in BLOCKS_WRITES
+
+
+def get_alembic_config(output_buffer: Optional[io.StringIO] = None) -> Config:
+    """Get Alembic configuration, optionally writing offline SQL to ``output_buffer``."""
     # Get the directory where this file is located
     current_dir = Path(__file__).resolve().parent
     # Go up two levels to get to the backend_core directory
     backend_core_dir = current_dir.parent.parent
     # Create Alembic configuration
-    alembic_cfg = Config(str(backend_core_dir / "alembic.ini"))
+    alembic_cfg = Config(str(backend_core_dir / "alembic.ini"), output_buffer=output_buffer)
     # Set the script location to the migrations directory
     alembic_cfg.set_main_option("script_location", str(backend_core_dir / "alembic"))
     # Set the sqlalchemy.url
@@ -23,16 +88,120 @@ def get_alembic_config() -> Config:
         f"postgresql://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
         f"@{settings.POSTGRES_SERVER}:{settings.POSTGRES_PORT}/{settings.POSTGRES_DB}",
     )
+    # Keep the application's logging setup rather than the one in alembic.ini
+    alembic_cfg.attributes["configure_logger"] = False
     return alembic_cfg
 
 
 def run_migrations() -> None:
-    """Run database migrations."""
+    """Run database migrations, retrying with backoff when a migration gives up waiting for a lock."""
     alembic_cfg = get_alembic_config()
-    command.upgrade(alembic_cfg, "head")
+    # Each migration commits on its own, so a retry resumes at the one that timed out
+    retry_on_lock_timeout(lambda: command.upgrade(alembic_cfg, "head"))
 
 
 def downgrade_migrations() -> None:
     """Downgrade database migrations."""
     alembic_cfg = get_alembic_config()
     command.downgrade(alembic_cfg, "base")
+
+
+def classify_statement(statement: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the lock mode and table of a SQL statement, or None for each that is not known.
+
+    Statements that lock no existing table, such as a plain ``CREATE TABLE``,
+    have the lock mode ``NO_TABLE_LOCK``.
+    """
+    normalized = " ".join(statement.lower().split())
+    table = None
+    for table_pattern in TABLE_PATTERNS:
+        table_match = table_pattern.search(normalized)
+        if table_match is not None:
+            table = table_match.group(1).strip('"')
+            break
+    for pattern, lock_mode in LOCK_RULES:
+        if pattern.search(normalized):
+            return lock_mode, table
+    return None, table
+
+
+def _split_statements(sql: str) -> List[str]:
+    """Split offline migration SQL into statements, keeping DO blocks and function bodies whole."""
+    statements = []
+    pending = ""
+    for chunk in re.split(r";\s*\n", sql):
+        pending = f"{pending};\n{chunk}" if pending else chunk
+        # An odd number of $$ means the split fell inside a dollar-quoted body
+        if pending.count("$$") % 2:
+            continue
+        lines = [line for line in pending.splitlines() if line.strip() and not line.lstrip().startswith("--")]
+        statement = "\n".join(lines).strip()
+        if statement:
+            statements.append(statement)
+        pending = ""
+    return statements
+
+
+def _nested_statements(statement: str) -> List[str]:
+    """Return the statements inside a DO block, or the statement itself."""
+    body = re.match(r"(?is)^do \$\$\s*begin(.*)end\s*\$\$", statement)
+    if body is None:
+        return [statement]
+    inner = re.sub(r"(?is)\bif\b.*?\bthen\b|\bend if\b", ";", body.group(1))
+    return [part.strip() for part in inner.split(";") if part.strip()]
+
+
+def check_pending_migrations() -> List[StatementLock]:
+    """
+    Report the lock each statement of the pending migrations will take, without running them.
+
+    Pending migrations are rendered as offline SQL, one revision at a time,
+    and each statement is classified by the table lock Postgres takes for it.
+    """
+    engine = create_engine(get_alembic_config().get_main_option("sqlalchemy.url") or "")
+    try:
+        with engine.connect() as connection:
+            current = MigrationContext.configure(connection).get_current_revision()
+    finally:
+        engine.dispose()
+
+    script = ScriptDirectory.from_config(get_alembic_config())
+    pending = list(reversed(list(script.iterate_revisions("heads", current or "base"))))
+    report = []
+    for revision in pending:
+        if revision.revision == current:
+            continue
+        buffer = io.StringIO()
+        start = revision.down_revision or "base"
+        command.upgrade(get_alembic_config(buffer), f"{start}:{revision.revision}", sql=True)
+        for statement in _split_statements(buffer.getvalue()):
+            if statement.lower() in ("begin", "commit") or "alembic_version" in statement.lower():
+                continue
+            for nested in _nested_statements(statement):
+                lock_mode, table = classify_statement(nested)
+                report.append(StatementLock(revision.revision, nested, table, lock_mode))
+    return report
+
+
+def format_report(report: List[StatementLock]) -> str:
+    """Format a pre-flight report, marking statements that block reads or writes."""
+    if not report:
+        return "No pending migrations."
+    lines = []
+    for lock in report:
+        if lock.lock_mode is None:
+            impact = "unknown"
+        elif lock.blocks_reads:
+            impact = "blocks reads and writes"
+        elif lock.blocks_writes:
+            impact = "blocks writes"
+        else:
+            impact = "ok"
+        first_line = lock.statement.splitlines()[0][:100]
+        lines.append(f"{lock.revision}  {lock.lock_mode or '-':<22} {lock.table or '-':<16} {impact:<24} {first_line}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_report(check_pending_migrations()))
@@ -0,0 +1,216 @@
+# backend_core/db/query_plans.py
+"""
+Plan regression checks for the hot queries.
+
+Each statement in ``HOT_STATEMENTS`` is run under ``EXPLAIN (ANALYZE, BUFFERS,
+FORMAT JSON)`` against a seeded dataset, and its plan is summarized as a
+tree of node types with the tables and indexes they use. A plan fails the
+check when it scans a table sequentially where it should use an index,
+spills to temporary files, changes shape from the stored baseline, or is
+estimated to cost more than ``COST_TOLERANCE`` times the baseline.
+
+Run ``python -m backend_core.db.query_plans`` to check the plans, or with
+``--update`` to accept the current plans as the new baseline. The dataset is
+seeded in a transaction that is rolled back, so the database is left as found.
+"""
+
+import json
+import sys
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import event, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from backend_core.db.session import SessionLocal
+from backend_core.db.utils import CRUDBase
+from backend_core.models.user import User
+from backend_core.schemas.user import UserCreate, UserUpdate
+
+BASELINE_PATH = Path(__file__).with_name("query_plans.json")
+
+# Users seeded for the check; ANALYZE samples all of them, so estimates are stable
+SEED_USERS = 20_000
+
+# How far the estimated cost of a plan may rise above its baseline
+COST_TOLERANCE = 1.25
+
+crud_user = CRUDBase[User, UserCreate, UserUpdate](User)
+
+
+class Dataset(NamedTuple):
+    """Keys of seeded rows that hot statements look up."""
+
+    email: str
+    ids: List[uuid.UUID]
+
+
+class HotStatement(NamedTuple):
+    """A query on a hot path, built the way its call site builds it."""
+
+    name: str
+    build: Callable[[Dataset], Select[Any]]
+    # Statements without a predicate, such as an unordered page, may read a table sequentially
+    seq_scan_allowed: bool = False
+
+
+HOT_STATEMENTS = (
+    # auth.login, and deps.get_user_by_email for tokens issued with an email subject
+    HotStatement("user_by_email", lambda data: select(User).where(User.email == data.email).limit(1)),
+    # Session.get(User, id) in deps.get_user, which resolves access tokens
+    HotStatement("user_by_id", lambda data: select(User).where(User.id == data.ids[0])),
+    HotStatement("get_many", lambda data: crud_user._select_by_ids(select(User), data.ids)),
+    HotStatement("read_many", lambda data: crud_user._select_by_ids(crud_user._select_records(), data.ids)),
+    HotStatement("get_multi", lambda data: select(User).offset(100).limit(100), seq_scan_allowed=True),
+    HotStatement("read_multi", lambda data: crud_user._select_records().order_by(User.id).offset(100).limit(100)),
+)
+
+
+class PlanSummary(NamedTuple):
+    """The parts of a plan the check compares."""
+
+    shape: List[str]
+    cost: float
+    seq_scans: List[str]
+    temp_blocks: int
+
+
+def seed(db: Session, count: int = SEED_USERS) -> Dataset:
+    """
+    Fill a fresh copy of the users table with ``count`` users and analyze it, returning keys to look up.
+
+    The copy is a temporary table with the same columns and indexes, which
+    hides the real one for the rest of the transaction. Unlike the real
+    table it holds no dead rows from earlier runs, so estimates are the same
+    from run to run. Its indexes are named by Postgres, so ``ix_users_email``
+    appears in plans as ``users_email_idx``.
+    """
+    db.execute(text("CREATE TEMPORARY TABLE users (LIKE public.users INCLUDING ALL) ON COMMIT DROP"))
+    db.execute(
+        text(
+            "INSERT INTO users (id, email, hashed_password, first_name, last_name, is_active, is_superuser, "
+            "created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'plan' || i || '@example.com', repeat('x', 60), 'First' || i, 'Last' || i, "
+            "i % 10 <> 0, i % 1000 = 0, now() - i * interval '1 minute', now() FROM generate_series(1, :count) AS i"
+        ),
+        {"count": count},
+    )
+    db.execute(text("ANALYZE users"))
+    ids = list(db.scalars(select(User.id).order_by(User.email).limit(100)))
+    return Dataset(email=f"plan{count // 2}@example.com", ids=ids)
+
+
+def explain(db: Session, statement: Select[Any]) -> Dict[str, Any]:
+    """
+    Run a statement under ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` and return its plan.
+
+    The statement is run once first to capture the SQL and parameters the
+    driver receives, so the plan is that of the query the application sends.
+    """
+    connection = db.connection()
+    sent: List[Any] = []
+
+    def capture(conn: Any, cursor: Any, sql: str, parameters: Any, context: Any, executemany: bool) -> None:
+        sent.append((sql, parameters))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        connection.execute(statement).all()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    sql, parameters = sent[-1]
+    plan: List[Dict[str, Any]] = connection.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", parameters
+    ).scalar_one()
+    root: Dict[str, Any] = plan[0]["Plan"]
+    return root
+
+
+def summarize(plan: Dict[str, Any]) -> PlanSummary:
+    """Reduce a JSON plan to its shape, estimated cost, sequential scans and temporary file use."""
+    shape: List[str] = []
+    seq_scans: List[str] = []
+    temp_blocks = 0
+
+    def visit(node: Dict[str, Any], depth: int) -> None:
+        nonlocal temp_blocks
+        label = node["Node Type"]
+        if "Relation Name" in node:
+            label += f" on {node['Relation Name']}"
+        if "Index Name" in node:
+            label += f" using {node['Index Name']}"
+        shape.append("  " * depth + label)
+        if node["Node Type"] == "Seq Scan":
+            seq_scans.append(node["Relation Name"])
+        # Sorts, hashes and materializations that outgrow work_mem write temporary blocks
+        temp_blocks += node.get("Temp Written Blocks", 0)
+        for child in node.get("Plans", []):
+            visit(child, depth + 1)
+
+    visit(plan, 0)
+    return PlanSummary(shape=shape, cost=plan["Total Cost"], seq_scans=seq_scans, temp_blocks=temp_blocks)
+
+
+def capture_plans(db: Session, data: Dataset) -> Dict[str, PlanSummary]:
+    """Summarize the plan of every hot statement."""
+    return {hot.name: summarize(explain(db, hot.build(data))) for hot in HOT_STATEMENTS}
+
+
+def find_regressions(
+    plans: Dict[str, PlanSummary], baseline: Dict[str, Any], *, cost_tolerance: float = COST_TOLERANCE
+) -> List[str]:
+    """Return a description of every way the plans fall short of the rules and the baseline."""
+    allowed_seq_scans = {hot.name for hot in HOT_STATEMENTS if hot.seq_scan_allowed}
+    problems = []
+    for name, plan in plans.items():
+        if plan.seq_scans and name not in allowed_seq_scans:
+            problems.append(f"{name}: sequential scan on {', '.join(plan.seq_scans)}")
+        if plan.temp_blocks:
+            problems.append(f"{name}: spilled {plan.temp_blocks} blocks to temporary files")
+        expected = baseline.get(name)
+        if expected is None:
+            problems.append(f"{name}: no baseline; run with --update to record one")
+            continue
+        if plan.shape != expected["shape"]:
+            problems.append(
+                f"{name}: plan changed shape\n  was:\n    "
+                + "\n    ".join(expected["shape"])
+                + "\n  now:\n    "
+                + "\n    ".join(plan.shape)
+            )
+        if plan.cost > expected["cost"] * cost_tolerance:
+            problems.append(f"{name}: estimated cost {plan.cost:.2f} is above the baseline {expected['cost']:.2f}")
+    return problems
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Any]:
+    """Read the stored plan baseline, or an empty one."""
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_baseline(plans: Dict[str, PlanSummary], path: Path = BASELINE_PATH) -> None:
+    """Store the shape and cost of each plan as the baseline."""
+    baseline = {name: {"shape": plan.shape, "cost": plan.cost} for name, plan in sorted(plans.items())}
+    path.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+def check_query_plans(update: bool = False, session_factory: Optional[Callable[[], Session]] = None) -> List[str]:
+    """Seed the dataset, capture the hot plans, roll back, and return the regressions found."""
+    db = (session_factory or SessionLocal)()
+    try:
+        plans = capture_plans(db, seed(db))
+    finally:
+        db.rollback()
+        db.close()
+    if update:
+        save_baseline(plans)
+        return []
+    return find_regressions(plans, load_baseline())
+
+
+if __name__ == "__main__":
+    regressions = check_query_plans(update="--update" in sys.argv[1:])
+    print("\n".join(regressions) or "Query plans match the baseline.")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,178 @@
+# backend_core/db/search.py
+"""Ranked, keyset-paginated user search over email and names."""
+
+import base64
+import uuid
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+import orjson
+from sqlalchemy import Float, Select, cast, func, literal, or_, select, text, tuple_, union_all
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.sql.elements import ColumnElement
+
+from backend_core.db.utils import column_keys
+from backend_core.models.user import User
+
+# Ranks of a match, best first in results
+RANK_EXACT_EMAIL = 4
+RANK_EMAIL_PREFIX = 3
+RANK_FIRST_NAME_PREFIX = 2
+RANK_LAST_NAME_PREFIX = 1
+RANK_FUZZY = 0
+
+# Trigram matching is meaningless for shorter queries
+FUZZY_MIN_LENGTH = 3
+
+# Whether pg_trgm is installed, looked up once per process
+_trigram_available: Optional[bool] = None
+
+# These expressions match the indexes created by the add_user_search_indexes migration. The
+# "C" collation makes LIKE 'prefix%' indexable and lets the same index return rows in order.
+email_key = func.lower(User.email).collate("C")
+first_name_key = func.lower(User.first_name).collate("C")
+last_name_key = func.lower(User.last_name).collate("C")
+email_trigrams = func.lower(User.email)
+full_name_trigrams = func.lower(func.coalesce(User.first_name, "") + " " + func.coalesce(User.last_name, ""))
+
+
+class SearchKey(NamedTuple):
+    """Sort key of a search result, used as the keyset pagination cursor."""
+
+    rank: int
+    text: str
+    score: float
+    id: uuid.UUID
+
+
+def encode_cursor(key: SearchKey) -> str:
+    """Encode a sort key as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(orjson.dumps([key.rank, key.text, key.score, str(key.id)])).decode()
+
+
+def decode_cursor(cursor: str) -> SearchKey:
+    """Decode a cursor made by ``encode_cursor``, raising ValueError if it is malformed."""
+    try:
+        rank, key_text, score, id = orjson.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return SearchKey(int(rank), str(key_text), float(score), uuid.UUID(id))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def trigram_search_available(db: Session) -> bool:
+    """Return whether the pg_trgm extension is installed."""
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = (
+            db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
+        )
+    return _trigram_available
+
+
+def _like_prefix(query: str) -> str:
+    """Return a LIKE pattern matching strings that start with ``query`` literally."""
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
+
+def _tier(
+    rank: int,
+    match: ColumnElement[bool],
+    limit: int,
+    after: Optional[SearchKey],
+    *,
+    key: ColumnElement[str],
+    score: Optional[ColumnElement[float]] = None,
+) -> Optional[Select]:
+    """
+    Select at most ``limit`` matches of one rank in result order, or None if the cursor is past this rank.
+
+    Prefix tiers sort by their indexed ``key``, so each is a single ordered
+    index scan that stops after ``limit`` rows however many users match. The
+    fuzzy tier sorts by its trigram ``score`` instead.
+    """
+    if after is not None and after.rank < rank:
+        return None
+    order: ColumnElement[Any] = key if score is None else -score
+    statement = select(
+        User.id,
+        literal(rank).label("rank"),
+        key.label("key"),
+        cast(score if score is not None else literal(0.0), Float).label("score"),
+    ).where(match)
+    if after is not None and after.rank == rank:
+        position = after.text if score is None else -after.score
+        statement = statement.where(tuple_(order, User.id) > tuple_(literal(position), literal(after.id)))
+    return statement.order_by(order, User.id).limit(limit)
+
+
+def search_statement(db: Session, query: str, *, limit: int, after: Optional[SearchKey] = None) -> Optional[Select]:
+    """
+    Build the statement selecting users whose email or names start with ``query``, or resemble it.
+
+    Matches are ranked exact email, email prefix, first name prefix, last
+    name prefix, then fuzzy, and each user appears once, in its best rank.
+    Within a rank, prefix matches are ordered by the matched value and fuzzy
+    matches by trigram word similarity, then by ID. Fuzzy matching uses the
+    trigram indexes and only runs when pg_trgm is installed and the query has
+    at least ``FUZZY_MIN_LENGTH`` characters. Results resume strictly after
+    ``after``; None is returned when the cursor is past every rank.
+    """
+    query = query.strip().lower()
+    prefix = _like_prefix(query)
+    email_prefix = email_key.like(prefix)
+    first_name_prefix = first_name_key.like(prefix)
+    last_name_prefix = last_name_key.like(prefix)
+
+    # A user only appears in its best tier; "IS NOT TRUE" also holds for NULL names
+    tiers = [
+        _tier(RANK_EXACT_EMAIL, email_key == query, limit, after, key=email_key),
+        _tier(RANK_EMAIL_PREFIX, email_prefix & (email_key != query), limit, after, key=email_key),
+        _tier(RANK_FIRST_NAME_PREFIX, first_name_prefix & email_prefix.is_not(True), limit, after, key=first_name_key),
+        _tier(
+            RANK_LAST_NAME_PREFIX,
+            last_name_prefix & email_prefix.is_not(True) & first_name_prefix.is_not(True),
+            limit,
+            after,
+            key=last_name_key,
+        ),
+    ]
+    if len(query) >= FUZZY_MIN_LENGTH and trigram_search_available(db):
+        # column %> query is word_similarity(query, column) above pg_trgm.word_similarity_threshold,
+        # written with the indexed expression on the left so the GIN indexes apply
+        fuzzy = or_(email_trigrams.op("%>")(query), full_name_trigrams.op("%>")(query))
+        unmatched = email_prefix.is_not(True) & first_name_prefix.is_not(True) & last_name_prefix.is_not(True)
+        # Cast from real so the score survives a round trip through the cursor exactly
+        similarity = cast(
+            func.greatest(func.word_similarity(query, email_trigrams), func.word_similarity(query, full_name_trigrams)),
+            Float,
+        )
+        no_key = literal("").collate("C")
+        tiers.append(_tier(RANK_FUZZY, fuzzy & unmatched, limit, after, key=no_key, score=similarity))
+
+    selected = [tier for tier in tiers if tier is not None]
+    if not selected:
+        return None
+    # Each tier is limited and ordered on its own, so combining them sorts at most a few pages of rows
+    matches = union_all(*[tier.subquery().select() for tier in selected]).subquery("matches")
+    return (
+        select(User, matches.c.rank, matches.c.key, matches.c.score)
+        .join(matches, User.id == matches.c.id)
+        .order_by(matches.c.rank.desc(), matches.c.key.collate("C"), matches.c.score.desc(), User.id)
+        .limit(limit)
+    )
+
+
+def search_users(
+    db: Session, query: str, *, limit: int, after: Optional[SearchKey] = None, keys: Optional[Sequence[str]] = None
+) -> List[Tuple[User, SearchKey]]:
+    """
+    Find users whose email or names start with ``query``, or resemble it; see ``search_statement``.
+
+    Only the primary key and the columns for ``keys`` are loaded when given.
+    """
+    statement = search_statement(db, query, limit=limit, after=after)
+    if statement is None:
+        return []
+    if keys is not None:
+        statement = statement.options(load_only(*(getattr(User, key) for key in column_keys(User, keys))))
+    return [(user, SearchKey(rank, key, score, user.id)) for user, rank, key, score in db.execute(statement)]
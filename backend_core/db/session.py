@@ -5,24 +5,53 @@ from typing import Generator
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from backend_core.core.circuit_breaker import CircuitProbe, db_breaker, guard_engine, ping
 from backend_core.core.settings import settings
+from backend_core.core.tracing import start_span, trace_engine
 
 # Create database engine
-engine = create_engine(str(settings.DATABASE_URL), pool_pre_ping=True, pool_size=5, max_overflow=10)
+engine = create_engine(
+    str(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    connect_args={"connect_timeout": settings.DB_CONNECT_TIMEOUT_SECONDS},
+)
+
+# Fail fast instead of waiting on connect and pool timeouts while the database is down
+guard_engine(engine, db_breaker)
+db_circuit_probe = CircuitProbe(db_breaker, lambda: ping(engine))
+
+# Time statements run for traced requests
+trace_engine(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def pool_saturation() -> float:
+    """Return the fraction of the pool's connections, overflow included, that are checked out."""
+    checked_out: int = engine.pool.checkedout()  # type: ignore[attr-defined]
+    return checked_out / (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+
+
 def get_db() -> Generator:
     """
     Dependency function to get a database session.
 
+    Raises ``DatabaseUnavailable`` at once while the database circuit is open.
+
     Yields:
         Session: SQLAlchemy session
     """
+    db_breaker.check()
+    # Opened and closed in different threadpool calls, so not made the current span
+    session_span = start_span("db.session")
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+        if session_span is not None:
+            session_span.end()
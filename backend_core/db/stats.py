@@ -0,0 +1,138 @@
+# backend_core/db/stats.py
+"""User statistics served from materialized views refreshed in the background."""
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend_core.core.settings import settings
+from backend_core.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Created by the add_user_stats_views migration
+STATS_VIEWS = ("user_stats_totals", "user_signups_daily")
+
+# Advisory lock key that lets one worker at a time refresh the views
+REFRESH_LOCK_KEY = 0x75736572_73746174  # "userstat"
+
+
+def refresh_stats_views(db: Session) -> bool:
+    """
+    Refresh the statistics views unless another session is already doing so.
+
+    ``CONCURRENTLY`` recomputes each view beside the old contents and applies
+    the difference, so readers are never blocked. Returns whether the views
+    were refreshed; the caller commits.
+    """
+    if not db.execute(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": REFRESH_LOCK_KEY}).scalar():
+        return False
+    for view in STATS_VIEWS:
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+    return True
+
+
+def approximate_count(db: Session, table: str) -> Optional[int]:
+    """
+    Return the planner's row estimate for a table, or None if it has never been analyzed.
+
+    ``pg_class.reltuples`` is kept up to date by autovacuum and ANALYZE, so
+    reading it costs nothing however large the table is.
+    """
+    estimate = db.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ).scalar()
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+def user_stats(db: Session, *, days: int, weeks: int) -> Dict[str, Any]:
+    """Read user counts and signups for the last ``days`` days and ``weeks`` ISO weeks, UTC."""
+    totals = db.execute(text("SELECT total, active, superusers, refreshed_at FROM user_stats_totals")).one()
+    today = datetime.now(timezone.utc).date()
+    first_week = today - timedelta(days=today.weekday(), weeks=weeks - 1)
+    daily = db.execute(
+        text("SELECT day, signups FROM user_signups_daily WHERE day > :since ORDER BY day"),
+        {"since": today - timedelta(days=days)},
+    ).all()
+    weekly = db.execute(
+        text(
+            "SELECT date_trunc('week', day)::date AS week, sum(signups)::bigint FROM user_signups_daily "
+            "WHERE day >= :since GROUP BY 1 ORDER BY 1"
+        ),
+        {"since": first_week},
+    ).all()
+    return {
+        "total": totals.total,
+        "active": totals.active,
+        "superusers": totals.superusers,
+        "approximate_total": approximate_count(db, "users"),
+        "refreshed_at": totals.refreshed_at,
+        "signups_per_day": _signups(daily),
+        "signups_per_week": _signups(weekly),
+    }
+
+
+def _signups(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Return (period, signups) rows as dicts."""
+    return [{"period": period, "signups": signups} for period, signups in rows]
+
+
+class StatsRefresher:
+    """Refresh the statistics views every ``interval`` seconds from a background thread."""
+
+    name = "stats-refresher"
+
+    def __init__(
+        self,
+        *,
+        interval: float = settings.USER_STATS_REFRESH_INTERVAL_SECONDS,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        """Initialize a stopped refresher."""
+        self.interval = interval
+        self._session_factory = session_factory
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def refresh(self) -> bool:
+        """Refresh the views now, returning whether this worker did so."""
+        db = self._session_factory()
+        try:
+            refreshed = refresh_stats_views(db)
+            db.commit()
+            return refreshed
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _run(self) -> None:
+        """Refresh periodically until stopped."""
+        while not self._stopping.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("%s refresh failed; will retry", self.name)
+
+    def start(self) -> None:
+        """Start the background refresher if it is not running."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresher."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+
+
+stats_refresher = StatsRefresher()
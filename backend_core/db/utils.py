@@ -1,23 +1,94 @@
 # backend_core/db/utils.py
 """Database utilities."""
 
+import logging
 import uuid
+from collections import namedtuple
 from datetime import datetime, timezone
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from functools import lru_cache
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy import Select, any_, bindparam, inspect, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
 
 from backend_core.core.security import get_password_hash
+from backend_core.core.singleflight import SingleFlight
 from backend_core.db.base_class import Base
 from backend_core.db.migrations import run_migrations
 from backend_core.db.session import SessionLocal
 
+logger = logging.getLogger(__name__)
+
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+SelectType = TypeVar("SelectType", bound=Select[Any])
+
+# Coalesces concurrent primary-key lookups of the same row across sessions
+row_lookups: SingleFlight[Any] = SingleFlight()
+
+
+def column_keys(model: Type[Base], keys: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+    """
+    Return the keys of the columns to load for ``keys``, in mapper order.
+
+    The primary key is always included. Without ``keys``, every column that
+    is not deferred is.
+    """
+    mapper = inspect(model)
+    primary_keys = {mapper.get_property_by_column(column).key for column in mapper.primary_key}
+    return tuple(
+        attr.key
+        for attr in mapper.column_attrs
+        if attr.key in primary_keys or (not attr.deferred if keys is None else attr.key in keys)
+    )
+
+
+def detached_copy(obj: ModelType) -> ModelType:
+    """
+    Copy the loaded column state of an instance into a new detached instance.
+
+    The copy can be handed to other sessions with ``attach`` while the original
+    stays private to the session that loaded it. Deferred columns the original
+    has not loaded are left unloaded in the copy rather than loaded for it.
+    """
+    state = inspect(obj)
+    unloaded = state.unloaded
+    copy: ModelType = state.mapper.class_manager.new_instance()  # type: ignore[assignment]
+    for attr in state.mapper.column_attrs:
+        if not (attr.deferred and attr.key in unloaded):
+            set_committed_value(copy, attr.key, getattr(obj, attr.key))
+    make_transient_to_detached(copy)
+    return copy
+
+
+def record_type(model: Type[Base], keys: Optional[Sequence[str]] = None) -> Type[Any]:
+    """
+    Return the immutable record class for the columns ``column_keys`` selects from a model.
+
+    Records are named tuples, so they have no per-instance ``__dict__``, are
+    not tracked by any session, and expose columns as attributes for
+    ``core.responses.serialize`` and pydantic's ``from_attributes``.
+    """
+    return _record_type(model, column_keys(model, keys))
+
+
+@lru_cache(maxsize=None)
+def _record_type(model: Type[Base], keys: Tuple[str, ...]) -> Type[Any]:
+    """Build the record class for a model and column keys, once per combination."""
+    return namedtuple(f"{model.__name__}Record", keys)  # type: ignore[misc]
+
+
+def attach(db: Session, obj: Optional[ModelType]) -> Optional[ModelType]:
+    """Merge a detached copy into a session without emitting SQL."""
+    if obj is None:
+        return None
+    return db.merge(obj, load=False)
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
@@ -28,13 +99,80 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.model = model
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        """Get a record by ID."""
-        return db.get(self.model, id)
+        """Get a record by ID, sharing the database fetch with concurrent lookups of the same row."""
+        if identity_key(self.model, id) in db.identity_map:
+            return db.get(self.model, id)
+
+        def fetch() -> Optional[ModelType]:
+            obj = db.get(self.model, id)
+            return detached_copy(obj) if obj is not None else None
+
+        return attach(db, row_lookups.do((self.model, id), fetch))
+
+    def get_many(self, db: Session, ids: Sequence[Any]) -> List[Optional[ModelType]]:
+        """
+        Get records by ID in one round trip, in the order of ``ids``, with None for missing IDs.
+
+        Rows already in the session's identity map are reused; the rest are
+        loaded with a single ``WHERE id = ANY(:ids)`` query.
+        """
+        found: Dict[Any, ModelType] = {}
+        to_load = []
+        for id in dict.fromkeys(ids):
+            obj = db.identity_map.get(identity_key(self.model, id))
+            if obj is not None:
+                found[id] = obj
+            else:
+                to_load.append(id)
+        if to_load:
+            for obj in db.scalars(self._select_by_ids(select(self.model), to_load)):
+                found[obj.id] = obj
+        return [found.get(id) for id in ids]
 
     def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
         """Get multiple records."""
         return db.query(self.model).offset(skip).limit(limit).all()
 
+    def _select_by_ids(self, statement: SelectType, ids: Sequence[Any]) -> SelectType:
+        """Restrict a statement to rows whose primary key is in ``ids``."""
+        primary_key = inspect(self.model).primary_key[0]
+        # Unlike an expanding IN list, one array parameter keeps the SQL text the same for any number of IDs
+        ids_param = bindparam("ids", list(ids), type_=ARRAY(primary_key.type))
+        return statement.where(primary_key == any_(ids_param))
+
+    def _select_records(self, keys: Optional[Tuple[str, ...]] = None) -> Select[Any]:
+        """Select the model's columns chosen by ``column_keys``, labelled with their attribute keys."""
+        mapper = inspect(self.model)
+        return select(*(mapper.column_attrs[key].columns[0].label(key) for key in column_keys(self.model, keys)))
+
+    def _fetch_records(self, db: Session, statement: Select[Any], keys: Optional[Tuple[str, ...]] = None) -> List[Any]:
+        """Run a Core statement selecting the columns for ``keys`` and wrap each row in a record."""
+        make = record_type(self.model, keys)._make
+        return [make(row) for row in db.connection().execute(statement)]
+
+    def read_many(
+        self, db: Session, ids: Sequence[Any], *, keys: Optional[Tuple[str, ...]] = None
+    ) -> List[Optional[Any]]:
+        """
+        Read-only ``get_many`` returning records instead of ORM instances.
+
+        The query runs on the session's connection, so rows skip the identity
+        map and attribute instrumentation. Pending changes in the session are
+        not flushed first. Records hold the primary key and the columns for
+        ``keys``, or every column that is not deferred.
+        """
+        statement = self._select_by_ids(self._select_records(keys), list(dict.fromkeys(ids)))
+        found = {record.id: record for record in self._fetch_records(db, statement, keys)}
+        return [found.get(id) for id in ids]
+
+    def read_multi(
+        self, db: Session, *, skip: int = 0, limit: int = 100, keys: Optional[Tuple[str, ...]] = None
+    ) -> List[Any]:
+        """Read-only ``get_multi`` returning records instead of ORM instances, ordered by primary key."""
+        primary_key = inspect(self.model).primary_key[0]
+        statement = self._select_records(keys).order_by(primary_key).offset(skip).limit(limit)
+        return self._fetch_records(db, statement, keys)
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """Create a new record."""
         obj_in_data = jsonable_encoder(obj_in)
@@ -53,7 +191,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     def update(self, db: Session, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> ModelType:
         """Update a record."""
-        obj_data = jsonable_encoder(db_obj)
+        # Column keys rather than loaded attributes, so deferred columns can be updated without loading them
+        columns = {attr.key for attr in inspect(db_obj).mapper.column_attrs}
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
@@ -62,7 +201,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             hashed_password = get_password_hash(update_data.pop("password"))
             update_data["hashed_password"] = hashed_password
 
-        for field in obj_data:
+        for field in columns:
             if field in update_data:
                 setattr(db_obj, field, update_data[field])
         db_obj.updated_at = datetime.now(timezone.utc)
@@ -95,8 +234,8 @@ def verify_database() -> bool:
         # Run migrations
         run_migrations()
         return True
-    except Exception as e:
-        print(f"Database verification failed: {e}")
+    except Exception:
+        logger.exception("Database verification failed")
         return False
     finally:
         db.close()
@@ -0,0 +1,117 @@
+# backend_core/db/write_behind.py
+"""Write-behind buffering of database writes."""
+
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Generic, Optional, TypeVar
+
+from sqlalchemy.orm import Session
+
+from backend_core.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+BatchType = TypeVar("BatchType")
+
+
+class WriteBehindBuffer(ABC, Generic[BatchType]):
+    """
+    Buffer writes in process and apply them in batches from a background thread.
+
+    Subclasses own the pending data structure and decide how additions are
+    coalesced. The flusher wakes every ``flush_interval`` seconds, or as soon as
+    ``max_size`` pending entries accumulate, and ``stop`` flushes whatever is
+    left so a clean shutdown loses nothing.
+    """
+
+    name = "write-behind"
+
+    def __init__(
+        self,
+        *,
+        flush_interval: float,
+        max_size: int,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        """Initialize an empty, stopped buffer."""
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def _drain(self) -> Optional[BatchType]:
+        """Remove and return everything pending, or None if nothing is. Called with the lock held."""
+
+    @abstractmethod
+    def _restore(self, batch: BatchType) -> None:
+        """Put back a batch that failed to write. Called with the lock held."""
+
+    @abstractmethod
+    def _write(self, db: Session, batch: BatchType) -> None:
+        """Apply a batch within the given session; the caller commits."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of pending entries."""
+
+    def _added(self) -> None:
+        """Wake the flusher early once the buffer is full. Subclasses call this after adding."""
+        if len(self) >= self.max_size:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """Write all pending entries now and return how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                size = len(self)
+                batch = self._drain()
+            if batch is None:
+                return 0
+            db = self._session_factory()
+            try:
+                self._write(db, batch)
+                db.commit()
+            except Exception:
+                db.rollback()
+                with self._lock:
+                    self._restore(batch)
+                raise
+            finally:
+                db.close()
+            return size
+
+    def _run(self) -> None:
+        """Flush periodically until stopped."""
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("%s flush failed; will retry", self.name)
+
+    def start(self) -> None:
+        """Start the background flusher if it is not running."""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background flusher and flush what is left."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._wakeup.set()
+            self._thread.join()
+            self._thread = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("%s final flush failed", self.name)
@@ -1,15 +1,95 @@
 # backend_core/main.py
-from fastapi import FastAPI
+import atexit
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.exc import OperationalError
 
 from backend_core.api.v1.api import api_router
+from backend_core.core.circuit_breaker import (
+    CircuitState,
+    DatabaseUnavailable,
+    database_unavailable_handler,
+    db_breaker,
+)
+from backend_core.core.deadlines import DeadlineExceeded, database_timeout_handler, deadline_exceeded_handler
+from backend_core.core.idempotency import IdempotencyMiddleware
+from backend_core.core.load_shedding import LoadSheddingMiddleware
+from backend_core.core.logs import RequestContextMiddleware, log_writer
+from backend_core.core.memory import memory_sampler
+from backend_core.core.metrics import registry
+from backend_core.core.request_metrics import RequestMetricsMiddleware
+from backend_core.core.responses import ORJSONResponse
 from backend_core.core.settings import settings
+from backend_core.core.tracing import TracingMiddleware, span_exporter
+from backend_core.core.warmup import warm_up
+from backend_core.db.activity import activity_tracker
+from backend_core.db.audit import audit_log
+from backend_core.db.bulk import bulk_job_runner
+from backend_core.db.idempotency import idempotency_key_purger
+from backend_core.db.invalidation import invalidation_listener
+from backend_core.db.session import db_circuit_probe
+from backend_core.db.stats import stats_refresher
 from backend_core.db.utils import verify_database
 
+# Write logs as JSON lines from a background thread, flushed on exit
+log_writer.start()
+atexit.register(log_writer.stop)
+
 # Ensure database is ready and up to date
 verify_database()
 
-app = FastAPI(title=settings.PROJECT_NAME, version=settings.VERSION, openapi_url=f"{settings.API_V1_STR}/openapi.json")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm up, then run background workers for the lifetime of the application."""
+    db_circuit_probe.start()
+    memory_sampler.start()
+    span_exporter.start()
+    invalidation_listener.start()
+    activity_tracker.start()
+    audit_log.start()
+    stats_refresher.start()
+    bulk_job_runner.start()
+    idempotency_key_purger.start()
+    try:
+        # A failed warm-up leaves the worker up but not ready, and is retried in the background
+        if not await run_in_threadpool(warm_up.attempt):
+            warm_up.start()
+        yield
+    finally:
+        warm_up.stop()
+        # A job interrupted here is handed back and resumed by the next runner
+        bulk_job_runner.stop()
+        idempotency_key_purger.stop()
+        stats_refresher.stop()
+        # Flush buffered writes so a clean shutdown loses nothing
+        audit_log.stop()
+        activity_tracker.stop()
+        invalidation_listener.stop()
+        db_circuit_probe.stop()
+        memory_sampler.stop()
+        span_exporter.stop()
+
+
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    version=settings.VERSION,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+# Innermost, so that requests are admitted before they wait for a duplicate to finish
+app.add_middleware(IdempotencyMiddleware)
+
+# Shed load before it piles up on the database pool; added before CORS so that
+# CORS wraps it and 503 responses still carry CORS headers
+app.add_middleware(LoadSheddingMiddleware)
 
 # Set up CORS
 app.add_middleware(
@@ -20,6 +100,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Map spent latency budgets, Postgres timeouts and an open database circuit to 503/504
+app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
+app.add_exception_handler(OperationalError, database_timeout_handler)
+app.add_exception_handler(DatabaseUnavailable, database_unavailable_handler)
+
+# Outermost, so that shed requests and CORS preflights are counted and timed too
+app.add_middleware(RequestMetricsMiddleware)
+
+# Around everything else, so that every record logged while serving a request carries its context
+app.add_middleware(RequestContextMiddleware)
+
+# Outermost of all, so that the request's span covers everything done for it
+app.add_middleware(TracingMiddleware, exporter=span_exporter)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -35,3 +129,25 @@ def health_check() -> dict[str, str]:
     """Health check endpoint."""
     db_status = "healthy" if verify_database() else "unhealthy"
     return {"status": "ok", "database": db_status, "version": settings.VERSION}
+
+
+@app.get("/ready")
+def readiness_check(response: Response) -> dict[str, object]:
+    """
+    Readiness endpoint.
+
+    Reports 503 until the startup warm-up has finished, and while the database is unavailable.
+    """
+    if not warm_up.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "warming_up"}
+    if db_breaker.state != CircuitState.CLOSED:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "database_unavailable"}
+    return {"status": "ready", "warmup_seconds": warm_up.seconds}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> str:
+    """Metrics endpoint in the Prometheus text format."""
+    return registry.render()
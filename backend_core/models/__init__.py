@@ -1,5 +1,8 @@
 """SQLAlchemy models."""
 
+from backend_core.models.audit import auth_events
+from backend_core.models.bulk_job import BulkJob
+from backend_core.models.idempotency_key import IdempotencyKey
 from backend_core.models.user import User
 
-__all__ = ["User"]
+__all__ = ["BulkJob", "IdempotencyKey", "User", "auth_events"]
@@ -0,0 +1,25 @@
+# backend_core/models/audit.py
+from sqlalchemy import Column, DateTime, Index, PrimaryKeyConstraint, String, Table
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from backend_core.db.base_class import Base
+
+# Append-only log of authentication events, range-partitioned by month on
+# occurred_at. Rows are only ever bulk-inserted through Core, so this is a plain
+# table rather than a mapped class. Partitions are named auth_events_YYYY_MM.
+auth_events = Table(
+    "auth_events",
+    Base.metadata,
+    Column("id", UUID(as_uuid=True), nullable=False),
+    Column("occurred_at", DateTime(timezone=True), nullable=False),
+    Column("event_type", String, nullable=False),
+    Column("user_id", UUID(as_uuid=True), nullable=True),
+    Column("email", String, nullable=True),
+    Column("ip_address", String, nullable=True),
+    Column("user_agent", String, nullable=True),
+    Column("details", JSONB, nullable=True),
+    # The partition key has to be part of the primary key
+    PrimaryKeyConstraint("id", "occurred_at"),
+    Index("ix_auth_events_user_id_occurred_at", "user_id", "occurred_at"),
+    postgresql_partition_by="RANGE (occurred_at)",
+)
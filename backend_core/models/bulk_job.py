@@ -0,0 +1,64 @@
+# backend_core/models/bulk_job.py
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict
+
+from sqlalchemy import DateTime, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend_core.db.base_class import Base
+
+
+class BulkAction(str, Enum):
+    """Operations a bulk job applies to the users it selects."""
+
+    ACTIVATE = "activate"
+    DEACTIVATE = "deactivate"
+    UPDATE = "update"
+
+
+class BulkJobStatus(str, Enum):
+    """Lifecycle of a bulk job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class BulkJob(Base):
+    """
+    A bulk user operation and its progress.
+
+    ``params`` holds either ``ids`` or a ``filter``, plus the ``values`` of an
+    update. Chunks are applied in primary key order and ``last_key`` records
+    the last user updated, so a job picked up again after a crash resumes
+    where it stopped. ``lease_expires_at`` marks the job as owned by a runner.
+    """
+
+    @declared_attr.directive
+    def __tablename__(cls) -> str:
+        return "bulk_jobs"
+
+    action: Mapped[str] = mapped_column(String, nullable=False)
+    params: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False, default=BulkJobStatus.PENDING.value)
+    total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    processed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_key: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_by: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # Runners only ever look for unfinished jobs
+        Index(
+            "ix_bulk_jobs_unfinished_created_at",
+            "created_at",
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+    )
@@ -0,0 +1,38 @@
+# backend_core/models/idempotency_key.py
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import DateTime, Index, Integer, LargeBinary, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend_core.db.base_class import Base
+
+
+class IdempotencyKey(Base):
+    """
+    A client-supplied ``Idempotency-Key`` and the response to the first request that carried it.
+
+    Keys are unique within a ``scope`` of method, path and caller. Until the
+    response is stored, ``status_code`` is null and ``locked_until`` bounds
+    how long the worker handling the request owns it.
+    """
+
+    @declared_attr.directive
+    def __tablename__(cls) -> str:
+        return "idempotency_keys"
+
+    scope: Mapped[str] = mapped_column(String, nullable=False)
+    key: Mapped[str] = mapped_column(String, nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String, nullable=False)
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    headers: Mapped[List[List[str]] | None] = mapped_column(JSONB, nullable=True)
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
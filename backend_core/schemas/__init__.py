@@ -1,6 +1,33 @@
 # backend_core/schemas/__init__.py
 """Pydantic schemas."""
+from backend_core.schemas.bulk_job import BulkJobRead, BulkUserOperation, BulkUserValues, UserFilter
 from backend_core.schemas.token import Token, TokenPayload
-from backend_core.schemas.user import UserBase, UserCreate, UserRead, UserUpdate
+from backend_core.schemas.user import (
+    SignupCount,
+    UserBase,
+    UserBatchRead,
+    UserBatchRequest,
+    UserCreate,
+    UserRead,
+    UserSearchPage,
+    UserStats,
+    UserUpdate,
+)
 
-__all__ = ["Token", "TokenPayload", "UserBase", "UserCreate", "UserRead", "UserUpdate"]
+__all__ = [
+    "BulkJobRead",
+    "BulkUserOperation",
+    "BulkUserValues",
+    "SignupCount",
+    "Token",
+    "TokenPayload",
+    "UserBase",
+    "UserBatchRead",
+    "UserBatchRequest",
+    "UserCreate",
+    "UserFilter",
+    "UserRead",
+    "UserSearchPage",
+    "UserStats",
+    "UserUpdate",
+]
@@ -0,0 +1,87 @@
+# backend_core/schemas/bulk_job.py
+from datetime import datetime
+from typing import Any, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from backend_core.core.settings import settings
+from backend_core.models.bulk_job import BulkAction, BulkJobStatus
+
+
+class UserFilter(BaseModel):
+    """Schema for selecting users by attributes; every given criterion must match"""
+
+    is_active: Optional[bool] = None
+    is_superuser: Optional[bool] = None
+    created_before: Optional[datetime] = None
+    created_after: Optional[datetime] = None
+    last_seen_before: Optional[datetime] = None
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def reject_null(cls, value: Any) -> Any:
+        """Refuse explicit nulls, which would otherwise select rows where the column is NULL."""
+        if value is None:
+            raise ValueError("omit the criterion instead of passing null")
+        return value
+
+    @model_validator(mode="after")
+    def require_criterion(self) -> "UserFilter":
+        """Refuse an empty filter, which would select every user."""
+        if not self.model_fields_set:
+            raise ValueError("filter needs at least one criterion")
+        return self
+
+
+class BulkUserValues(BaseModel):
+    """Schema for the fields a bulk update sets"""
+
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_superuser: Optional[bool] = None
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def reject_null(cls, value: Any) -> Any:
+        """Refuse explicit nulls, which would otherwise be written to every selected user."""
+        if value is None:
+            raise ValueError("omit the field instead of passing null")
+        return value
+
+
+class BulkUserOperation(BaseModel):
+    """Schema for a bulk operation on the users given by ID or selected by a filter"""
+
+    action: BulkAction
+    ids: Optional[List[UUID]] = Field(None, min_length=1, max_length=settings.BULK_JOB_MAX_IDS)
+    filter: Optional[UserFilter] = None
+    values: Optional[BulkUserValues] = None
+
+    @model_validator(mode="after")
+    def check_target_and_values(self) -> "BulkUserOperation":
+        """Require exactly one of ``ids`` and ``filter``, and ``values`` for updates only."""
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("give exactly one of ids and filter")
+        if self.action == BulkAction.UPDATE and not (self.values and self.values.model_fields_set):
+            raise ValueError("update needs values")
+        if self.action != BulkAction.UPDATE and self.values is not None:
+            raise ValueError(f"{self.action.value} takes no values")
+        return self
+
+
+class BulkJobRead(BaseModel):
+    """Schema for the status and progress of a bulk job"""
+
+    id: UUID
+    action: BulkAction
+    status: BulkJobStatus
+    total: Optional[int] = None
+    processed: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,82 @@
+# backend_core/schemas/diagnostics.py
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class TracemallocStatus(BaseModel):
+    """Schema for the state of allocation tracing"""
+
+    tracing: bool
+    frames: int
+    traced_bytes: int
+    peak_bytes: int
+    overhead_bytes: int
+
+
+class SnapshotRead(BaseModel):
+    """Schema for a kept tracemalloc snapshot"""
+
+    id: int
+    taken_at: datetime
+    traced_bytes: int
+
+
+class AllocationDiffRead(BaseModel):
+    """Schema for the change in memory allocated at one site"""
+
+    sites: List[str]
+    size_bytes: int
+    size_diff_bytes: int
+    blocks: int
+    blocks_diff: int
+
+
+class SnapshotDiff(BaseModel):
+    """Schema for the allocation sites that changed most between two snapshots"""
+
+    first: SnapshotRead
+    second: SnapshotRead
+    size_diff_bytes: int
+    allocations: List[AllocationDiffRead]
+
+
+class GcGeneration(BaseModel):
+    """Schema for the statistics of one garbage collector generation"""
+
+    generation: int
+    pending: int
+    threshold: int
+    collections: int
+    collected: int
+    uncollectable: int
+
+
+class GcStats(BaseModel):
+    """Schema for garbage collector statistics"""
+
+    enabled: bool
+    generations: List[GcGeneration]
+    frozen: int
+    garbage: int
+
+
+class IdentityMapStats(BaseModel):
+    """Schema for the ORM objects held by live sessions"""
+
+    sessions: int
+    objects: int
+    largest: int
+    by_class: Dict[str, int]
+
+
+class MemoryReport(BaseModel):
+    """Schema for the memory diagnostics of the worker that served the request"""
+
+    pid: int
+    rss_bytes: Optional[int] = None
+    tracemalloc: TracemallocStatus
+    snapshots: List[SnapshotRead]
+    gc: GcStats
+    identity_maps: IdentityMapStats
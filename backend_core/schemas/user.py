@@ -1,8 +1,10 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+
+from backend_core.core.settings import settings
 
 
 class UserBase(BaseModel):
@@ -42,3 +44,42 @@ class UserRead(UserBase):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UserBatchRequest(BaseModel):
+    """Schema for resolving many users by ID"""
+
+    ids: List[UUID] = Field(..., min_length=1, max_length=settings.USER_BATCH_MAX_SIZE)
+
+
+class UserBatchRead(BaseModel):
+    """Schema for the users found by a batch request, in request order, and the IDs that were not found"""
+
+    users: List[UserRead]
+    missing: List[UUID]
+
+
+class UserSearchPage(BaseModel):
+    """Schema for a page of user search results and the cursor of the next page"""
+
+    items: List[UserRead]
+    next_cursor: Optional[str] = None
+
+
+class SignupCount(BaseModel):
+    """Schema for the number of users created in a day or in the week starting on ``period``"""
+
+    period: date
+    signups: int
+
+
+class UserStats(BaseModel):
+    """Schema for user counts as of ``refreshed_at``, with the live planner estimate of the total"""
+
+    total: int
+    active: int
+    superusers: int
+    approximate_total: Optional[int] = None
+    refreshed_at: datetime
+    signups_per_day: List[SignupCount]
+    signups_per_week: List[SignupCount]
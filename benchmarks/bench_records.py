@@ -0,0 +1,93 @@
+# benchmarks/bench_records.py
+"""
+CPU and memory of loading users as ORM instances versus Core records.
+
+Compares ``select(User)`` through the session, which builds instrumented
+instances tracked by the identity map, against ``CRUDBase.read_multi``, which
+returns named-tuple records from the session's connection. Each path is
+measured loading the rows alone and loading plus ``render_many`` to JSON.
+Users are seeded in a transaction that is rolled back at the end, so the
+database is left as found.
+
+Run with ``python -m benchmarks.bench_records [rows]`` (default 10,000).
+"""
+
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from backend_core.core.responses import render_many
+from backend_core.db.session import SessionLocal
+from backend_core.db.utils import CRUDBase
+from backend_core.models.user import User
+from backend_core.schemas.user import UserCreate, UserRead, UserUpdate
+
+ROUNDS = 10
+
+crud_user = CRUDBase[User, UserCreate, UserUpdate](User)
+
+
+def seed(db: Session, count: int) -> None:
+    """Insert ``count`` users in one statement."""
+    db.execute(
+        text(
+            "INSERT INTO users (id, email, hashed_password, first_name, last_name, is_active, is_superuser, "
+            "created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'user' || i || '@example.com', repeat('x', 60), 'First' || i, 'Last' || i, "
+            "true, false, now(), now() FROM generate_series(1, :count) AS i"
+        ),
+        {"count": count},
+    )
+
+
+def cpu_ms(db: Session, fn: Callable[[], Any]) -> float:
+    """Return the median process CPU time of ``fn`` in milliseconds, starting each round with an empty session."""
+    timings = []
+    for _ in range(ROUNDS + 1):
+        db.expunge_all()
+        start = time.process_time()
+        fn()
+        timings.append((time.process_time() - start) * 1000)
+    return statistics.median(timings[1:])  # the first round warms up
+
+
+def retained_kib(db: Session, load: Callable[[], List[Any]]) -> float:
+    """Return the memory still allocated while the loaded rows are held, in KiB."""
+    db.expunge_all()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    rows = load()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del rows
+    return sum(stat.size_diff for stat in after.compare_to(before, "filename")) / 1024
+
+
+def main() -> None:
+    """Print CPU and retained memory per path for the seeded rows."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    db = SessionLocal()
+    try:
+        seed(db, count)
+        paths = [
+            ("orm", lambda: list(db.scalars(select(User).limit(count)))),
+            ("records", lambda: crud_user.read_multi(db, limit=count)),
+        ]
+        print(f"{count:,} rows, median of {ROUNDS} rounds")
+        print(f"{'path':<9}{'load (ms)':>11}{'+ render (ms)':>15}{'retained (KiB)':>16}")
+        for name, load in paths:
+            load_ms = cpu_ms(db, load)
+            render_ms = cpu_ms(db, lambda: render_many(UserRead, load()).body)  # noqa: B023
+            print(f"{name:<9}{load_ms:>11.1f}{render_ms:>15.1f}{retained_kib(db, load):>16,.0f}")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
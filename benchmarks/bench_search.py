@@ -0,0 +1,108 @@
+# benchmarks/bench_search.py
+"""
+Latency of user search over a seeded table.
+
+Compares a naive ``ILIKE '%q%'`` over email and names, which scans the whole
+table, against ``backend_core.db.search.search_users``. Users are seeded in a
+transaction that is rolled back at the end, so the database is left as found.
+
+Run with ``python -m benchmarks.bench_search [users]`` (default 1,000,000).
+"""
+
+import statistics
+import sys
+import time
+from typing import Any, Callable, List, Optional
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.orm import Session
+
+from backend_core.db.search import SearchKey, search_users, trigram_search_available
+from backend_core.db.session import SessionLocal
+from backend_core.models.user import User
+
+PAGE_SIZE = 20
+# (query, page) pairs; later pages show keyset pagination against OFFSET
+QUERIES = [
+    ("user123456@example.com", 1),
+    ("user4242", 1),
+    ("maria", 1),
+    ("garcia", 1),
+    ("jonh", 1),
+    ("maria", 50),
+]
+
+FIRST_NAMES = ["james", "maria", "john", "linda", "wei", "fatima", "olga", "kenji", "amara", "lucas"]
+LAST_NAMES = ["smith", "garcia", "chen", "johnson", "ivanova", "okafor", "tanaka", "silva", "muller", "khan"]
+
+
+def seed(db: Session, count: int) -> None:
+    """Insert ``count`` users with varied names in one statement, then refresh planner statistics."""
+    db.execute(
+        text(
+            "INSERT INTO users (id, email, hashed_password, first_name, last_name, is_active, is_superuser, "
+            "created_at, updated_at) "
+            "SELECT gen_random_uuid(), 'user' || i || '@example.com', 'x', "
+            "(:first_names)[1 + i % 10] || (i % 97), (:last_names)[1 + (i / 10) % 10], true, false, now(), now() "
+            "FROM generate_series(1, :count) AS i"
+        ),
+        {"first_names": FIRST_NAMES, "last_names": LAST_NAMES, "count": count},
+    )
+    db.execute(text("ANALYZE users"))
+
+
+def naive_search(db: Session, query: str, page: int) -> List[Any]:
+    """Search with the unindexable ILIKE '%q%' and OFFSET paging the endpoint would otherwise need."""
+    pattern = f"%{query}%"
+    statement = (
+        select(User)
+        .where(or_(User.email.ilike(pattern), User.first_name.ilike(pattern), User.last_name.ilike(pattern)))
+        .order_by(User.email)
+        .offset((page - 1) * PAGE_SIZE)
+        .limit(PAGE_SIZE)
+    )
+    return list(db.scalars(statement))
+
+
+def cursor_for_page(db: Session, query: str, page: int) -> Optional[SearchKey]:
+    """Walk the search results up to the start of ``page``."""
+    after = None
+    for _ in range(page - 1):
+        after = search_users(db, query, limit=PAGE_SIZE, after=after)[-1][1]
+    return after
+
+
+def wall_ms(fn: Callable[[], Any], rounds: int) -> float:
+    """Return the median wall time of ``fn`` in milliseconds."""
+    fn()  # warm up
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Print median latency per query for the naive and indexed searches."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        seed(db, count)
+        print(f"seeded {count:,} users in {time.perf_counter() - start:.1f}s, fuzzy={trigram_search_available(db)}")
+        print(f"{'query':<26}{'page':>6}{'naive (ms)':>12}{'indexed (ms)':>14}{'speedup':>10}")
+        for query, page in QUERIES:
+            cursor = cursor_for_page(db, query, page)
+            before = wall_ms(lambda: naive_search(db, query, page), 5)
+            after = wall_ms(lambda: search_users(db, query, limit=PAGE_SIZE + 1, after=cursor), 20)
+            # Identity-map bookkeeping is per session, so keep it from growing across rounds
+            db.expunge_all()
+            print(f"{query:<26}{page:>6}{before:>12.2f}{after:>14.2f}{before / after:>9.1f}x")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# benchmarks/bench_uuid.py
+"""
+Insert throughput and index size of UUIDv4 versus UUIDv7 primary keys.
+
+Each version fills its own scratch table shaped like ``users`` (UUID primary
+key plus a row payload), in committed batches of application-generated IDs
+as the ORM would insert them. Reported per version: rows per second, primary
+key index size, and WAL written. Random v4 keys touch pages all over the
+index, which splits pages half-empty and writes a full-page image to WAL for
+each page first touched after a checkpoint; v7 keys append at the right edge.
+The scratch tables are dropped at the end.
+
+Run with ``python -m benchmarks.bench_uuid [rows]`` (default 1,000,000).
+"""
+
+import sys
+import time
+import uuid
+from typing import Callable, Dict
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, insert, text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Engine
+
+from backend_core.core.ids import uuid7
+from backend_core.db.session import engine
+
+BATCH_SIZE = 10_000
+
+
+def scratch_table(name: str) -> Table:
+    """Return a table shaped like ``users``, on its own metadata."""
+    return Table(
+        name,
+        MetaData(),
+        Column("id", UUID(as_uuid=True), primary_key=True),
+        Column("email", String, nullable=False),
+        Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+    )
+
+
+def fill(engine: Engine, table: Table, generate: Callable[[], uuid.UUID], rows: int) -> Dict[str, float]:
+    """Insert ``rows`` rows with IDs from ``generate`` and return the measurements."""
+    with engine.begin() as connection:
+        table.drop(connection, checkfirst=True)
+        table.create(connection)
+        connection.execute(text("CHECKPOINT"))
+        wal_start = connection.execute(text("SELECT pg_current_wal_insert_lsn()")).scalar()
+
+    start = time.perf_counter()
+    for offset in range(0, rows, BATCH_SIZE):
+        batch = [{"id": generate(), "email": f"user{offset + i}@example.com"} for i in range(BATCH_SIZE)]
+        with engine.begin() as connection:
+            connection.execute(insert(table), batch)
+    elapsed = time.perf_counter() - start
+
+    with engine.begin() as connection:
+        wal_bytes = connection.execute(
+            text("SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), :start)"), {"start": wal_start}
+        ).scalar_one()
+        index_bytes = connection.execute(text(f"SELECT pg_relation_size('{table.name}_pkey')")).scalar_one()
+        table.drop(connection)
+    return {"rows_per_second": rows / elapsed, "index_mb": index_bytes / 2**20, "wal_mb": float(wal_bytes) / 2**20}
+
+
+def main() -> None:
+    """Print insert throughput, primary key index size and WAL volume for v4 and v7 keys."""
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{rows:,} rows in batches of {BATCH_SIZE:,}")
+    print(f"{'version':<9}{'rows/s':>10}{'pkey (MiB)':>12}{'WAL (MiB)':>11}")
+    for version, generate in (("uuid4", uuid.uuid4), ("uuid7", uuid7)):
+        result = fill(engine, scratch_table(f"bench_{version}"), generate, rows)
+        print(f"{version:<9}{result['rows_per_second']:>10,.0f}{result['index_mb']:>12.1f}{result['wal_mb']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -59,6 +59,12 @@ def test(ctx: Context) -> None:
         ctx.run("docker compose run --rm test poetry run pytest tests/ -v --cov=backend_core --cov-report=xml")
 
 
+@task
+def check_migrations(ctx: Context) -> None:
+    """Report the table locks the pending migrations will take, without running them."""
+    ctx.run("python -m backend_core.db.migrations")
+
+
 @task
 def clean(ctx: Context) -> None:
     """Remove all build artifacts, temporary files, and docker resources."""
@@ -2,6 +2,7 @@
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from backend_core.core.deps import decode_claims
 from backend_core.core.settings import settings
 from backend_core.models.user import User
 
@@ -16,6 +17,10 @@ def test_login_success(client: TestClient, test_user: User) -> None:
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
+    claims = decode_claims(data["access_token"])
+    assert claims is not None
+    assert claims.user_id == test_user.id
+    assert claims.version == test_user.token_version
 
 
 def test_login_wrong_password(client: TestClient, test_user: User) -> None:
@@ -36,3 +41,15 @@ def test_token_validation(client: TestClient, token_headers: dict[str, str]) ->
     """Test token validation with protected endpoint."""
     response = client.get(f"{settings.API_V1_STR}/users/me", headers=token_headers)
     assert response.status_code == status.HTTP_200_OK
+
+
+def test_login_throttled_after_repeated_failures(client: TestClient, test_user: User) -> None:
+    """Test that an account is locked out after too many failures, even with the right password."""
+    url = f"{settings.API_V1_STR}/auth/login"
+    for _ in range(settings.LOGIN_MAX_FAILURES_PER_EMAIL):
+        response = client.post(url, data={"username": test_user.email, "password": "wrongpassword"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.post(url, data={"username": test_user.email, "password": "password"})
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert 0 < int(response.headers["Retry-After"]) <= settings.LOGIN_FAILURE_WINDOW_SECONDS
@@ -0,0 +1,62 @@
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from backend_core.core.memory import allocation_profiler
+from backend_core.core.settings import settings
+from backend_core.models.user import User
+
+DIAGNOSTICS = f"{settings.API_V1_STR}/diagnostics"
+
+
+def test_memory_diagnostics_require_superuser(client: TestClient, token_headers: dict[str, str]) -> None:
+    """Test that only superusers can inspect or profile memory."""
+    assert client.get(f"{DIAGNOSTICS}/memory", headers=token_headers).status_code == status.HTTP_403_FORBIDDEN
+    response = client.post(f"{DIAGNOSTICS}/memory/tracemalloc/start", headers=token_headers)
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_tracemalloc_snapshots_and_diff(
+    client: TestClient, db_session: Session, test_user: User, token_headers: dict[str, str]
+) -> None:
+    """Test tracing allocations, diffing two snapshots, and the memory report."""
+    test_user.is_superuser = True
+    db_session.commit()
+
+    response = client.post(f"{DIAGNOSTICS}/memory/snapshots", headers=token_headers)
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    try:
+        response = client.post(f"{DIAGNOSTICS}/memory/tracemalloc/start?frames=2", headers=token_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["tracing"] is True
+        assert response.json()["frames"] == 2
+
+        first = client.post(f"{DIAGNOSTICS}/memory/snapshots", headers=token_headers).json()
+        leak = [bytearray(1024) for _ in range(1000)]
+        second = client.post(f"{DIAGNOSTICS}/memory/snapshots", headers=token_headers).json()
+        assert second["id"] == first["id"] + 1
+
+        response = client.get(
+            f"{DIAGNOSTICS}/memory/snapshots/{first['id']}/diff/{second['id']}", headers=token_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        diff = response.json()
+        assert diff["size_diff_bytes"] >= 1024 * 1000
+        assert diff["allocations"][0]["size_diff_bytes"] >= 1024 * 1000
+        assert diff["allocations"][0]["sites"][-1].startswith(__file__)
+        assert len(leak) == 1000
+
+        response = client.get(f"{DIAGNOSTICS}/memory/snapshots/{first['id']}/diff/0", headers=token_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        response = client.post(f"{DIAGNOSTICS}/memory/tracemalloc/stop", headers=token_headers)
+        assert response.json()["tracing"] is False
+
+        report = client.get(f"{DIAGNOSTICS}/memory", headers=token_headers).json()
+        assert report["rss_bytes"] > 0
+        assert second["id"] in [snapshot["id"] for snapshot in report["snapshots"]]
+        assert [generation["generation"] for generation in report["gc"]["generations"]] == [0, 1, 2]
+        assert report["identity_maps"]["by_class"]["User"] >= 1
+    finally:
+        allocation_profiler.stop()
@@ -1,9 +1,16 @@
 # tests/api/v1/test_users.py
 
+from datetime import datetime, timezone
+from uuid import uuid4
+
 from fastapi import status
 from fastapi.testclient import TestClient
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
 
 from backend_core.core.settings import settings
+from backend_core.db.session import SessionLocal
+from backend_core.models.idempotency_key import IdempotencyKey
 from backend_core.models.user import User
 
 
@@ -51,7 +58,213 @@ def test_update_current_user(client: TestClient, token_headers: dict[str, str])
     assert data["last_name"] == update_data["last_name"]
 
 
+def test_password_change_revokes_tokens(client: TestClient, token_headers: dict[str, str]) -> None:
+    """Test that tokens issued before a password change stop working."""
+    response = client.put(f"{settings.API_V1_STR}/users/me", headers=token_headers, json={"password": "changed123"})
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers=token_headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_password_change_revokes_conditional_gets(client: TestClient, token_headers: dict[str, str]) -> None:
+    """Test that a token issued before a password change gets no 304, even with the current ETag."""
+    response = client.put(f"{settings.API_V1_STR}/users/me", headers=token_headers, json={"password": "changed123"})
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["etag"]
+
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers={**token_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
 def test_read_user_unauthorized(client: TestClient) -> None:
     """Test reading current user without authentication."""
     response = client.get(f"{settings.API_V1_STR}/users/me")
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_read_current_user_not_modified(client: TestClient, token_headers: dict[str, str]) -> None:
+    """Test conditional GET of the current user."""
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers=token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["etag"]
+
+    headers = {**token_headers, "If-None-Match": etag}
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    headers = {**token_headers, "If-None-Match": '"stale"'}
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_read_current_user_fields(client: TestClient, token_headers: dict[str, str]) -> None:
+    """Test reading a sparse fieldset of the current user, with its own ETag."""
+    full = client.get(f"{settings.API_V1_STR}/users/me", headers=token_headers)
+    response = client.get(f"{settings.API_V1_STR}/users/me?fields=email,id", headers=token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"id": full.json()["id"], "email": full.json()["email"]}
+    etag = response.headers["etag"]
+    assert etag != full.headers["etag"]
+
+    headers = {**token_headers, "If-None-Match": etag}
+    response = client.get(f"{settings.API_V1_STR}/users/me?fields=id,email", headers=headers)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    response = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.get(f"{settings.API_V1_STR}/users/me?fields=hashed_password", headers=token_headers)
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_update_current_user_if_match(client: TestClient, token_headers: dict[str, str]) -> None:
+    """Test that updates are rejected when If-Match does not match the current ETag."""
+    etag = client.get(f"{settings.API_V1_STR}/users/me", headers=token_headers).headers["etag"]
+
+    headers = {**token_headers, "If-Match": '"stale"'}
+    response = client.put(f"{settings.API_V1_STR}/users/me", headers=headers, json={"first_name": "Stale"})
+    assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+
+    headers = {**token_headers, "If-Match": etag}
+    response = client.put(f"{settings.API_V1_STR}/users/me", headers=headers, json={"first_name": "Fresh"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["first_name"] == "Fresh"
+    assert response.headers["etag"] != etag
+
+
+def test_read_users_batch(
+    client: TestClient, db_session: Session, test_user: User, token_headers: dict[str, str]
+) -> None:
+    """Test resolving many users by ID."""
+    now = datetime.now(timezone.utc)
+    other = User(email="batch@example.com", hashed_password="hashed_password", created_at=now, updated_at=now)
+    db_session.add(other)
+    test_user.is_superuser = True
+    db_session.commit()
+
+    missing = str(uuid4())
+    ids = [str(other.id), missing, str(test_user.id)]
+    response = client.post(f"{settings.API_V1_STR}/users/batch", headers=token_headers, json={"ids": ids})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [user["id"] for user in data["users"]] == [str(other.id), str(test_user.id)]
+    assert data["users"][0]["email"] == "batch@example.com"
+    assert data["missing"] == [missing]
+
+    response = client.post(f"{settings.API_V1_STR}/users/batch?fields=email", headers=token_headers, json={"ids": ids})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["users"] == [{"email": "batch@example.com"}, {"email": test_user.email}]
+
+    too_many = [str(uuid4()) for _ in range(settings.USER_BATCH_MAX_SIZE + 1)]
+    response = client.post(f"{settings.API_V1_STR}/users/batch", headers=token_headers, json={"ids": too_many})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_read_users_batch_requires_superuser(client: TestClient, token_headers: dict[str, str]) -> None:
+    """Test that only superusers can resolve users in batch."""
+    response = client.post(f"{settings.API_V1_STR}/users/batch", headers=token_headers, json={"ids": [str(uuid4())]})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_search_users(client: TestClient, db_session: Session, test_user: User, token_headers: dict[str, str]) -> None:
+    """Test paging through user search results."""
+    now = datetime.now(timezone.utc)
+    for i in range(3):
+        db_session.add(User(email=f"search{i}@example.com", hashed_password="hashed", created_at=now, updated_at=now))
+    test_user.is_superuser = True
+    db_session.commit()
+
+    url = f"{settings.API_V1_STR}/users/search"
+    response = client.get(url, headers=token_headers, params={"q": "search", "limit": 2})
+    assert response.status_code == status.HTTP_200_OK
+    first_page = response.json()
+    assert len(first_page["items"]) == 2
+    assert first_page["next_cursor"] is not None
+
+    params = {"q": "search", "limit": 2, "cursor": first_page["next_cursor"]}
+    second_page = client.get(url, headers=token_headers, params=params).json()
+    assert second_page["next_cursor"] is None
+    found = {user["email"] for user in first_page["items"] + second_page["items"]}
+    assert found == {f"search{i}@example.com" for i in range(3)}
+
+    response = client.get(url, headers=token_headers, params={"q": "search", "cursor": "garbage"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_read_user_stats(
+    client: TestClient, db_session: Session, test_user: User, token_headers: dict[str, str]
+) -> None:
+    """Test reading user statistics, which only superusers may."""
+    url = f"{settings.API_V1_STR}/users/stats"
+    assert client.get(url, headers=token_headers).status_code == status.HTTP_403_FORBIDDEN
+
+    test_user.is_superuser = True
+    db_session.commit()
+    response = client.get(url, headers=token_headers, params={"days": 7, "weeks": 2})
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert {"total", "active", "superusers", "approximate_total", "refreshed_at"} <= set(data)
+    assert len(data["signups_per_day"]) <= 7
+    assert len(data["signups_per_week"]) <= 2
+
+    response = client.get(url, headers=token_headers, params={"days": 0})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_bulk_operation(
+    client: TestClient, db_session: Session, test_user: User, token_headers: dict[str, str]
+) -> None:
+    """Test queueing a bulk operation and reading its status."""
+    url = f"{settings.API_V1_STR}/users/bulk"
+    operation = {"action": "deactivate", "filter": {"is_active": True, "created_before": "2000-01-01T00:00:00Z"}}
+    assert client.post(url, headers=token_headers, json=operation).status_code == status.HTTP_403_FORBIDDEN
+
+    test_user.is_superuser = True
+    db_session.commit()
+    response = client.post(url, headers=token_headers, json=operation)
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = response.json()
+    assert job["status"] == "pending"
+    assert response.headers["location"] == f"{url}/{job['id']}"
+
+    response = client.get(response.headers["location"], headers=token_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["id"] == job["id"]
+    assert client.get(f"{url}/{uuid4()}", headers=token_headers).status_code == status.HTTP_404_NOT_FOUND
+
+    invalid = [
+        {"action": "deactivate", "ids": [str(test_user.id)], "filter": {"is_active": True}},
+        {"action": "deactivate", "filter": {}},
+        {"action": "update", "ids": [str(test_user.id)]},
+        {"action": "activate", "ids": [str(test_user.id)], "values": {"first_name": "x"}},
+        {"action": "deactivate", "filter": {"is_active": None}},
+        {"action": "update", "ids": [str(test_user.id)], "values": {"is_active": None}},
+        {"action": "update", "ids": [str(test_user.id)], "values": {"first_name": "x", "is_superuser": None}},
+    ]
+    for body in invalid:
+        assert client.post(url, headers=token_headers, json=body).status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_search_users_requires_superuser(client: TestClient, token_headers: dict[str, str]) -> None:
+    """Test that only superusers can search users."""
+    response = client.get(f"{settings.API_V1_STR}/users/search", headers=token_headers, params={"q": "a"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_create_user_retry_with_idempotency_key(client: TestClient) -> None:
+    """Test that a retried signup replays the first response instead of failing as a duplicate."""
+    user_data = {"email": "retry@example.com", "password": "newpassword123"}
+    headers = {"Idempotency-Key": str(uuid4())}
+    try:
+        first = client.post(f"{settings.API_V1_STR}/users/", json=user_data, headers=headers)
+        retry = client.post(f"{settings.API_V1_STR}/users/", json=user_data, headers=headers)
+    finally:
+        with SessionLocal() as db:
+            db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == headers["Idempotency-Key"]))
+            db.commit()
+
+    assert first.status_code == retry.status_code == status.HTTP_200_OK
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
@@ -13,6 +13,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
+from backend_core.core.login_limits import login_limiter
 from backend_core.core.security import get_password_hash
 from backend_core.core.settings import settings
 from backend_core.db.migrations import run_migrations
@@ -144,6 +145,7 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+    login_limiter.counters.clear()
 
 
 @pytest.fixture
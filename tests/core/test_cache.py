@@ -0,0 +1,39 @@
+"""Test in-process caching utilities."""
+
+import time
+
+from backend_core.core.cache import TTLCache
+
+
+def test_ttl_cache_get_set_pop() -> None:
+    """Test basic cache operations."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    cache.pop("a")
+    cache.pop("a")
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_expiry() -> None:
+    """Test that entries expire after the time to live."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    """Test LRU eviction when the cache is full."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    cache.clear()
+    assert len(cache) == 0
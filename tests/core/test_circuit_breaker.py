@@ -0,0 +1,213 @@
+"""Test the database circuit breaker."""
+
+import time
+from typing import Any, List
+
+import pytest
+from fastapi import Depends, FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from backend_core.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitProbe,
+    CircuitState,
+    DatabaseUnavailable,
+    database_unavailable_handler,
+    db_breaker,
+    guard_engine,
+    ping,
+)
+from backend_core.db.session import get_db
+
+
+class FakeClock:
+    """A clock that moves only when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock) -> CircuitBreaker:
+    """Build a breaker with small thresholds."""
+    return CircuitBreaker(
+        window=10,
+        min_calls=4,
+        failure_rate=0.5,
+        slow_call_seconds=1.0,
+        slow_rate=0.75,
+        open_seconds=5,
+        max_open_seconds=12,
+        clock=clock,
+    )
+
+
+def test_opens_on_failure_rate() -> None:
+    """Test that the circuit opens once enough calls failed, and not before the minimum number of calls."""
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.check()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.OPEN
+    clock.now += 2
+    with pytest.raises(DatabaseUnavailable) as exc_info:
+        breaker.check()
+    assert exc_info.value.retry_after == 3
+
+
+def test_opens_on_slow_rate() -> None:
+    """Test that the circuit opens once enough calls were slow."""
+    breaker = _breaker(FakeClock())
+    for seconds in (1.5, 2.0, 0.1, 1.0):
+        breaker.record_success(seconds)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_old_calls_leave_the_window() -> None:
+    """Test that failures older than the window are forgotten."""
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 10
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_probe_closes_or_reopens_with_backoff() -> None:
+    """Test that probes wait for the open time, reopen for longer on failure and close on success."""
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    breaker.trip()
+    states: List[CircuitState] = []
+
+    def failing() -> None:
+        states.append(breaker.state)
+        raise OSError("connection refused")
+
+    assert not breaker.probe(failing)
+    clock.now += 5
+    assert not breaker.probe(failing)
+    assert states == [CircuitState.HALF_OPEN]
+    assert breaker.state == CircuitState.OPEN
+
+    # Opened for 10 seconds, then for the 12 second maximum
+    clock.now += 9
+    assert not breaker.probe(failing)
+    clock.now += 1
+    assert not breaker.probe(failing)
+    clock.now += 12
+    assert breaker.probe(lambda: None)
+    assert breaker.state == CircuitState.CLOSED
+
+    # Closing starts over from the initial open time
+    breaker.trip()
+    clock.now += 5
+    assert breaker.probe(lambda: None)
+
+
+def test_slow_probe_keeps_circuit_open() -> None:
+    """Test that a probe that succeeds too slowly does not close the circuit."""
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    breaker.trip()
+    clock.now += 5
+
+    def slow() -> None:
+        clock.now += 1.5
+
+    assert not breaker.probe(slow)
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_guarded_engine(engine: Engine) -> None:
+    """Test that a guarded engine counts connection failures, then refuses connections while open."""
+    breaker = CircuitBreaker(min_calls=2, open_seconds=60)
+    unreachable = create_engine(engine.url.set(port=1), connect_args={"connect_timeout": 1})
+    guard_engine(unreachable, breaker)
+    for _ in range(2):
+        with pytest.raises(OperationalError):
+            unreachable.connect()
+    assert breaker.state == CircuitState.OPEN
+
+    start = time.perf_counter()
+    with pytest.raises(DatabaseUnavailable):
+        unreachable.connect()
+    assert time.perf_counter() - start < 0.5
+    unreachable.dispose()
+
+    reachable = create_engine(engine.url)
+    guard_engine(reachable, breaker)
+    with pytest.raises(DatabaseUnavailable):
+        reachable.connect()
+    breaker.reset()
+    with reachable.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar_one() == 1
+    reachable.dispose()
+
+
+def test_slow_statements_open_circuit(engine: Engine) -> None:
+    """Test that slow statements on a warm pool open the circuit, however many checkouts succeed quickly."""
+    breaker = CircuitBreaker(min_calls=3, slow_call_seconds=0.05, open_seconds=60)
+    guarded = create_engine(engine.url, pool_pre_ping=True)
+    guard_engine(guarded, breaker)
+    with guarded.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    for _ in range(20):
+        with guarded.connect():
+            pass
+    assert breaker.state == CircuitState.CLOSED
+
+    for _ in range(3):
+        with guarded.connect() as connection:
+            connection.execute(text("SELECT pg_sleep(0.1)"))
+    assert breaker.state == CircuitState.OPEN
+    guarded.dispose()
+
+
+def test_background_probe_closes_circuit(engine: Engine) -> None:
+    """Test that the background probe closes the circuit once the database answers."""
+    breaker = CircuitBreaker(open_seconds=0.05)
+    probe = CircuitProbe(breaker, lambda: ping(engine), interval=0.02)
+    breaker.trip()
+    probe.start()
+    try:
+        deadline = time.monotonic() + 5
+        while breaker.state != CircuitState.CLOSED and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert breaker.state == CircuitState.CLOSED
+    finally:
+        probe.stop()
+
+
+def test_open_circuit_answers_503() -> None:
+    """Test that requests needing a session fail at once with 503 while the circuit is open."""
+    app = FastAPI()
+    app.add_exception_handler(DatabaseUnavailable, database_unavailable_handler)
+
+    @app.get("/needs-db")
+    def needs_db(db: Any = Depends(get_db)) -> dict:
+        return {"ok": True}
+
+    db_breaker.trip()
+    try:
+        with TestClient(app) as client:
+            response = client.get("/needs-db")
+    finally:
+        db_breaker.reset()
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json() == {"detail": "Database unavailable"}
+    assert int(response.headers["retry-after"]) >= 1
@@ -0,0 +1,62 @@
+"""Test request deadlines and their Postgres timeouts."""
+
+import json
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+from backend_core.core.deadlines import (
+    DeadlineExceeded,
+    database_timeout_handler,
+    deadlines_exceeded,
+    set_deadline,
+    statements_cancelled,
+)
+
+EMPTY_REQUEST = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+
+def test_deadline_sets_local_timeouts(db_session: Session) -> None:
+    """Test that the remaining budget becomes the transaction's statement and lock timeouts."""
+    set_deadline(db_session, time.monotonic() + 2)
+    statement_timeout = db_session.execute(text("SELECT current_setting('statement_timeout')")).scalar_one()
+    lock_timeout = db_session.execute(text("SELECT current_setting('lock_timeout')")).scalar_one()
+    assert statement_timeout == lock_timeout
+    milliseconds = (
+        int(statement_timeout[:-2]) if statement_timeout.endswith("ms") else int(statement_timeout[:-1]) * 1000
+    )
+    assert 1_000 < milliseconds <= 2_000
+
+
+def test_expired_deadline_raises(db_session: Session) -> None:
+    """Test that no transaction starts once the budget is spent."""
+    before = deadlines_exceeded.value()
+    db_session.commit()
+    set_deadline(db_session, time.monotonic() - 1)
+    with pytest.raises(DeadlineExceeded):
+        db_session.execute(text("SELECT 1"))
+    assert deadlines_exceeded.value() == before + 1
+
+
+async def test_statement_timeout_maps_to_504(db_session: Session) -> None:
+    """Test that a statement cancelled by the deadline becomes a 504 and is counted."""
+    set_deadline(db_session, time.monotonic() + 0.1)
+    with pytest.raises(OperationalError) as exc_info:
+        db_session.execute(text("SELECT pg_sleep(1)"))
+
+    before = statements_cancelled.value(reason="statement_timeout")
+    response = await database_timeout_handler(EMPTY_REQUEST, exc_info.value)
+    assert response.status_code == 504
+    assert json.loads(response.body) == {"detail": "Database query timed out"}
+    assert statements_cancelled.value(reason="statement_timeout") == before + 1
+
+
+async def test_other_operational_errors_are_reraised() -> None:
+    """Test that unrelated database errors are not turned into timeouts."""
+    error = OperationalError("SELECT 1", {}, Exception("connection refused"))
+    with pytest.raises(OperationalError):
+        await database_timeout_handler(EMPTY_REQUEST, error)
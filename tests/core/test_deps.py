@@ -1,15 +1,29 @@
 """Test dependencies module."""
 
+import threading
+import uuid
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 import pytest
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 from jose import jwt
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
-from backend_core.core.deps import decode_token, get_current_user, get_user_by_email
+from backend_core.core.deps import (
+    aget_user_by_email,
+    decode_claims,
+    decode_token,
+    get_current_user,
+    get_user,
+    get_user_by_email,
+    user_lookups,
+)
+from backend_core.core.security import create_access_token
 from backend_core.core.settings import settings
+from backend_core.db.utils import detached_copy
 from backend_core.models.user import User
 
 
@@ -96,3 +110,81 @@ async def test_get_current_user_user_not_found(client: TestClient, db_session: S
     # Test getting current user
     with pytest.raises(HTTPException):
         await get_current_user(token, db_session)
+
+
+def test_decode_claims_with_version() -> None:
+    """Test decoding the subject and version of a token."""
+    user_id = uuid.uuid4()
+    claims = decode_claims(create_access_token(user_id, version=3))
+    assert claims is not None
+    assert claims.user_id == user_id
+    assert claims.version == 3
+
+
+def test_get_user_uses_identity_map(db_session: Session, test_user: User) -> None:
+    """Test that a user already in the session is returned without a lookup."""
+    assert get_user(test_user.id, db_session) is test_user
+    assert get_user(uuid.uuid4(), db_session) is None
+
+
+async def test_get_user_by_email_uses_identity_map(db_session: Session, test_user: User) -> None:
+    """Test that a user already in the session is not overwritten by a copy another request loaded."""
+    db_session.execute(update(User).where(User.id == test_user.id).values(first_name="Stale"))
+    other = Session(bind=db_session.connection())
+    row = other.get(User, test_user.id)
+    assert row is not None
+    stale = detached_copy(row)
+    other.close()
+    test_user.first_name = "Unflushed"
+
+    # Another request's lookup of the same email is in flight and will share its stale copy
+    started, release = threading.Event(), threading.Event()
+
+    def load_elsewhere() -> Optional[User]:
+        started.set()
+        release.wait(1)
+        return stale
+
+    leader = threading.Thread(target=user_lookups.do, args=(("email", "test@example.com"), load_elsewhere))
+    leader.start()
+    started.wait()
+    try:
+        assert get_user_by_email("test@example.com", db_session) is test_user
+        assert await aget_user_by_email("test@example.com", db_session) is test_user
+    finally:
+        release.set()
+        leader.join()
+    assert test_user.first_name == "Unflushed"
+
+    # Expired attributes can't be matched without SQL, but a shared copy still resolves to the held instance
+    db_session.expire(test_user)
+    assert get_user_by_email("test@example.com", db_session) is test_user
+
+
+async def test_get_current_user_by_id(client: TestClient, db_session: Session, test_user: User) -> None:
+    """Test getting current user from a token whose subject is the user ID."""
+    token = create_access_token(test_user.id, version=test_user.token_version)
+    current_user = await get_current_user(token, db_session)
+    assert current_user.id == test_user.id
+
+
+async def test_get_current_user_stale_version(client: TestClient, db_session: Session, test_user: User) -> None:
+    """Test that a token issued before the user's token version changed is refused."""
+    token = create_access_token(test_user.id, version=test_user.token_version)
+    test_user.token_version += 1
+    db_session.commit()
+
+    with pytest.raises(HTTPException):
+        await get_current_user(token, db_session)
+
+
+async def test_get_current_user_email_subject_disabled(
+    client: TestClient, db_session: Session, test_user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that tokens with an email subject are refused once they are no longer accepted."""
+    expire = datetime.now(timezone.utc) + timedelta(minutes=15)
+    token = jwt.encode({"exp": expire, "sub": test_user.email}, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    monkeypatch.setattr(settings, "ACCEPT_EMAIL_SUBJECT_TOKENS", False)
+
+    with pytest.raises(HTTPException):
+        await get_current_user(token, db_session)
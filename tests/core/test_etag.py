@@ -0,0 +1,68 @@
+"""Test ETag helpers."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from backend_core.core.etag import UserETag, check_user_not_modified, compute_etag, etag_matches, user_etags
+from backend_core.core.security import create_access_token
+from backend_core.models.user import User
+
+
+def make_request(headers: dict[str, str]) -> Request:
+    """Build a bare request carrying the given headers."""
+    raw_headers = [(key.lower().encode(), value.encode()) for key, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw_headers})
+
+
+def test_compute_etag_changes_with_updated_at() -> None:
+    """Test that the ETag is stable for a version and changes with updated_at."""
+    user = User(id=uuid.uuid4(), email="etag@example.com")
+    user.updated_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    etag = compute_etag(user)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert compute_etag(user) == etag
+
+    user.updated_at += timedelta(microseconds=1)
+    assert compute_etag(user) != etag
+
+
+def test_etag_matches() -> None:
+    """Test weak and strong comparison of conditional headers."""
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert not etag_matches('W/"b"', '"b"', weak=False)
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
+
+
+def test_check_user_not_modified_uses_cache() -> None:
+    """Test that a cached ETag answers a conditional GET without loading the user."""
+    user_id = uuid.uuid4()
+    token = create_access_token(user_id, version=1)
+    user_etags.set(str(user_id), UserETag('"cached"', 1))
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            check_user_not_modified(make_request({"If-None-Match": '"cached"'}), token, None)
+        assert exc_info.value.status_code == 304
+
+        check_user_not_modified(make_request({"If-None-Match": '"other"'}), token, None)
+        check_user_not_modified(make_request({}), token, None)
+    finally:
+        user_etags.pop(str(user_id))
+
+
+def test_check_user_not_modified_skips_other_token_versions() -> None:
+    """Test that tokens of another version, or without one, are not answered from the cache."""
+    user_id = uuid.uuid4()
+    user_etags.set(str(user_id), UserETag('"cached"', 2))
+    request = make_request({"If-None-Match": '"cached"'})
+    try:
+        check_user_not_modified(request, create_access_token(user_id, version=1), None)
+        check_user_not_modified(request, create_access_token(user_id), None)
+    finally:
+        user_etags.pop(str(user_id))
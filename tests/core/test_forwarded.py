@@ -0,0 +1,37 @@
+"""Test client address resolution behind proxies."""
+
+from typing import List, Optional, Tuple
+
+from starlette.requests import Request
+
+from backend_core.core.forwarded import client_address, parse_networks
+
+PROXIES = parse_networks(["10.0.0.0/8", "192.0.2.1"])
+
+
+def make_request(peer: Optional[str], forwarded: List[str]) -> Request:
+    """Build a bare request from ``peer`` carrying the given X-Forwarded-For headers."""
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded]
+    client: Optional[Tuple[str, int]] = (peer, 50000) if peer is not None else None
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "client": client})
+
+
+def test_untrusted_peer_is_the_client() -> None:
+    """Test that a peer not listed as a proxy is the client, whatever it forwards."""
+    assert client_address(make_request("203.0.113.7", ["198.51.100.1"]), PROXIES) == "203.0.113.7"
+    assert client_address(make_request("10.0.0.5", ["198.51.100.1"]), []) == "10.0.0.5"
+    assert client_address(make_request(None, []), PROXIES) is None
+
+
+def test_trusted_proxies_forward_the_client() -> None:
+    """Test that the client is the rightmost forwarded address that is not a trusted proxy."""
+    request = make_request("10.0.0.5", ["6.6.6.6, 198.51.100.1", "192.0.2.1"])
+    assert client_address(request, PROXIES) == "198.51.100.1"
+    assert client_address(make_request("10.0.0.5", ["198.51.100.1, 10.1.2.3"]), PROXIES) == "198.51.100.1"
+
+
+def test_client_unknown_behind_proxy_without_forwarding() -> None:
+    """Test that a trusted proxy's own address is never taken for the client's."""
+    assert client_address(make_request("10.0.0.5", []), PROXIES) is None
+    assert client_address(make_request("10.0.0.5", ["10.1.2.3"]), PROXIES) is None
+    assert client_address(make_request("10.0.0.5", ["198.51.100.1, "]), PROXIES) is None
@@ -0,0 +1,154 @@
+"""Test the Idempotency-Key middleware."""
+
+import threading
+import uuid
+from typing import Any, Dict, Generator, List
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from backend_core.core.idempotency import REPLAYED_HEADER, IdempotencyMiddleware
+from backend_core.core.security import create_access_token
+from backend_core.core.settings import settings
+from backend_core.db.idempotency import KeyState, StoredResponse, begin, complete
+from backend_core.db.session import SessionLocal
+from backend_core.models.idempotency_key import IdempotencyKey
+
+calls: List[Dict[str, Any]] = []
+
+app = FastAPI()
+app.add_middleware(IdempotencyMiddleware, wait_timeout=0.5)
+
+
+@app.post("/orders", status_code=201)
+def create_order(order: Dict[str, Any]) -> Dict[str, Any]:
+    """Record an order and return it with a new ID."""
+    calls.append(order)
+    return {"id": len(calls), **order}
+
+
+@app.post("/flaky")
+def flaky() -> Response:
+    """Fail on the first call only."""
+    calls.append({})
+    return Response(status_code=503 if len(calls) == 1 else 200)
+
+
+@pytest.fixture
+def client() -> Generator[TestClient, None, None]:
+    """Serve the test app, forgetting its calls and stored keys afterwards."""
+    calls.clear()
+    with TestClient(app) as test_client:
+        yield test_client
+    with SessionLocal() as db:
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.scope.like("POST /orders%")))
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.scope.like("POST /flaky%")))
+        db.commit()
+
+
+def _key() -> Dict[str, str]:
+    return {"Idempotency-Key": str(uuid.uuid4())}
+
+
+def test_replays_stored_response(client: TestClient) -> None:
+    """Test that a retry gets the first response without running the handler again."""
+    headers = _key()
+    first = client.post("/orders", json={"item": "book"}, headers=headers)
+    second = client.post("/orders", json={"item": "book"}, headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json() == {"id": 1, "item": "book"}
+    assert second.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER not in first.headers
+    assert len(calls) == 1
+
+    # Without a key, or with another one, the handler runs again
+    assert client.post("/orders", json={"item": "book"}).json()["id"] == 2
+    assert client.post("/orders", json={"item": "book"}, headers=_key()).json()["id"] == 3
+
+
+def test_rejects_key_reused_for_another_request(client: TestClient) -> None:
+    """Test that a key cannot be reused with a different body, or be malformed."""
+    headers = _key()
+    client.post("/orders", json={"item": "book"}, headers=headers)
+    assert client.post("/orders", json={"item": "pen"}, headers=headers).status_code == 422
+    assert client.post("/orders", json={"item": "pen"}, headers={"Idempotency-Key": "x" * 256}).status_code == 400
+    assert len(calls) == 1
+
+
+def test_keys_are_scoped_by_caller(client: TestClient) -> None:
+    """Test that two callers using the same key do not see each other's responses."""
+    headers = _key()
+    for _ in range(2):
+        token = create_access_token(uuid.uuid4())
+        response = client.post(
+            "/orders", json={"item": "book"}, headers={**headers, "Authorization": f"Bearer {token}"}
+        )
+        assert REPLAYED_HEADER not in response.headers
+    assert len(calls) == 2
+
+
+def test_server_errors_are_not_stored(client: TestClient) -> None:
+    """Test that a retry after a 5xx runs the request again."""
+    headers = _key()
+    assert client.post("/flaky", headers=headers).status_code == 503
+    assert client.post("/flaky", headers=headers).status_code == 200
+    assert client.post("/flaky", headers=headers).headers[REPLAYED_HEADER] == "true"
+    assert len(calls) == 2
+
+
+def _claim(key: str) -> uuid.UUID:
+    """Claim a key for the body the tests send, as a concurrent first request would."""
+    scope = {"query_string": b"", "headers": [(b"content-type", b"application/json")]}
+    fingerprint = IdempotencyMiddleware._fingerprint(scope, b'{"item":"book"}')
+    with SessionLocal() as db:
+        state, claimed, _ = begin(db, "POST /orders -", key, fingerprint)
+    assert state == KeyState.STARTED and claimed is not None
+    return claimed
+
+
+def test_duplicate_waits_for_first_response(client: TestClient) -> None:
+    """Test that a duplicate of a request in progress waits for its response instead of running."""
+    key = str(uuid.uuid4())
+    claimed = _claim(key)
+
+    def finish() -> None:
+        with SessionLocal() as db:
+            complete(db, claimed, StoredResponse(201, [("content-type", "application/json")], b'{"id":7}'))
+
+    timer = threading.Timer(0.1, finish)
+    timer.start()
+    response = client.post(
+        "/orders", content=b'{"item":"book"}', headers={"Idempotency-Key": key, "Content-Type": "application/json"}
+    )
+    timer.join()
+
+    assert response.status_code == 201
+    assert response.json() == {"id": 7}
+    assert calls == []
+
+
+def test_duplicate_gives_up_waiting(client: TestClient) -> None:
+    """Test that a duplicate answers 409 when the first request outlasts the wait."""
+    key = str(uuid.uuid4())
+    _claim(key)
+    response = client.post(
+        "/orders", content=b'{"item":"book"}', headers={"Idempotency-Key": key, "Content-Type": "application/json"}
+    )
+    assert response.status_code == 409
+    assert response.headers["Retry-After"] == "1"
+    assert calls == []
+
+
+def test_login_is_not_stored() -> None:
+    """Test that login responses, which carry credentials, are never stored."""
+    scope: Dict[str, Any] = {
+        "type": "http",
+        "method": "POST",
+        "path": f"{settings.API_V1_STR}/auth/login",
+        "headers": [(b"idempotency-key", b"abc")],
+    }
+    assert IdempotencyMiddleware._key(scope) is None
+    assert IdempotencyMiddleware._key({**scope, "path": "/orders"}) == "abc"
@@ -0,0 +1,46 @@
+"""Test primary key generation."""
+
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.orm import Session
+
+from backend_core.core.ids import new_id, uuid7, uuid7_timestamp
+from backend_core.core.settings import settings
+from backend_core.models.user import User
+
+
+def test_uuid7_layout() -> None:
+    """Test the version and variant bits and the embedded timestamp."""
+    before = time.time()
+    value = uuid7()
+    after = time.time()
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert before - 0.001 <= uuid7_timestamp(value) <= after + 0.001
+
+
+def test_uuid7_is_strictly_increasing() -> None:
+    """Test that IDs from one process sort in creation order, even within a millisecond."""
+    values = [uuid7() for _ in range(10_000)]
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_new_id_follows_setting(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the configured UUID version is generated."""
+    monkeypatch.setattr(settings, "UUID_VERSION", 4)
+    assert new_id().version == 4
+    monkeypatch.setattr(settings, "UUID_VERSION", 7)
+    assert new_id().version == 7
+
+
+def test_user_id_defaults_to_uuid7(db_session: Session) -> None:
+    """Test that new users get time-ordered IDs."""
+    now = datetime.now(timezone.utc)
+    user = User(email="ids@example.com", hashed_password="hashed_password", created_at=now, updated_at=now)
+    db_session.add(user)
+    db_session.flush()
+    assert user.id.version == 7
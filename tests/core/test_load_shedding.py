@@ -0,0 +1,154 @@
+"""Test the load-shedding middleware."""
+
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+from starlette.types import Message, Receive, Scope, Send
+
+from backend_core.core.load_shedding import LoadSheddingMiddleware, Priority, classify, requests_shed
+from backend_core.core.settings import settings
+
+
+def make_scope(path: str, method: str = "GET", authorization: bool = False) -> Scope:
+    """Build a minimal HTTP scope."""
+    headers = [(b"authorization", b"Bearer token")] if authorization else []
+    return {"type": "http", "path": path, "method": method, "headers": headers}
+
+
+class BlockingApp:
+    """ASGI app that holds every request until released."""
+
+    def __init__(self) -> None:
+        """Initialize with no requests seen."""
+        self.started: List[str] = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Record the request, wait for release, then answer 200."""
+        self.started.append(scope["path"])
+        await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def call(middleware: LoadSheddingMiddleware, scope: Scope) -> Tuple[int, Dict[str, str]]:
+    """Send a request through the middleware and return its status and headers."""
+    messages: List[Message] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b""}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    start = messages[0]
+    return start["status"], {name.decode(): value.decode() for name, value in start["headers"]}
+
+
+def make_middleware(app: Any, saturation: float = 0.0, **kwargs: Any) -> LoadSheddingMiddleware:
+    """Build a middleware with a fixed pool saturation."""
+    return LoadSheddingMiddleware(app, saturation=lambda: saturation, **kwargs)
+
+
+def test_classify() -> None:
+    """Test request priorities."""
+    assert classify(make_scope("/health")) == Priority.CRITICAL
+    assert classify(make_scope("/ready")) == Priority.CRITICAL
+    assert classify(make_scope("/metrics")) == Priority.CRITICAL
+    assert classify(make_scope(f"{settings.API_V1_STR}/users/me", authorization=True)) == Priority.HIGH
+    assert classify(make_scope(f"{settings.API_V1_STR}/users/me")) == Priority.NORMAL
+    assert classify(make_scope(f"{settings.API_V1_STR}/users/me", "PUT", authorization=True)) == Priority.NORMAL
+    assert classify(make_scope(f"{settings.API_V1_STR}/users/", "POST")) == Priority.LOW
+
+
+async def test_queued_requests_admitted_by_priority() -> None:
+    """Test that waiting requests run highest priority first, then in arrival order."""
+    app = BlockingApp()
+    middleware = make_middleware(app, max_in_flight=1, queue_timeout=5)
+
+    first = asyncio.create_task(call(middleware, make_scope("/first", authorization=True)))
+    await asyncio.sleep(0)
+    signup = asyncio.create_task(call(middleware, make_scope(f"{settings.API_V1_STR}/users/", "POST")))
+    read = asyncio.create_task(call(middleware, make_scope("/read", authorization=True)))
+    await asyncio.sleep(0)
+    assert app.started == ["/first"]
+    assert middleware.queued == 2
+
+    app.release.set()
+    results = await asyncio.gather(first, signup, read)
+    assert [status for status, _ in results] == [200, 200, 200]
+    assert app.started == ["/first", "/read", f"{settings.API_V1_STR}/users/"]
+    assert middleware.in_flight == 0
+
+
+async def test_critical_requests_bypass_the_limit() -> None:
+    """Test that health checks run even when every slot is taken."""
+    app = BlockingApp()
+    middleware = make_middleware(app, max_in_flight=1, max_queued=0)
+
+    busy = asyncio.create_task(call(middleware, make_scope("/busy")))
+    health = asyncio.create_task(call(middleware, make_scope("/health")))
+    await asyncio.sleep(0)
+    assert app.started == ["/busy", "/health"]
+
+    app.release.set()
+    await asyncio.gather(busy, health)
+
+
+async def test_full_queue_sheds_lowest_priority() -> None:
+    """Test that a full queue rejects newcomers or displaces lower-priority waiters."""
+    app = BlockingApp()
+    middleware = make_middleware(app, max_in_flight=1, max_queued=1, retry_after=7)
+    before = requests_shed.value(reason="displaced", priority="low")
+
+    busy = asyncio.create_task(call(middleware, make_scope("/busy")))
+    await asyncio.sleep(0)
+    signup = asyncio.create_task(call(middleware, make_scope(f"{settings.API_V1_STR}/users/", "POST")))
+    await asyncio.sleep(0)
+
+    assert (await call(middleware, make_scope(f"{settings.API_V1_STR}/users/", "POST")))[0] == 503
+    read = asyncio.create_task(call(middleware, make_scope("/read", authorization=True)))
+    status_code, headers = await signup
+    assert status_code == 503
+    assert headers["retry-after"] == "7"
+    assert requests_shed.value(reason="displaced", priority="low") == before + 1
+
+    app.release.set()
+    assert (await read)[0] == 200
+    await busy
+
+
+async def test_queue_timeout_sheds() -> None:
+    """Test that a request waiting too long is shed."""
+    app = BlockingApp()
+    middleware = make_middleware(app, max_in_flight=1, queue_timeout=0.01)
+
+    busy = asyncio.create_task(call(middleware, make_scope("/busy")))
+    await asyncio.sleep(0)
+    assert (await call(middleware, make_scope("/waiting")))[0] == 503
+    assert middleware.queued == 0
+
+    app.release.set()
+    await busy
+    assert middleware.in_flight == 0
+
+
+async def test_pool_saturation_sheds_below_high_priority() -> None:
+    """Test that a saturated pool sheds queued requests unless they are authenticated reads."""
+    app = BlockingApp()
+    middleware = make_middleware(app, saturation=0.95, max_in_flight=1, saturation_threshold=0.9)
+    before = requests_shed.value(reason="pool_saturated", priority="normal")
+
+    busy = asyncio.create_task(call(middleware, make_scope("/busy")))
+    await asyncio.sleep(0)
+    assert (await call(middleware, make_scope("/anonymous")))[0] == 503
+    assert requests_shed.value(reason="pool_saturated", priority="normal") == before + 1
+
+    read = asyncio.create_task(call(middleware, make_scope("/read", authorization=True)))
+    await asyncio.sleep(0)
+    assert middleware.queued == 1
+
+    app.release.set()
+    assert (await read)[0] == 200
+    await busy
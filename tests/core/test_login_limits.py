@@ -0,0 +1,16 @@
+"""Test failed-login throttling."""
+
+from backend_core.core.login_limits import LoginLimiter
+from backend_core.core.shared_memory import WindowCounters
+
+
+def test_ip_limit_applies_per_known_address() -> None:
+    """Test that the per-IP limit counts known addresses separately and skips unknown ones."""
+    limiter = LoginLimiter(WindowCounters(None), max_per_email=100, max_per_ip=2, window=60)
+    for index in range(3):
+        limiter.record_failure(f"user{index}@example.com", "198.51.100.1")
+        limiter.record_failure(f"other{index}@example.com", None)
+
+    assert limiter.retry_after("new@example.com", "198.51.100.1") is not None
+    assert limiter.retry_after("new@example.com", "198.51.100.2") is None
+    assert limiter.retry_after("new@example.com", None) is None
@@ -0,0 +1,98 @@
+"""Test structured logging."""
+
+import io
+import logging
+import queue
+import sys
+from typing import Any, Dict, List
+
+import orjson
+from fastapi.testclient import TestClient
+
+from backend_core.core.logs import (
+    JsonFormatter,
+    LogWriter,
+    QueueingHandler,
+    RequestContext,
+    records_dropped,
+    request_context,
+)
+from backend_core.core.settings import settings
+
+logger = logging.getLogger("tests.logs")
+
+
+def _lines(stream: io.StringIO) -> List[Dict[str, Any]]:
+    """Parse the JSON lines written to ``stream``."""
+    return [orjson.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_json_formatter() -> None:
+    """Test that records render as one JSON line with their extra fields and exception."""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logger.makeRecord(
+            "tests.logs", logging.ERROR, __file__, 1, "failed %s", ("twice",), None, extra={"attempts": 2}
+        )
+        record.exc_info = sys.exc_info()
+    document = orjson.loads(JsonFormatter().format(record))
+    assert document["level"] == "ERROR"
+    assert document["message"] == "failed twice"
+    assert document["attempts"] == 2
+    assert "ValueError: boom" in document["exception"]
+    assert "\n" not in JsonFormatter().format(record)
+
+
+def test_handler_samples_debug_and_drops_when_full() -> None:
+    """Test that unsampled debug records and records beyond the queue's capacity are dropped and counted."""
+    log_queue: "queue.Queue[Any]" = queue.Queue(1)
+    handler = QueueingHandler(log_queue, debug_sample_rate=0.0)
+    sampled, full = records_dropped.value(reason="sampled"), records_dropped.value(reason="queue_full")
+
+    handler.handle(logging.makeLogRecord({"levelno": logging.DEBUG, "msg": "dropped"}))
+    token = request_context.set(RequestContext("sampled-request", {}, sample_debug=True))
+    try:
+        handler.handle(logging.makeLogRecord({"levelno": logging.DEBUG, "msg": "kept %d", "args": (1,)}))
+    finally:
+        request_context.reset(token)
+    handler.handle(logging.makeLogRecord({"levelno": logging.INFO, "msg": "no room"}))
+
+    record = log_queue.get_nowait()
+    assert (record.msg, record.args, record.request_id) == ("kept 1", None, "sampled-request")
+    assert records_dropped.value(reason="sampled") == sampled + 1
+    assert records_dropped.value(reason="queue_full") == full + 1
+
+
+def test_writer_flushes_on_stop() -> None:
+    """Test that records queued before stopping are all written."""
+    stream = io.StringIO()
+    writer = LogWriter(stream=stream)
+    writer.start()
+    for index in range(100):
+        logger.warning("record %d", index)
+    writer.stop()
+    messages = [line["message"] for line in _lines(stream) if line["logger"] == "tests.logs"]
+    assert messages == [f"record {index}" for index in range(100)]
+
+
+def test_request_context_in_records(client: TestClient, token_headers: dict[str, str]) -> None:
+    """Test that requests get an ID, and their records carry it with the user and route."""
+    stream = io.StringIO()
+    writer = LogWriter(stream=stream)
+    writer.start()
+    try:
+        response = client.get(f"{settings.API_V1_STR}/users/me", headers=token_headers)
+        echoed = client.get("/", headers={"X-Request-ID": "caller-chosen"})
+    finally:
+        writer.stop()
+    assert echoed.headers["x-request-id"] == "caller-chosen"
+    request_id = response.headers["x-request-id"]
+
+    access = [line for line in _lines(stream) if line["logger"] == "backend_core.access"]
+    me = next(line for line in access if line["request_id"] == request_id)
+    assert me["route"] == f"{settings.API_V1_STR}/users/me"
+    assert me["user_id"]
+    assert me["status"] == 200
+    assert me["duration_ms"] > 0
+    assert any(line["request_id"] == "caller-chosen" for line in access)
@@ -0,0 +1,50 @@
+"""Test the memory diagnostics."""
+
+import os
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend_core.core.memory import (
+    AllocationProfiler,
+    MemorySampler,
+    gc_stats,
+    identity_map_objects,
+    identity_map_sizes,
+    resident_memory,
+)
+from backend_core.models.user import User
+
+
+def test_profiler_keeps_latest_snapshots() -> None:
+    """Test that the profiler keeps only the newest snapshots, and restarts tracing for a new depth."""
+    profiler = AllocationProfiler(max_snapshots=2)
+    try:
+        profiler.start()
+        profiler.start(3)
+        assert profiler.status()["frames"] == 3
+        taken = [profiler.take_snapshot().id for _ in range(3)]
+    finally:
+        profiler.stop()
+    assert [snapshot.id for snapshot in profiler.snapshots()] == taken[1:]
+    assert profiler.status() == {"tracing": False, "frames": 0, "traced_bytes": 0, "peak_bytes": 0, "overhead_bytes": 0}
+
+
+def test_gc_stats() -> None:
+    """Test that each collector generation is reported."""
+    stats = gc_stats()
+    assert len(stats["generations"]) == 3
+    assert {"collections", "collected", "uncollectable", "pending", "threshold"} <= set(stats["generations"][0])
+
+
+def test_identity_maps_counted(db_session: Session, test_user: User) -> None:
+    """Test that objects held by a session are counted by class, and exported by the sampler."""
+    db_session.scalars(select(User)).all()
+    sizes = identity_map_sizes()
+    assert sizes["by_class"]["User"] >= 1
+    assert sizes["largest"] >= 1
+
+    MemorySampler().sample()
+    pid = str(os.getpid())
+    assert identity_map_objects.value(pid=pid) >= 1
+    assert resident_memory.value(pid=pid) > 0
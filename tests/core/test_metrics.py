@@ -0,0 +1,67 @@
+"""Test application metrics."""
+
+import pytest
+
+from backend_core.core.metrics import MetricsRegistry
+
+
+def test_counter_with_labels() -> None:
+    """Test counting per label value and rendering the exposition format."""
+    registry = MetricsRegistry()
+    counter = registry.counter("events_total", "Events seen.", ["kind"])
+    counter.inc(kind="a")
+    counter.inc(2, kind="b")
+    counter.inc(kind="a")
+
+    assert registry.counter("events_total", "Events seen.", ["kind"]) is counter
+    assert counter.value(kind="a") == 2
+    assert counter.value(kind="c") == 0
+    assert registry.render() == (
+        "# HELP events_total Events seen.\n"
+        "# TYPE events_total counter\n"
+        'events_total{kind="a"} 2.0\n'
+        'events_total{kind="b"} 2.0\n'
+    )
+
+
+def test_counter_rejects_wrong_labels() -> None:
+    """Test that label names must match the declaration."""
+    counter = MetricsRegistry().counter("plain_total", "Plain counter.")
+    counter.inc()
+    assert counter.value() == 1
+    with pytest.raises(ValueError):
+        counter.inc(kind="a")
+
+
+def test_gauge() -> None:
+    """Test setting a gauge and rejecting a name registered as another type."""
+    registry = MetricsRegistry()
+    gauge = registry.gauge("temperature", "Current temperature.")
+    gauge.set(3.5)
+    gauge.set(1.5)
+    assert gauge.value() == 1.5
+    assert registry.render() == "# HELP temperature Current temperature.\n# TYPE temperature gauge\ntemperature 1.5\n"
+    with pytest.raises(ValueError):
+        registry.counter("temperature", "Current temperature.")
+
+
+def test_histogram() -> None:
+    """Test that observations render as cumulative buckets with a sum and count."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ["route"], buckets=[0.1, 1.0])
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(2.0, route="/a")
+
+    assert histogram.value(route="/a") == 3
+    assert registry.render() == (
+        "# HELP latency_seconds Latency.\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{route="/a",le="0.1"} 1.0\n'
+        'latency_seconds_bucket{route="/a",le="1.0"} 2.0\n'
+        'latency_seconds_bucket{route="/a",le="+Inf"} 3.0\n'
+        'latency_seconds_sum{route="/a"} 2.55\n'
+        'latency_seconds_count{route="/a"} 3.0\n'
+    )
+    with pytest.raises(TypeError):
+        histogram.inc(route="/a")
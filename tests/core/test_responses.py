@@ -0,0 +1,77 @@
+"""Test response rendering utilities."""
+
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from backend_core.core.responses import FieldSelection, ORJSONResponse, render, render_many, serialize
+from backend_core.models.user import User
+from backend_core.schemas.user import UserRead
+
+
+def make_user(email: str = "render@example.com") -> User:
+    """Build a transient user with every UserRead field populated."""
+    now = datetime.now(timezone.utc)
+    return User(
+        id=uuid.uuid4(),
+        email=email,
+        hashed_password="hashed_password",
+        first_name="Render",
+        last_name="Test",
+        is_active=True,
+        is_superuser=False,
+        created_at=now,
+    )
+
+
+def test_orjson_response_encodes_uuid_and_datetime() -> None:
+    """Test that UUID and datetime values are encoded natively."""
+    user_id = uuid.uuid4()
+    when = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    response = ORJSONResponse({"id": user_id, "when": when})
+    assert json.loads(response.body) == {"id": str(user_id), "when": "2024-01-02T03:04:05Z"}
+
+
+def test_serialize_matches_response_model() -> None:
+    """Test that the fast path produces the same JSON as validating through UserRead."""
+    user = make_user()
+    expected = UserRead.model_validate(user).model_dump(mode="json")
+    assert json.loads(ORJSONResponse(serialize(UserRead, user)).body) == expected
+    assert "hashed_password" not in serialize(UserRead, user)
+
+
+def test_render_and_render_many() -> None:
+    """Test rendering single objects and lists."""
+    users = [make_user(f"render{i}@example.com") for i in range(3)]
+
+    response = render(UserRead, users[0], status_code=201, headers={"X-Test": "1"})
+    assert response.status_code == 201
+    assert response.headers["x-test"] == "1"
+    assert json.loads(response.body)["email"] == "render0@example.com"
+
+    data = json.loads(render_many(UserRead, users).body)
+    assert [item["email"] for item in data] == [user.email for user in users]
+
+
+def test_field_selection() -> None:
+    """Test parsing sparse fieldsets into schema order, and rejecting unknown fields."""
+    select_fields = FieldSelection(UserRead)
+    assert select_fields(None) is None
+    assert select_fields("email, id,email") == ("email", "id")
+    assert select_fields(",".join(UserRead.model_fields)) is None
+
+    with pytest.raises(HTTPException) as exc_info:
+        select_fields("email,hashed_password")
+    assert exc_info.value.status_code == 400
+    with pytest.raises(HTTPException):
+        select_fields(",")
+
+
+def test_serialize_fields() -> None:
+    """Test limiting the output to a sparse fieldset."""
+    user = make_user()
+    assert serialize(UserRead, user, ("id", "email")) == {"id": user.id, "email": user.email}
+    assert json.loads(render_many(UserRead, [user], fields=("email",)).body) == [{"email": user.email}]
@@ -0,0 +1,137 @@
+"""Test the memory-mapped stores shared between worker processes."""
+
+import multiprocessing
+import time
+from pathlib import Path
+from typing import Any
+
+from backend_core.core.metrics import MetricsRegistry
+from backend_core.core.shared_memory import ARCHIVE_FILE, SharedValues, ValueFile, WindowCounters, read_value_file
+
+# Fork, so that children start without re-importing the application
+_fork = multiprocessing.get_context("fork")
+
+
+def _record_and_exit(directory: str) -> MetricsRegistry:
+    """Record a counter and a gauge in ``directory`` from a child process."""
+    registry = MetricsRegistry(SharedValues(directory))
+    registry.counter("jobs_total", "Jobs.", ["kind"]).inc(2, kind="a")
+    registry.gauge("queue_depth", "Queue depth.").set(7)
+    return registry
+
+
+def _record_and_wait(directory: str, recorded: Any, done: Any) -> None:
+    """Record metrics in ``directory`` and keep their store open until told to exit."""
+    registry = _record_and_exit(directory)
+    recorded.set()
+    done.wait(10)
+    registry.store.collect()
+
+
+def test_value_file_round_trip_and_growth(tmp_path: Path) -> None:
+    """Test that values survive reopening and that the file grows past its initial size."""
+    path = tmp_path / "values.db"
+    values = ValueFile(path)
+    values.inc("a", 1.5)
+    values.inc("a", 1.0)
+    values.set("b", -3.0)
+    for i in range(5000):
+        values.set(f"key-{i:05}", i)
+    values.close()
+
+    assert path.stat().st_size > 64 * 1024
+    reopened = ValueFile(path)
+    assert reopened.get("a") == 2.5
+    assert reopened.get("b") == -3.0
+    assert reopened.get("key-04999") == 4999
+    reopened.inc("a", 1.0)
+    reopened.close()
+    assert read_value_file(path.read_bytes())["a"] == 3.5
+
+
+def test_shared_values_sum_live_workers(tmp_path: Path) -> None:
+    """Test that any worker sees the metrics of the others while they live."""
+    recorded, done = _fork.Event(), _fork.Event()
+    child = _fork.Process(target=_record_and_wait, args=(str(tmp_path), recorded, done))
+    child.start()
+    try:
+        assert recorded.wait(10)
+        registry = MetricsRegistry(SharedValues(str(tmp_path)))
+        counter = registry.counter("jobs_total", "Jobs.", ["kind"])
+        gauge = registry.gauge("queue_depth", "Queue depth.")
+        counter.inc(kind="a")
+        gauge.set(3)
+
+        assert counter.value(kind="a") == 3
+        assert gauge.value() == 7
+    finally:
+        done.set()
+        child.join()
+
+
+def test_shared_values_archive_exited_workers(tmp_path: Path) -> None:
+    """Test that counters of exited workers are kept and their files and gauges removed."""
+    for _ in range(2):
+        child = _fork.Process(target=_record_and_exit, args=(str(tmp_path),))
+        child.start()
+        child.join()
+        assert child.exitcode == 0
+
+    store = SharedValues(str(tmp_path))
+    registry = MetricsRegistry(store)
+    counter = registry.counter("jobs_total", "Jobs.", ["kind"])
+    gauge = registry.gauge("queue_depth", "Queue depth.")
+    counter.inc(kind="a")
+
+    assert counter.value(kind="a") == 5
+    assert gauge.value() == 0
+    remaining = sorted(path.name for path in tmp_path.glob("values_*.db"))
+    assert remaining == sorted([ARCHIVE_FILE, store._own_file().path.name])
+
+
+def _hit(path: str) -> None:
+    """Hit a shared window counter from a child process."""
+    WindowCounters(Path(path)).hit("login:ip:10.0.0.1", 60)
+
+
+def test_window_counters_hit_expire_and_reset() -> None:
+    """Test counting within a window, expiry, and reset."""
+    counters = WindowCounters(slots=64)
+    assert counters.hit("a", 60)[0] == 1
+    count, expires_at = counters.hit("a", 60, amount=2)
+    assert count == 3
+    assert expires_at > time.time() + 50
+    assert counters.get("b") == (0, 0.0)
+
+    counters.reset("a")
+    assert counters.get("a") == (0, 0.0)
+
+    counters.hit("short", 0.01)
+    time.sleep(0.02)
+    assert counters.get("short") == (0, 0.0)
+    assert counters.hit("short", 60)[0] == 1
+
+
+def test_window_counters_evict_soonest_expiry_when_full() -> None:
+    """Test that a full probe sequence makes room by evicting the counter expiring first."""
+    counters = WindowCounters(slots=4, probes=4)
+    for i in range(4):
+        counters.hit(f"key-{i}", 60 + i)
+    counters.hit("new", 60)
+
+    assert counters.get("new")[0] == 1
+    assert counters.get("key-0") == (0, 0.0)
+    assert all(counters.get(f"key-{i}")[0] == 1 for i in range(1, 4))
+
+
+def test_window_counters_shared_between_processes(tmp_path: Path) -> None:
+    """Test that processes opening the same file count together."""
+    path = tmp_path / "limits.db"
+    counters = WindowCounters(path)
+    counters.hit("login:ip:10.0.0.1", 60)
+    for _ in range(2):
+        child = _fork.Process(target=_hit, args=(str(path),))
+        child.start()
+        child.join()
+
+    assert counters.get("login:ip:10.0.0.1")[0] == 3
@@ -0,0 +1,80 @@
+"""Test single-flight call coalescing."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend_core.core.singleflight import SingleFlight
+
+
+def test_do_coalesces_concurrent_threads() -> None:
+    """Test that concurrent threadpool callers share one execution."""
+    flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+    started = threading.Event()
+
+    def slow() -> int:
+        nonlocal calls
+        calls += 1
+        started.set()
+        time.sleep(0.1)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        leader = pool.submit(flight.do, "key", slow)
+        started.wait()
+        followers = [pool.submit(flight.do, "key", slow) for _ in range(7)]
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == [42] * 8
+    assert calls == 1
+    assert len(flight) == 0
+
+
+def test_do_does_not_cache() -> None:
+    """Test that sequential calls each execute."""
+    flight: SingleFlight[int] = SingleFlight()
+    counter = iter(range(10))
+    assert flight.do("key", lambda: next(counter)) == 0
+    assert flight.do("key", lambda: next(counter)) == 1
+    assert flight.do("other", lambda: next(counter)) == 2
+
+
+def test_do_shares_exceptions() -> None:
+    """Test that the leader's exception propagates and the key is released."""
+    flight: SingleFlight[int] = SingleFlight()
+
+    def fail() -> int:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: 1) == 1
+
+
+async def test_do_async_coalesces_with_threads() -> None:
+    """Test that event-loop callers join flights started by other callers."""
+    flight: SingleFlight[int] = SingleFlight()
+    calls = 0
+
+    def slow() -> int:
+        nonlocal calls
+        calls += 1
+        time.sleep(0.1)
+        return 7
+
+    thread_result: list[int] = []
+    thread = threading.Thread(target=lambda: thread_result.append(flight.do("key", slow)))
+    thread.start()
+    while len(flight) == 0:
+        await asyncio.sleep(0.001)
+
+    results = await asyncio.gather(*(flight.do_async("key", slow) for _ in range(5)))
+    thread.join()
+
+    assert results == [7] * 5
+    assert thread_result == [7]
+    assert calls == 1
@@ -0,0 +1,145 @@
+"""Test request tracing."""
+
+import io
+from typing import Any, Dict, List
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import ProgrammingError
+
+from backend_core.core.settings import settings
+from backend_core.core.tracing import (
+    Span,
+    SpanExporter,
+    Trace,
+    _current_span,
+    parse_traceparent,
+    span,
+    span_exporter,
+    to_otlp,
+    trace_engine,
+)
+from backend_core.db.session import get_db
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+def _spans(stream: io.StringIO) -> List[Dict[str, Any]]:
+    """Return the spans of every trace written to ``stream``."""
+    spans = []
+    for line in stream.getvalue().splitlines():
+        for resource_spans in orjson.loads(line)["resourceSpans"]:
+            for scope_spans in resource_spans["scopeSpans"]:
+                spans.extend(scope_spans["spans"])
+    return spans
+
+
+def test_parse_traceparent() -> None:
+    """Test that valid headers are parsed and invalid ones ignored."""
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (TRACE_ID, PARENT_ID, True)
+    assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00") == (TRACE_ID, PARENT_ID, False)
+    assert parse_traceparent(f"00-{'0' * 32}-{PARENT_ID}-01") is None
+    assert parse_traceparent(f"ff-{TRACE_ID}-{PARENT_ID}-01") is None
+    assert parse_traceparent(f"00-{TRACE_ID.upper()}-{PARENT_ID}-01") is None
+    assert parse_traceparent("garbage") is None
+
+
+def test_spans_nest_and_record_errors() -> None:
+    """Test that spans nest under the current span, record failures, and are no-ops outside a trace."""
+    with span("untraced") as untraced:
+        assert untraced is None
+
+    trace = Trace(TRACE_ID)
+    root = Span(trace, "root", None, {})
+    token = _current_span.set(root)
+    try:
+        with span("outer", answer=42):
+            with pytest.raises(ValueError):
+                with span("inner"):
+                    raise ValueError("boom")
+        session = get_db()
+        next(session)
+        session.close()
+    finally:
+        _current_span.reset(token)
+    root.end()
+
+    spans = {finished.name: finished for finished in trace.spans}
+    assert spans["inner"].parent_id == spans["outer"].span_id
+    assert spans["outer"].parent_id == root.span_id
+    assert spans["inner"].error == "ValueError: boom"
+    assert spans["db.session"].parent_id == root.span_id
+
+    encoded = {encoded["name"]: encoded for encoded in _spans(io.StringIO(orjson.dumps(to_otlp(trace)).decode()))}
+    assert encoded["outer"]["attributes"] == [{"key": "answer", "value": {"intValue": "42"}}]
+    assert encoded["inner"]["status"]["code"] == 2
+    assert "parentSpanId" not in encoded["root"]
+
+
+def test_request_joins_inbound_trace(client: TestClient, token_headers: dict[str, str]) -> None:
+    """Test that a request whose caller sampled its trace is traced within it, and an unsampled one is not."""
+    stream = io.StringIO()
+    span_exporter.stream = stream
+    span_exporter.start()
+    try:
+        headers = {**token_headers, "traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+        response = client.get(f"{settings.API_V1_STR}/users/me", headers=headers)
+        assert response.status_code == 200
+        unsampled = {**token_headers, "traceparent": f"00-{'1' * 32}-{PARENT_ID}-00"}
+        client.get(f"{settings.API_V1_STR}/users/me", headers=unsampled)
+    finally:
+        span_exporter.stop()
+        span_exporter.stream = None
+
+    spans = _spans(stream)
+    assert {finished["traceId"] for finished in spans} == {TRACE_ID}
+    by_name = {finished["name"]: finished for finished in spans}
+    root = by_name[f"GET {settings.API_V1_STR}/users/me"]
+    assert root["parentSpanId"] == PARENT_ID
+    assert root["kind"] == 2
+    assert {"key": "http.response.status_code", "value": {"intValue": "200"}} in root["attributes"]
+    assert by_name["decode_token"]["parentSpanId"] == root["spanId"]
+    assert by_name["get_user"]["parentSpanId"] == root["spanId"]
+    assert "response.encode" in by_name
+
+
+def test_statement_spans(engine: Engine) -> None:
+    """Test that statements of a traced engine are timed as spans, failed ones included."""
+    traced_engine = create_engine(engine.url)
+    trace_engine(traced_engine)
+    trace = Trace(TRACE_ID)
+    root = Span(trace, "root", None, {})
+    token = _current_span.set(root)
+    try:
+        with traced_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            with pytest.raises(ProgrammingError):
+                connection.execute(text("SELECT missing_column"))
+    finally:
+        _current_span.reset(token)
+        traced_engine.dispose()
+
+    statements = [finished for finished in trace.spans if finished.name == "db.query"]
+    assert [finished.attributes["db.statement"] for finished in statements][-2:] == [
+        "SELECT 1",
+        "SELECT missing_column",
+    ]
+    assert statements[-2].error is None
+    assert statements[-1].error is not None and "UndefinedColumn" in statements[-1].error
+    assert all(finished.parent_id == root.span_id for finished in statements)
+
+
+def test_exporter_writes_to_file(tmp_path: Any) -> None:
+    """Test that traces are appended to the export file."""
+    path = tmp_path / "traces.jsonl"
+    exporter = SpanExporter(path=str(path))
+    exporter.start()
+    trace = Trace(TRACE_ID)
+    Span(trace, "root", None, {}).end()
+    exporter.export(trace)
+    exporter.stop()
+    assert [finished["name"] for finished in _spans(io.StringIO(path.read_text()))] == ["root"]
@@ -0,0 +1,45 @@
+"""Test the startup warm-up."""
+
+import pytest
+
+from backend_core.core import warmup
+from backend_core.core.settings import settings
+from backend_core.core.warmup import WarmUp, warmup_seconds
+from backend_core.db.session import engine
+
+
+def test_warm_up_once() -> None:
+    """Test that the warm-up fills the pool, reports its time and marks readiness, once."""
+    warm_up = WarmUp()
+    assert not warm_up.ready
+    engine.dispose()
+
+    seconds = warm_up.run()
+    assert warm_up.ready
+    assert seconds > 0
+    assert warmup_seconds.value() == seconds
+    assert engine.pool.checkedin() >= settings.DB_POOL_SIZE  # type: ignore[attr-defined]
+    assert warm_up.run() == seconds
+
+
+def test_warm_up_retried_after_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a failed warm-up is logged rather than raised, and retried in the background until it succeeds."""
+    warm_up = WarmUp(max_retry_delay=0.01)
+    open_pool_connections = warmup.open_pool_connections
+    failures: list[int] = []
+
+    def flaky_open_pool_connections() -> None:
+        if len(failures) < 2:
+            failures.append(1)
+            raise ConnectionError("database is down")
+        open_pool_connections()
+
+    monkeypatch.setattr(warmup, "open_pool_connections", flaky_open_pool_connections)
+    assert not warm_up.attempt()
+    warm_up.start()
+    try:
+        assert warm_up._ready.wait(10)
+    finally:
+        warm_up.stop()
+    assert len(failures) == 2
+    assert warm_up.seconds is not None
@@ -0,0 +1,132 @@
+"""Test write-behind user activity tracking."""
+
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from sqlalchemy import delete, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backend_core.db.activity import ActivityTracker, apply_activity
+from backend_core.models.user import User
+
+
+def make_user(db_session: Session) -> User:
+    """Create a committed user."""
+    now = datetime.now(timezone.utc)
+    user = User(
+        email=f"activity_{uuid4()}@example.com",
+        hashed_password="hashed_password",
+        created_at=now,
+        updated_at=now,
+    )
+    db_session.add(user)
+    db_session.commit()
+    db_session.refresh(user)
+    return user
+
+
+def test_apply_activity(db_session: Session) -> None:
+    """Test the bulk update, including that timestamps never move backwards."""
+    first, second = make_user(db_session), make_user(db_session)
+    updated_at = first.updated_at
+    now = datetime.now(timezone.utc)
+
+    apply_activity(db_session, {first.id: (now, now), second.id: (None, now)})
+    apply_activity(db_session, {first.id: (now - timedelta(hours=1), now - timedelta(hours=1))})
+    db_session.commit()
+    db_session.refresh(first)
+    db_session.refresh(second)
+
+    assert first.last_login_at == now
+    assert first.last_seen_at == now
+    assert first.updated_at == updated_at
+    assert second.last_login_at is None
+    assert second.last_seen_at == now
+
+
+def test_apply_activity_locks_in_id_order(engine: Engine) -> None:
+    """Test that rows are locked in id order, so that concurrent flushes queue instead of deadlocking."""
+    first_id, last_id = sorted([uuid4(), uuid4()])
+    with Session(bind=engine) as setup:
+        # Stored last id first, so that a scan of the table meets the rows out of id order
+        for user_id in (last_id, first_id):
+            now = datetime.now(timezone.utc)
+            email = f"activity_{user_id}@example.com"
+            setup.add(User(id=user_id, email=email, hashed_password="hashed_password", created_at=now, updated_at=now))
+            setup.commit()
+    holder, flusher = Session(bind=engine), Session(bind=engine)
+    try:
+        holder.execute(select(User.id).where(User.id == first_id).with_for_update())
+        now = datetime.now(timezone.utc)
+        thread = threading.Thread(target=apply_activity, args=(flusher, {last_id: (now, now), first_id: (None, now)}))
+        thread.start()
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with engine.connect() as observer:
+                waiting = observer.scalar(
+                    text(
+                        "SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock' AND datname = current_database()"
+                    )
+                )
+            if waiting:
+                break
+            time.sleep(0.01)
+
+        # The flush waits for the first row without having locked the last one
+        holder.execute(select(User.id).where(User.id == last_id).with_for_update(nowait=True))
+        holder.rollback()
+        thread.join()
+        flusher.commit()
+        assert flusher.scalar(select(User.last_seen_at).where(User.id == first_id)) == now
+    finally:
+        holder.close()
+        flusher.close()
+        with Session(bind=engine) as cleanup:
+            cleanup.execute(delete(User).where(User.id.in_([first_id, last_id])))
+            cleanup.commit()
+
+
+def test_tracker_coalesces_and_flushes(db_session: Session) -> None:
+    """Test that observations are coalesced per user and flushed in one batch."""
+    user_id = make_user(db_session).id
+    tracker = ActivityTracker(flush_interval=60, max_size=10, session_factory=lambda: db_session)
+    login = datetime.now(timezone.utc) - timedelta(minutes=5)
+    seen = datetime.now(timezone.utc)
+
+    tracker.record_login(user_id, login)
+    tracker.record_seen(user_id, seen)
+    tracker.record_seen(user_id, seen - timedelta(minutes=1))
+    assert len(tracker) == 1
+
+    assert tracker.flush() == 1
+    assert len(tracker) == 0
+    assert tracker.flush() == 0
+
+    fresh = db_session.get(User, user_id)
+    assert fresh is not None
+    assert fresh.last_login_at == login
+    assert fresh.last_seen_at == seen
+
+
+def test_tracker_is_bounded() -> None:
+    """Test that activity for new users is dropped once the buffer is full."""
+    tracker = ActivityTracker(flush_interval=60, max_size=2)
+    users = [uuid4() for _ in range(3)]
+    for user_id in users:
+        tracker.record_seen(user_id)
+    tracker.record_seen(users[0])
+
+    assert len(tracker) == 2
+    assert tracker.dropped == 1
+
+
+def test_tracker_start_stop_flushes() -> None:
+    """Test that stopping the tracker flushes pending activity."""
+    tracker = ActivityTracker(flush_interval=60, max_size=10)
+    tracker.start()
+    tracker.record_seen(uuid4())
+    tracker.stop()
+    assert len(tracker) == 0
@@ -0,0 +1,150 @@
+"""Test batched audit logging."""
+
+from datetime import date, datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from backend_core.db.audit import (
+    AuditLog,
+    AuthEventType,
+    add_months,
+    drop_partitions_before,
+    ensure_partitions,
+    events_dropped,
+    events_overflowed,
+    list_partitions,
+    partition_name,
+)
+from backend_core.models.audit import auth_events
+
+
+def test_add_months_and_partition_name() -> None:
+    """Test month arithmetic and partition naming."""
+    assert add_months(date(2024, 11, 15), 2) == date(2025, 1, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert partition_name(date(2024, 3, 1)) == "auth_events_2024_03"
+
+
+def test_ensure_and_drop_partitions(db_session: Session) -> None:
+    """Test creating future partitions and dropping expired ones."""
+    ensure_partitions(db_session, date(2001, 1, 1), 3)
+    ensure_partitions(db_session, date(2001, 1, 1), 3)
+    partitions = list_partitions(db_session)
+    assert {"auth_events_2001_01", "auth_events_2001_02", "auth_events_2001_03"} <= set(partitions)
+
+    dropped = drop_partitions_before(db_session, date(2001, 3, 1))
+    assert dropped == ["auth_events_2001_01", "auth_events_2001_02"]
+    assert "auth_events_2001_03" in list_partitions(db_session)
+
+
+def test_drop_partitions_skips_other_names(db_session: Session) -> None:
+    """Test that retention leaves partitions it did not name alone instead of failing."""
+    ensure_partitions(db_session, date(2001, 1, 1), 1)
+    db_session.execute(
+        text(
+            "CREATE TABLE auth_events_legacy PARTITION OF auth_events "
+            "FOR VALUES FROM ('1990-01-01 00:00+00') TO ('1991-01-01 00:00+00')"
+        )
+    )
+    db_session.execute(
+        text(
+            "CREATE TABLE auth_events_1999_13 PARTITION OF auth_events "
+            "FOR VALUES FROM ('1999-01-01 00:00+00') TO ('1999-02-01 00:00+00')"
+        )
+    )
+
+    assert drop_partitions_before(db_session, date(2001, 3, 1)) == ["auth_events_2001_01"]
+    assert {"auth_events_legacy", "auth_events_1999_13"} <= set(list_partitions(db_session))
+
+
+def test_audit_log_batches_events(db_session: Session) -> None:
+    """Test that queued events are inserted together on flush."""
+    audit_log = AuditLog(flush_interval=60, max_size=100, session_factory=lambda: db_session)
+    user_id = uuid4()
+    audit_log.record(AuthEventType.LOGIN_FAILURE, user_id=user_id, email="audit@example.com")
+    audit_log.record(AuthEventType.LOGIN_SUCCESS, user_id=user_id, email="audit@example.com")
+    audit_log.record(AuthEventType.TOKEN_ISSUED, user_id=user_id, email="audit@example.com")
+    assert len(audit_log) == 3
+
+    assert audit_log.flush() == 3
+    assert len(audit_log) == 0
+
+    rows = db_session.execute(
+        select(auth_events.c.event_type).where(auth_events.c.user_id == user_id).order_by(auth_events.c.occurred_at)
+    ).all()
+    assert [row.event_type for row in rows] == ["login_failure", "login_success", "token_issued"]
+    current = partition_name(datetime.now(timezone.utc).date())
+    assert current in list_partitions(db_session)
+
+
+def test_audit_log_retention_failure_keeps_events(db_session: Session) -> None:
+    """Test that a failing retention run neither fails the flush nor undoes its inserts."""
+    unreachable = create_engine("postgresql+psycopg2://nobody@127.0.0.1:1/none")
+    sessions = iter([db_session, Session(unreachable)])
+    audit_log = AuditLog(flush_interval=60, max_size=100, session_factory=lambda: next(sessions))
+    user_id = uuid4()
+    audit_log.record(AuthEventType.LOGIN_SUCCESS, user_id=user_id)
+
+    assert audit_log.flush() == 1
+    count = db_session.scalar(select(func.count()).select_from(auth_events).where(auth_events.c.user_id == user_id))
+    assert count == 1
+
+
+def test_audit_log_wakes_flusher_when_full(db_session: Session) -> None:
+    """Test that a full buffer is written by the background flusher, not the recording caller."""
+    audit_log = AuditLog(flush_interval=60, max_size=2, session_factory=lambda: db_session)
+    user_id = uuid4()
+    audit_log.record(AuthEventType.LOGIN_SUCCESS, user_id=user_id)
+    audit_log.record(AuthEventType.TOKEN_ISSUED, user_id=user_id)
+    assert len(audit_log) == 2
+    assert audit_log._wakeup.is_set()
+
+    audit_log.start()
+    try:
+        audit_log.record(AuthEventType.LOGIN_SUCCESS, user_id=user_id)
+    finally:
+        audit_log.stop()
+    count = db_session.scalar(select(func.count()).select_from(auth_events).where(auth_events.c.user_id == user_id))
+    assert count == 3
+
+
+def test_audit_log_records_while_writes_fail() -> None:
+    """Test that failing writes neither reach the recording caller nor lose events."""
+
+    unreachable = create_engine("postgresql+psycopg2://nobody@127.0.0.1:1/none")
+    audit_log = AuditLog(flush_interval=60, max_size=2, full_wait=0.01, session_factory=lambda: Session(unreachable))
+    before = events_overflowed.value()
+    for _ in range(4):
+        audit_log.record(AuthEventType.LOGIN_FAILURE, email="audit@example.com")
+    assert len(audit_log) == 4
+    assert events_overflowed.value() == before + 2
+
+    audit_log.start()
+    try:
+        audit_log.record(AuthEventType.LOGIN_FAILURE, email="audit@example.com")
+        with pytest.raises(OperationalError):
+            audit_log.flush()
+    finally:
+        audit_log.stop()
+    assert len(audit_log) == 5
+
+
+def test_audit_log_drops_events_past_hard_limit() -> None:
+    """Test that the buffer stops growing at its hard limit while writes fail."""
+    unreachable = create_engine("postgresql+psycopg2://nobody@127.0.0.1:1/none")
+    audit_log = AuditLog(
+        flush_interval=60, max_size=2, full_wait=0.01, hard_limit=3, session_factory=lambda: Session(unreachable)
+    )
+    before = events_dropped.value()
+    for _ in range(5):
+        audit_log.record(AuthEventType.LOGIN_FAILURE, email="audit@example.com")
+    assert len(audit_log) == 3
+    assert events_dropped.value() == before + 2
+
+    with pytest.raises(OperationalError):
+        audit_log.flush()
+    assert len(audit_log) == 3
@@ -0,0 +1,85 @@
+"""Test chunked bulk user operations."""
+
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend_core.core.etag import UserETag, user_etags
+from backend_core.db.bulk import BulkJobRunner, claim_job, job_values, run_chunk, submit_job, user_condition
+from backend_core.models.bulk_job import BulkAction, BulkJob, BulkJobStatus
+from backend_core.models.user import User
+
+OLD = datetime(2001, 1, 1, tzinfo=timezone.utc)
+
+
+def add_users(db: Session, count: int, created_at: datetime = OLD) -> List[User]:
+    """Add active users created at ``created_at``."""
+    users = [
+        User(email=f"bulk{i}@example.com", hashed_password="hashed", created_at=created_at, updated_at=created_at)
+        for i in range(count)
+    ]
+    db.add_all(users)
+    db.commit()
+    return users
+
+
+def test_chunks_resume_after_crash(db_session: Session) -> None:
+    """Test that a job applies bounded chunks and resumes after its runner disappears."""
+    users = add_users(db_session, 5)
+    cutoff = (OLD + timedelta(days=1)).isoformat()
+    job = submit_job(db_session, BulkAction.DEACTIVATE, {"filter": {"created_before": cutoff}}, created_by=None)
+    assert job.status == BulkJobStatus.PENDING
+
+    claimed = claim_job(db_session)
+    assert claimed is job and job.status == BulkJobStatus.RUNNING and job.total == 5
+    assert run_chunk(db_session, job, chunk_size=2) == 2
+    # Another runner cannot take a job whose lease is current
+    assert claim_job(db_session) is None
+
+    # The runner crashes and its lease runs out
+    job.lease_expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    db_session.commit()
+    assert claim_job(db_session) is job
+    assert job.processed == 2
+    assert run_chunk(db_session, job, chunk_size=2) == 2
+    assert run_chunk(db_session, job, chunk_size=2) == 1
+    assert run_chunk(db_session, job, chunk_size=2) == 0
+    assert job.status == BulkJobStatus.SUCCEEDED and job.processed == 5 and job.finished_at is not None
+
+    for user in users:
+        db_session.refresh(user)
+        assert user.is_active is False
+
+
+def test_runner_updates_by_ids(db_session: Session) -> None:
+    """Test that the runner applies an update job to the given users and drops their cached ETags."""
+    ids = [user.id for user in add_users(db_session, 3)]
+    user_etags.set(str(ids[0]), UserETag('"stale"', 0))
+    params = {"ids": [str(ids[0]), str(ids[1])], "values": {"first_name": "Bulk", "is_superuser": True}}
+    job_id = submit_job(db_session, BulkAction.UPDATE, params, created_by=None).id
+
+    runner = BulkJobRunner(chunk_pause=0, session_factory=lambda: db_session)
+    assert runner.process_next()
+    assert not runner.process_next()
+
+    # The runner closed its session, so reload what it changed
+    db_session.expunge_all()
+    job = db_session.get(BulkJob, job_id)
+    assert job is not None and job.status == BulkJobStatus.SUCCEEDED and job.total == 2 and job.processed == 2
+    users = db_session.scalars(select(User).where(User.id.in_(ids))).all()
+    changed = {user.id: (user.first_name, user.is_superuser) for user in users}
+    assert changed == {ids[0]: ("Bulk", True), ids[1]: ("Bulk", True), ids[2]: (None, False)}
+    assert user_etags.get(str(ids[0])) is None
+
+
+def test_null_values_and_criteria_ignored(db_session: Session) -> None:
+    """Test that nulls in a job's stored values and filter are ignored rather than written or matched."""
+    params = {"ids": [], "values": {"first_name": "Renamed", "is_active": None}}
+    job = submit_job(db_session, BulkAction.UPDATE, params, created_by=None)
+    assert job_values(job) == {"first_name": "Renamed"}
+
+    (user,) = add_users(db_session, 1)
+    condition = user_condition({"filter": {"is_active": None, "created_before": "2002-01-01T00:00:00+00:00"}})
+    assert db_session.scalars(select(User.id).where(condition)).all() == [user.id]
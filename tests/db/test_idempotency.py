@@ -0,0 +1,52 @@
+"""Test idempotency key storage."""
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend_core.db.idempotency import KeyState, StoredResponse, begin, complete, purge_expired, release
+from backend_core.models.idempotency_key import IdempotencyKey
+
+SCOPE = "POST /api/v1/users/ -"
+RESPONSE = StoredResponse(201, [("content-type", "application/json")], b'{"ok":true}')
+
+
+def test_first_request_claims_and_duplicates_wait(db_session: Session) -> None:
+    """Test that one request claims a key, and the others see it in progress, then its response."""
+    state, claimed, stored = begin(db_session, SCOPE, "key-1", "fingerprint")
+    assert state == KeyState.STARTED and claimed is not None and stored is None
+
+    assert begin(db_session, SCOPE, "key-1", "fingerprint") == (KeyState.IN_PROGRESS, None, None)
+    assert begin(db_session, SCOPE, "key-1", "other") == (KeyState.MISMATCH, None, None)
+    # The same key in another scope is another key
+    assert begin(db_session, "POST /api/v1/users/ someone", "key-1", "other")[0] == KeyState.STARTED
+
+    complete(db_session, claimed, RESPONSE)
+    assert begin(db_session, SCOPE, "key-1", "fingerprint") == (KeyState.COMPLETED, None, RESPONSE)
+
+
+def test_released_and_abandoned_keys_are_claimed_again(db_session: Session) -> None:
+    """Test that a failed request's key, and one whose owner's lease ran out, can be claimed again."""
+    _, claimed, _ = begin(db_session, SCOPE, "key-2", "fingerprint")
+    assert claimed is not None
+    release(db_session, claimed)
+    state, reclaimed, _ = begin(db_session, SCOPE, "key-2", "fingerprint", lease=-1)
+    assert state == KeyState.STARTED and reclaimed is not None
+
+    # The lease ran out, so a retry takes the key over, and the old owner can no longer complete it
+    state, taken_over, _ = begin(db_session, SCOPE, "key-2", "fingerprint")
+    assert state == KeyState.STARTED and taken_over not in (None, reclaimed)
+    assert reclaimed is not None
+    complete(db_session, reclaimed, RESPONSE)
+    assert begin(db_session, SCOPE, "key-2", "fingerprint")[0] == KeyState.IN_PROGRESS
+
+
+def test_expired_keys_are_reused_and_purged(db_session: Session) -> None:
+    """Test that an expired response no longer binds its key and is purged."""
+    _, claimed, _ = begin(db_session, SCOPE, "key-3", "fingerprint", ttl=-1)
+    assert claimed is not None
+    complete(db_session, claimed, RESPONSE)
+    assert begin(db_session, SCOPE, "key-3", "other", ttl=-1)[0] == KeyState.STARTED
+
+    assert purge_expired(db_session) >= 1
+    count = db_session.scalar(select(func.count()).select_from(IdempotencyKey).where(IdempotencyKey.key == "key-3"))
+    assert count == 0
@@ -0,0 +1,105 @@
+"""Test the cache invalidation bus."""
+
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backend_core.core.etag import UserETag, user_etags
+from backend_core.db.invalidation import InvalidationListener, invalidation_listener
+from backend_core.models.user import User
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 10.0) -> bool:
+    """Poll ``condition`` until it holds or ``timeout`` seconds pass."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_dispatch_by_topic() -> None:
+    """Test that messages reach the callbacks of their topic only, and malformed ones are ignored."""
+    listener = InvalidationListener()
+    evicted: List[Dict[str, Any]] = []
+    flushed: List[str] = []
+    listener.subscribe("users", evicted.append, lambda: flushed.append("users"))
+    listener.subscribe("bulk_jobs", lambda keys: evicted.append({"unexpected": keys}), lambda: flushed.append("jobs"))
+
+    listener.dispatch('{"topic": "users", "op": "UPDATE", "keys": {"email": "a@example.com"}}')
+    listener.dispatch("not json")
+    listener.dispatch('{"topic": "users"}')
+    listener.flush_all()
+
+    assert evicted == [{"email": "a@example.com"}]
+    assert flushed == ["users", "jobs"]
+
+
+def test_user_etags_evicted_by_changes() -> None:
+    """Test that the ETag cache subscribes to user changes."""
+    user_id = "01a153bd-f434-7629-9d07-6644ad9b6b95"
+    user_etags.set(user_id, UserETag('"etag"', 0))
+    invalidation_listener.dispatch(
+        f'{{"topic": "users", "op": "UPDATE", "keys": {{"id": "{user_id}", "email": "etag@example.com"}}}}'
+    )
+    assert user_etags.get(user_id) is None
+
+
+def test_committed_user_changes_are_published(engine: Engine) -> None:
+    """Test that committed updates and deletes of users reach the listener, and activity updates do not."""
+    listener = InvalidationListener(engine=engine, keepalive=0.2)
+    evicted: List[Dict[str, Any]] = []
+    flushes: List[None] = []
+    listener.subscribe("users", evicted.append, lambda: flushes.append(None))
+    listener.start()
+    db = Session(bind=engine)
+    try:
+        assert listener.wait_connected(10)
+        assert len(flushes) == 1
+
+        now = datetime.now(timezone.utc)
+        user = User(email="invalidation@example.com", hashed_password="hashed", created_at=now, updated_at=now)
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+        db.execute(update(User).where(User.id == user_id).values(last_seen_at=now, updated_at=User.updated_at))
+        db.commit()
+        db.execute(update(User).where(User.id == user_id).values(first_name="Changed"))
+        # Not committed, so not published
+        db.rollback()
+        db.execute(update(User).where(User.id == user_id).values(first_name="Changed", updated_at=now))
+        db.commit()
+        db.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+        db.commit()
+
+        assert _wait_for(lambda: len(evicted) >= 2)
+        time.sleep(0.2)
+        assert evicted == [{"id": str(user_id), "email": "invalidation@example.com"}] * 2
+    finally:
+        db.close()
+        listener.stop()
+    assert not listener.connected
+
+
+def test_reconnect_flushes_caches(engine: Engine) -> None:
+    """Test that the listener reconnects after losing its connection and flushes every cache."""
+    listener = InvalidationListener(engine=engine, keepalive=0.2)
+    flushes: List[None] = []
+    listener.subscribe("users", lambda keys: None, lambda: flushes.append(None))
+    listener.start()
+    try:
+        assert listener.wait_connected(10)
+        backend_pid = listener._connection.get_backend_pid()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": backend_pid})
+
+        assert _wait_for(lambda: len(flushes) == 2 and listener.connected)
+        assert listener._connection.get_backend_pid() != backend_pid
+    finally:
+        listener.stop()
@@ -0,0 +1,184 @@
+"""Test zero-downtime migration helpers and the lock pre-flight check."""
+
+import threading
+from typing import Generator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from backend_core.db.migration_ops import (
+    add_constraint_not_valid,
+    backfill,
+    create_index_concurrently,
+    drop_index_concurrently,
+    execute_with_retry,
+    validate_constraint,
+)
+from backend_core.db.migrations import (
+    NO_TABLE_LOCK,
+    StatementLock,
+    _split_statements,
+    check_pending_migrations,
+    classify_statement,
+    format_report,
+)
+
+TABLE = "migration_ops_test"
+
+
+@pytest.fixture
+def migration(engine: Engine) -> Generator[Connection, None, None]:
+    """Run the test body as a migration on a scratch table with a short lock timeout."""
+    with engine.connect() as setup:
+        setup.execute(text(f"CREATE TABLE {TABLE} (id integer PRIMARY KEY, value integer)"))
+        setup.execute(text(f"INSERT INTO {TABLE} (id) SELECT generate_series(1, 25)"))
+        setup.commit()
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SET lock_timeout = 100"))
+            connection.commit()
+            context = MigrationContext.configure(connection)
+            with Operations.context(context), context.begin_transaction():
+                yield connection
+    finally:
+        with engine.connect() as teardown:
+            teardown.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+            teardown.commit()
+
+
+def test_classify_statement() -> None:
+    """Test the lock modes reported for common DDL."""
+    assert classify_statement("CREATE INDEX CONCURRENTLY ix ON users (email)") == ("SHARE UPDATE EXCLUSIVE", "users")
+    assert classify_statement("CREATE UNIQUE INDEX ix ON users (email)") == ("SHARE", "users")
+    assert classify_statement("ALTER TABLE users ADD COLUMN age integer") == ("ACCESS EXCLUSIVE", "users")
+    assert classify_statement("ALTER TABLE users VALIDATE CONSTRAINT ck") == ("SHARE UPDATE EXCLUSIVE", "users")
+    fk = "ALTER TABLE events ADD CONSTRAINT fk FOREIGN KEY (user_id) REFERENCES users (id) NOT VALID"
+    assert classify_statement(fk) == ("SHARE ROW EXCLUSIVE", "events")
+    assert classify_statement("UPDATE users SET age = 0 WHERE age IS NULL") == ("ROW EXCLUSIVE", "users")
+    assert classify_statement("CREATE TABLE things (id integer)") == (NO_TABLE_LOCK, "things")
+    assert classify_statement("SELECT pg_advisory_lock(1)") == (None, None)
+
+    lock = StatementLock("rev", "ALTER TABLE users ADD COLUMN age integer", "users", "ACCESS EXCLUSIVE")
+    assert lock.blocks_reads and lock.blocks_writes
+
+
+def test_classify_partition() -> None:
+    """Test that creating a partition reports the lock on its parent."""
+    partition = "CREATE TABLE IF NOT EXISTS auth_events_2026_10 PARTITION OF auth_events FOR VALUES FROM ('2026-10-01')"
+    assert classify_statement(partition) == ("ACCESS EXCLUSIVE", "auth_events")
+
+
+def test_classify_foreign_key_table() -> None:
+    """Test that creating a table with a foreign key reports the lock on the referenced table."""
+    table = "CREATE TABLE events (id integer, user_id integer REFERENCES users (id))"
+    assert classify_statement(table) == ("SHARE ROW EXCLUSIVE", "users")
+
+
+def test_classify_trigger() -> None:
+    """Test that creating a trigger reports the lock on its table."""
+    trigger = "CREATE TRIGGER audit AFTER UPDATE ON users FOR EACH ROW EXECUTE FUNCTION audit()"
+    assert classify_statement(trigger) == ("SHARE ROW EXCLUSIVE", "users")
+    assert StatementLock("rev", trigger, "users", "SHARE ROW EXCLUSIVE").blocks_writes
+
+
+def test_classify_refresh_concurrently() -> None:
+    """Test that a concurrent refresh blocks writes but not reads."""
+    refresh = "REFRESH MATERIALIZED VIEW CONCURRENTLY user_stats_totals"
+    assert classify_statement(refresh) == ("EXCLUSIVE", "user_stats_totals")
+    lock = StatementLock("rev", refresh, "user_stats_totals", "EXCLUSIVE")
+    assert lock.blocks_writes and not lock.blocks_reads
+    assert classify_statement("REFRESH MATERIALIZED VIEW user_stats_totals") == (
+        "ACCESS EXCLUSIVE",
+        "user_stats_totals",
+    )
+
+
+def test_split_keeps_function_bodies() -> None:
+    """Test that statements inside a dollar-quoted function body are not split apart."""
+    sql = (
+        "CREATE FUNCTION f() RETURNS trigger AS $$\nBEGIN\n  PERFORM 1;\n  RETURN NEW;\nEND;\n$$ LANGUAGE plpgsql;\n"
+        "\nSET x = 1;\n"
+    )
+    statements = _split_statements(sql)
+    assert len(statements) == 2
+    assert classify_statement(statements[0]) == (NO_TABLE_LOCK, None)
+
+
+def test_format_report_unknown() -> None:
+    """Test that unclassified statements are reported as unknown rather than ok."""
+    report = format_report(
+        [
+            StatementLock("rev", "SELECT pg_advisory_lock(1)", None, None),
+            StatementLock("rev", "CREATE TABLE things (id integer)", "things", NO_TABLE_LOCK),
+        ]
+    )
+    unknown, created = report.splitlines()
+    assert "unknown" in unknown and "ok" not in unknown
+    assert "ok" in created
+
+
+def test_no_pending_migrations() -> None:
+    """Test that a database at head has nothing to report."""
+    assert check_pending_migrations() == []
+
+
+def test_create_index_concurrently(migration: Connection) -> None:
+    """Test building and dropping an index outside the migration transaction, idempotently."""
+    create_index_concurrently("ix_migration_ops_test_value", TABLE, "value", where="value IS NOT NULL")
+    create_index_concurrently("ix_migration_ops_test_value", TABLE, "value", where="value IS NOT NULL")
+    valid = migration.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass('ix_migration_ops_test_value')")
+    ).scalar()
+    assert valid is True
+
+    drop_index_concurrently("ix_migration_ops_test_value")
+    assert migration.execute(text("SELECT to_regclass('ix_migration_ops_test_value')")).scalar() is None
+
+
+def test_backfill_in_batches(migration: Connection) -> None:
+    """Test that a backfill visits every row once, in batches."""
+    migration.execute(text(f"UPDATE {TABLE} SET value = 0 WHERE id <= 5"))
+    assert backfill(TABLE, "value = id * 2", "value IS NULL", batch_size=10) == 20
+    assert migration.execute(text(f"SELECT count(*) FROM {TABLE} WHERE value = id * 2")).scalar() == 20
+    assert backfill(TABLE, "value = id * 2", "value IS NULL", batch_size=10) == 0
+
+
+def test_backfill_uuid_keys(migration: Connection) -> None:
+    """Test batching over a UUID key, which has no max() aggregate."""
+    assert backfill("users", "updated_at = updated_at", "false", batch_size=2) == 0
+
+
+def test_not_valid_constraint_then_validate(migration: Connection) -> None:
+    """Test that NOT VALID skips existing rows and VALIDATE checks them."""
+    add_constraint_not_valid(TABLE, "ck_migration_ops_test_value", "CHECK (value IS NOT NULL)")
+    with pytest.raises(IntegrityError):
+        validate_constraint(TABLE, "ck_migration_ops_test_value")
+
+    backfill(TABLE, "value = 1", "value IS NULL")
+    validate_constraint(TABLE, "ck_migration_ops_test_value")
+    validated = migration.execute(
+        text("SELECT convalidated FROM pg_constraint WHERE conname = 'ck_migration_ops_test_value'")
+    ).scalar()
+    assert validated is True
+
+
+def test_execute_with_retry_waits_out_lock(migration: Connection, engine: Engine) -> None:
+    """Test that a statement blocked by another transaction is retried until the lock is released."""
+    with engine.connect() as blocker:
+        blocker.execute(text(f"LOCK TABLE {TABLE} IN ACCESS SHARE MODE"))
+        with pytest.raises(OperationalError):
+            execute_with_retry(f"ALTER TABLE {TABLE} ADD COLUMN first integer", attempts=2, backoff=0.01)
+
+        release = threading.Timer(0.3, blocker.rollback)
+        release.start()
+        execute_with_retry(f"ALTER TABLE {TABLE} ADD COLUMN second integer", attempts=10, backoff=0.05)
+        release.join()
+
+    columns = migration.execute(
+        text("SELECT column_name FROM information_schema.columns WHERE table_name = :table"), {"table": TABLE}
+    ).scalars()
+    assert set(columns) == {"id", "value", "second"}
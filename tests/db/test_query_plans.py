@@ -0,0 +1,60 @@
+"""Test the query plan regression checks."""
+
+from typing import Any, Dict
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from backend_core.db.query_plans import PlanSummary, capture_plans, find_regressions, load_baseline, seed, summarize
+
+
+def test_hot_query_plans_match_baseline(db_session: Session) -> None:
+    """Test that every hot statement keeps the plan recorded in the baseline."""
+    plans = capture_plans(db_session, seed(db_session))
+    assert find_regressions(plans, load_baseline()) == []
+
+
+def test_dropped_index_is_caught(db_session: Session) -> None:
+    """Test that losing the email index turns the login lookup into a reported sequential scan."""
+    data = seed(db_session)
+    db_session.execute(text("DROP INDEX users_email_idx"))
+    regressions = find_regressions(capture_plans(db_session, data), load_baseline())
+    assert "user_by_email: sequential scan on users" in regressions
+    assert any(problem.startswith("user_by_email: plan changed shape") for problem in regressions)
+
+
+def test_summarize_plan() -> None:
+    """Test that a plan is reduced to its shape, cost, sequential scans and spilled blocks."""
+    plan: Dict[str, Any] = {
+        "Node Type": "Sort",
+        "Total Cost": 120.5,
+        "Temp Written Blocks": 12,
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "users", "Total Cost": 100.0},
+            {"Node Type": "Index Scan", "Relation Name": "users", "Index Name": "users_pkey", "Total Cost": 8.3},
+        ],
+    }
+    assert summarize(plan) == PlanSummary(
+        shape=["Sort", "  Seq Scan on users", "  Index Scan on users using users_pkey"],
+        cost=120.5,
+        seq_scans=["users"],
+        temp_blocks=12,
+    )
+
+
+def test_find_regressions_against_baseline() -> None:
+    """Test that spills, cost increases and missing baselines are reported, and allowed scans are not."""
+    baseline = {
+        "get_multi": {"shape": ["Limit", "  Seq Scan on users"], "cost": 6.0},
+        "user_by_id": {"shape": ["Index Scan on users using users_pkey"], "cost": 8.0},
+    }
+    plans = {
+        "get_multi": PlanSummary(["Limit", "  Seq Scan on users"], 7.0, ["users"], 0),
+        "user_by_id": PlanSummary(["Index Scan on users using users_pkey"], 20.0, [], 3),
+        "user_by_email": PlanSummary(["Limit", "  Index Scan on users using users_email_idx"], 8.0, [], 0),
+    }
+    assert find_regressions(plans, baseline) == [
+        "user_by_id: spilled 3 blocks to temporary files",
+        "user_by_id: estimated cost 20.00 is above the baseline 8.00",
+        "user_by_email: no baseline; run with --update to record one",
+    ]
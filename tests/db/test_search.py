@@ -0,0 +1,142 @@
+"""Test user search."""
+
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+from backend_core.db.search import (
+    RANK_EMAIL_PREFIX,
+    RANK_EXACT_EMAIL,
+    RANK_FIRST_NAME_PREFIX,
+    RANK_LAST_NAME_PREFIX,
+    SearchKey,
+    decode_cursor,
+    encode_cursor,
+    search_statement,
+    search_users,
+    trigram_search_available,
+)
+from backend_core.models.user import User
+
+
+def add_user(db: Session, email: str, first_name: Optional[str] = None, last_name: Optional[str] = None) -> User:
+    """Add a user with the given email and names."""
+    now = datetime.now(timezone.utc)
+    user = User(
+        email=email,
+        hashed_password="hashed_password",
+        first_name=first_name,
+        last_name=last_name,
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(user)
+    return user
+
+
+def emails(db: Session, query: str, limit: int = 10, after: Optional[SearchKey] = None) -> List[str]:
+    """Return the emails of the search results."""
+    return [user.email for user, _ in search_users(db, query, limit=limit, after=after)]
+
+
+def test_search_ranks_prefix_matches(db_session: Session) -> None:
+    """Test that exact email matches come first, then email prefixes, then name prefixes."""
+    add_user(db_session, "ann.lee@example.com")
+    add_user(db_session, "ann@example.com")
+    add_user(db_session, "zed@example.com", first_name="Annabel")
+    add_user(db_session, "bob@example.com", last_name="Ann")
+    add_user(db_session, "joanne@example.com")
+    db_session.flush()
+
+    results = search_users(db_session, "ANN@example.com", limit=10)
+    assert [(user.email, key.rank) for user, key in results] == [("ann@example.com", RANK_EXACT_EMAIL)]
+
+    results = search_users(db_session, "Ann", limit=10)
+    ranks = [key.rank for _, key in results]
+    assert ranks == sorted(ranks, reverse=True)
+    assert {user.email for user, key in results if key.rank == RANK_EMAIL_PREFIX} == {
+        "ann.lee@example.com",
+        "ann@example.com",
+    }
+    assert [(user.email, key.rank) for user, key in results if key.rank < RANK_EMAIL_PREFIX] == [
+        ("zed@example.com", RANK_FIRST_NAME_PREFIX),
+        ("bob@example.com", RANK_LAST_NAME_PREFIX),
+    ]
+    if not trigram_search_available(db_session):
+        assert "joanne@example.com" not in {user.email for user, _ in results}
+
+
+def test_search_keyset_pagination(db_session: Session) -> None:
+    """Test that pages resume after the cursor without gaps or repeats."""
+    for i in range(7):
+        add_user(db_session, f"page{i}@example.com", first_name="Pager" if i % 2 else None)
+    db_session.flush()
+
+    everything = emails(db_session, "page", limit=100)
+    paged: List[str] = []
+    after = None
+    while True:
+        results = search_users(db_session, "page", limit=3, after=after)
+        paged += [user.email for user, _ in results]
+        if len(results) < 3:
+            break
+        after = decode_cursor(encode_cursor(results[-1][1]))
+    assert paged == everything
+    assert len(everything) == 7
+
+
+def test_search_loads_requested_keys(db_session: Session) -> None:
+    """Test that a sparse search loads only the requested columns."""
+    add_user(db_session, "sparse@example.com", first_name="Sparse")
+    db_session.commit()
+    db_session.expunge_all()
+
+    ((user, _),) = search_users(db_session, "sparse@", limit=10, keys=["email"])
+    assert user.email == "sparse@example.com"
+    assert {"first_name", "hashed_password"} <= inspect(user).unloaded
+
+
+def test_search_escapes_like_wildcards(db_session: Session) -> None:
+    """Test that LIKE wildcards in the query are matched literally."""
+    add_user(db_session, "under_score@example.com")
+    add_user(db_session, "underxscore@example.com")
+    db_session.flush()
+
+    assert emails(db_session, "under_") == ["under_score@example.com"]
+    assert emails(db_session, "%score") == []
+
+
+def test_search_uses_prefix_indexes(db_session: Session) -> None:
+    """Test that each prefix tier is answered from its index, without a sort of all matches."""
+    db_session.execute(text("SET LOCAL enable_seqscan = off"))
+    db_session.execute(text("SET LOCAL enable_sort = off"))
+    statement = search_statement(db_session, "ann", limit=20)
+    assert statement is not None
+    compiled = statement.compile(db_session.get_bind(), compile_kwargs={"literal_binds": True})
+    plan = "\n".join(row[0] for row in db_session.execute(text(f"EXPLAIN {compiled}")))
+    assert "ix_users_email_lower_prefix" in plan
+    assert "ix_users_first_name_lower_prefix" in plan
+    assert "ix_users_last_name_lower_prefix" in plan
+
+
+def test_search_fuzzy_matches(db_session: Session) -> None:
+    """Test that misspelled queries find users when pg_trgm is installed."""
+    if not trigram_search_available(db_session):
+        pytest.skip("pg_trgm is not installed")
+    add_user(db_session, "someone@example.com", first_name="Jonathan", last_name="Smithers")
+    db_session.flush()
+
+    assert "someone@example.com" in emails(db_session, "jonathon")
+
+
+def test_decode_cursor_rejects_garbage() -> None:
+    """Test that malformed cursors raise ValueError."""
+    key = SearchKey(RANK_FIRST_NAME_PREFIX, "ann", 0.25, uuid.uuid4())
+    assert decode_cursor(encode_cursor(key)) == key
+    for cursor in ("not-base64!", encode_cursor(key)[:-4], "W10="):
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
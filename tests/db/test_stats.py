@@ -0,0 +1,71 @@
+"""Test user statistics views."""
+
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from backend_core.db.stats import StatsRefresher, approximate_count, refresh_stats_views, user_stats
+from backend_core.models.user import User
+
+
+def test_refresh_and_read_stats(db_session: Session) -> None:
+    """Test that refreshed views count users, signups per day and per week."""
+    assert refresh_stats_views(db_session)
+    before = user_stats(db_session, days=30, weeks=4)
+
+    now = datetime.now(timezone.utc)
+    week_ago = now - timedelta(days=7)
+    for i, created_at in enumerate([now, now, week_ago]):
+        db_session.add(
+            User(
+                email=f"stats{i}@example.com",
+                hashed_password="hashed",
+                is_superuser=i == 0,
+                created_at=created_at,
+                updated_at=created_at,
+            )
+        )
+    db_session.flush()
+
+    # The views only change when refreshed
+    assert user_stats(db_session, days=30, weeks=4)["total"] == before["total"]
+    assert refresh_stats_views(db_session)
+    after = user_stats(db_session, days=30, weeks=4)
+
+    assert after["total"] == before["total"] + 3
+    assert after["active"] == before["active"] + 3
+    assert after["superusers"] == before["superusers"] + 1
+
+    def signups(stats: Dict[str, Any], period: date, key: str) -> int:
+        return sum(row["signups"] for row in stats[key] if row["period"] == period)
+
+    today, last_week = now.date(), week_ago.date()
+    assert signups(after, today, "signups_per_day") == signups(before, today, "signups_per_day") + 2
+    assert signups(after, last_week, "signups_per_day") == signups(before, last_week, "signups_per_day") + 1
+    monday = today - timedelta(days=today.weekday())
+    assert signups(after, monday, "signups_per_week") == signups(before, monday, "signups_per_week") + 2
+    assert [row["period"] for row in after["signups_per_day"]] == sorted(
+        row["period"] for row in after["signups_per_day"]
+    )
+
+
+def test_refresh_skipped_while_another_session_refreshes(db_session: Session, engine: Engine) -> None:
+    """Test that only one session refreshes the views at a time."""
+    other = Session(bind=engine)
+    try:
+        assert refresh_stats_views(other)
+        assert not refresh_stats_views(db_session)
+    finally:
+        other.rollback()
+        other.close()
+    assert StatsRefresher(interval=60).refresh()
+
+
+def test_approximate_count(db_session: Session) -> None:
+    """Test the planner's row estimate."""
+    db_session.execute(text("ANALYZE users"))
+    assert approximate_count(db_session, "users") is not None
+    assert approximate_count(db_session, "no_such_table") is None
@@ -1,12 +1,15 @@
 from datetime import datetime, timezone
 from uuid import uuid4
 
+import pytest
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 
+from backend_core.core.responses import serialize
 from backend_core.core.security import get_password_hash, verify_password
-from backend_core.db.utils import CRUDBase
+from backend_core.db.utils import CRUDBase, attach, column_keys, detached_copy, record_type
 from backend_core.models.user import User
-from backend_core.schemas.user import UserCreate, UserUpdate
+from backend_core.schemas.user import UserCreate, UserRead, UserUpdate
 
 
 class TestCRUDBase:
@@ -60,6 +63,103 @@ class TestCRUDBase:
         db_users = crud.get_multi(db_session, skip=0, limit=2)
         assert len(db_users) == 2
 
+    def test_get_many(self, db_session: Session) -> None:
+        """Test getting records by ID in one query, in input order."""
+        crud = CRUDBase[User, UserCreate, UserUpdate](User)
+
+        now = datetime.now(timezone.utc)
+        users = []
+        for i in range(3):
+            user = User()
+            user.id = uuid4()
+            user.email = f"many_test{i}@example.com"
+            user.hashed_password = "hashed_password"
+            user.created_at = now
+            user.updated_at = now
+            users.append(user)
+            db_session.add(user)
+        db_session.commit()
+        first, second, third = (user.id for user in users)
+        db_session.expunge_all()
+
+        statements = []
+        connection = db_session.connection()
+        event.listen(connection, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        missing = uuid4()
+        db_users = crud.get_many(db_session, [third, missing, first, second])
+        assert [user.id if user else None for user in db_users] == [third, None, first, second]
+        assert len(statements) == 1
+        assert "= ANY (" in statements[0]
+
+        # Rows already in the identity map need no query
+        assert crud.get_many(db_session, [first, second]) == [db_users[2], db_users[3]]
+        assert len(statements) == 1
+
+    def test_read_many(self, db_session: Session) -> None:
+        """Test reading immutable records by ID without touching the identity map."""
+        crud = CRUDBase[User, UserCreate, UserUpdate](User)
+
+        now = datetime.now(timezone.utc)
+        users = []
+        for i in range(2):
+            user = User(email=f"record_test{i}@example.com", hashed_password="hashed", created_at=now, updated_at=now)
+            users.append(user)
+            db_session.add(user)
+        db_session.commit()
+        first, second = (user.id for user in users)
+        db_session.expunge_all()
+
+        missing = uuid4()
+        records = crud.read_many(db_session, [second, missing, first])
+        assert [record.id if record else None for record in records] == [second, None, first]
+        assert len(db_session.identity_map) == 0
+
+        record = records[0]
+        assert isinstance(record, record_type(User))
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.email = "changed@example.com"
+        assert UserRead.model_validate(record) == UserRead.model_validate(db_session.get(User, second))
+        assert serialize(UserRead, record)["email"] == "record_test1@example.com"
+
+    def test_read_many_keys(self, db_session: Session) -> None:
+        """Test reading records holding only the primary key and the requested columns."""
+        crud = CRUDBase[User, UserCreate, UserUpdate](User)
+
+        now = datetime.now(timezone.utc)
+        user = User(email="record_keys@example.com", hashed_password="hashed", created_at=now, updated_at=now)
+        db_session.add(user)
+        db_session.commit()
+        user_id = user.id
+
+        statements = []
+
+        @event.listens_for(db_session.connection(), "before_cursor_execute")
+        def count(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+            statements.append(statement)
+
+        (record,) = crud.read_many(db_session, [user_id], keys=("email",))
+        assert record is not None
+        assert record._fields == ("id", "email")
+        assert record.email == "record_keys@example.com"
+        assert "first_name" not in statements[0]
+
+    def test_read_multi(self, db_session: Session) -> None:
+        """Test paging through records in primary key order."""
+        crud = CRUDBase[User, UserCreate, UserUpdate](User)
+
+        now = datetime.now(timezone.utc)
+        for i in range(3):
+            db_session.add(
+                User(email=f"records{i}@example.com", hashed_password="hashed", created_at=now, updated_at=now)
+            )
+        db_session.commit()
+
+        records = crud.read_multi(db_session, limit=100)
+        assert [record.id for record in records] == sorted(record.id for record in records)
+        assert len(crud.read_multi(db_session, skip=1, limit=2)) == 2
+
     def test_create(self, db_session: Session) -> None:
         """Test creating a record."""
         crud = CRUDBase[User, UserCreate, UserUpdate](User)
@@ -139,6 +239,21 @@ class TestCRUDBase:
         assert fresh_user is not None, "User should not be None"
         assert fresh_user.first_name == "Updated"
 
+    def test_update_password(self, db_session: Session) -> None:
+        """Test updating the deferred password column without loading it."""
+        crud = CRUDBase[User, UserCreate, UserUpdate](User)
+
+        now = datetime.now(timezone.utc)
+        user = User(
+            email=f"update_password_{uuid4()}@example.com", hashed_password="old", created_at=now, updated_at=now
+        )
+        db_session.add(user)
+        db_session.commit()
+        db_session.expire(user)
+
+        crud.update(db_session, db_obj=user, obj_in={"password": "newpass"})
+        assert verify_password("newpass", user.hashed_password)
+
     def test_remove(self, db_session: Session) -> None:
         """Test removing a record."""
         crud = CRUDBase[User, UserCreate, UserUpdate](User)
@@ -158,3 +273,49 @@ class TestCRUDBase:
         # Remove the user
         crud.remove(db_session, id=user.id)
         assert crud.get(db_session, id=user.id) is None
+
+
+def test_detached_copy_and_attach(db_session: Session) -> None:
+    """Test handing a loaded row to a session without another query."""
+    now = datetime.now(timezone.utc)
+    user = User()
+    user.id = uuid4()
+    user.email = f"copy_test_{uuid4()}@example.com"
+    user.hashed_password = "hashed_password"
+    user.created_at = now
+    user.updated_at = now
+    db_session.add(user)
+    db_session.commit()
+
+    copy = detached_copy(user)
+    assert copy is not user
+    assert copy.email == user.email
+    assert copy not in db_session
+
+    db_session.expunge(user)
+    attached = attach(db_session, copy)
+    assert attached is not None
+    assert attached in db_session
+    assert attached.id == user.id
+    assert attach(db_session, None) is None
+
+
+def test_password_is_deferred(db_session: Session) -> None:
+    """Test that loads and copies of a user leave the password hash out."""
+    assert "hashed_password" not in column_keys(User)
+    assert column_keys(User, ["email"]) == ("id", "email")
+
+    now = datetime.now(timezone.utc)
+    email = f"deferred_{uuid4()}@example.com"
+    user = User(email=email, hashed_password="hashed", created_at=now, updated_at=now)
+    db_session.add(user)
+    db_session.commit()
+    user_id = user.id
+    db_session.expunge(user)
+
+    loaded = db_session.get(User, user_id)
+    assert loaded is not None
+    assert "hashed_password" in inspect(loaded).unloaded
+    copy = detached_copy(loaded)
+    assert "hashed_password" in inspect(copy).unloaded
+    assert copy.email == email
@@ -1,6 +1,13 @@
+import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from backend_core import main
+from backend_core.core import warmup
+from backend_core.core.circuit_breaker import db_breaker
+from backend_core.core.request_metrics import request_duration, requests_total
+from backend_core.core.warmup import WarmUp
+
 
 def test_root_endpoint(client: TestClient) -> None:
     """Test root endpoint."""
@@ -22,6 +29,45 @@ def test_health_check(client: TestClient) -> None:
     assert "version" in data
 
 
+def test_readiness_check(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that readiness is reported only once the warm-up has finished."""
+    response = client.get("/ready")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["status"] == "ready"
+    assert response.json()["warmup_seconds"] > 0
+
+    monkeypatch.setattr(main, "warm_up", WarmUp())
+    response = client.get("/ready")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json() == {"status": "warming_up"}
+
+
+def test_startup_survives_failed_warm_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the app starts, not ready, when the warm-up fails."""
+
+    def database_down() -> None:
+        raise ConnectionError("database is down")
+
+    monkeypatch.setattr(main, "warm_up", WarmUp())
+    monkeypatch.setattr(warmup, "open_pool_connections", database_down)
+    with TestClient(main.app) as test_client:
+        response = test_client.get("/ready")
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.json() == {"status": "warming_up"}
+
+
+def test_readiness_while_database_unavailable(client: TestClient) -> None:
+    """Test that readiness is withdrawn while the database circuit is open."""
+    db_breaker.trip()
+    try:
+        response = client.get("/ready")
+    finally:
+        db_breaker.reset()
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json() == {"status": "database_unavailable"}
+    assert client.get("/ready").status_code == status.HTTP_200_OK
+
+
 def test_global_exception_handler(client: TestClient) -> None:
     """Test global exception handler."""
     # Force an error by sending invalid data
@@ -30,3 +76,24 @@ def test_global_exception_handler(client: TestClient) -> None:
         json={"invalid": "json"},  # Use `json` to send a dictionary
     )
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_metrics_endpoint(client: TestClient) -> None:
+    """Test metrics endpoint."""
+    response = client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE db_statements_cancelled_total counter" in response.text
+
+
+def test_request_metrics(client: TestClient) -> None:
+    """Test that requests are counted and timed by route template."""
+    labels = {"method": "GET", "route": "/health", "status": "200"}
+    before = requests_total.value(**labels)
+    response = client.get("/health")
+    assert response.status_code == status.HTTP_200_OK
+    assert requests_total.value(**labels) == before + 1
+    assert request_duration.value(method="GET", route="/health") >= 1
+    client.get("/no-such-page")
+    assert requests_total.value(method="GET", route="unmatched", status="404") >= 1
+    assert "# TYPE http_request_duration_seconds histogram" in client.get("/metrics").text